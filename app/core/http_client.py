@@ -0,0 +1,64 @@
+"""
+Shared, pooled HTTP clients for outbound API calls.
+
+One httpx.AsyncClient is kept per upstream service so connections (and their
+TLS sessions) are reused between requests instead of being rebuilt per call.
+Clients are created lazily and closed on application shutdown.
+"""
+
+import os
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+try:
+    import h2  # noqa: F401  (optional, enables HTTP/2: pip install "httpx[http2]")
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(
+    name: str, timeout: float = 180.0, http2: bool = True
+) -> httpx.AsyncClient:
+    """
+    Returns the shared AsyncClient registered under `name`, creating it on first use.
+
+    Args:
+        name (str): Pool name, usually the upstream provider (e.g. "azure", "gemini").
+        timeout (float): Read/write timeout in seconds for requests on this client.
+        http2 (bool): Negotiate HTTP/2 when the optional h2 package is installed.
+
+    Returns:
+        httpx.AsyncClient: A keep-alive client with a bounded connection pool.
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            http2=http2 and HTTP2_AVAILABLE,
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients():
+    """Closes every pooled client. Called from the FastAPI shutdown hook."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -1,7 +1,7 @@
 import os
 import time
 from dotenv import load_dotenv
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
 
 # Load environment variables from .env file if present
 load_dotenv()
@@ -25,6 +25,19 @@ if AZURE_OPENAI_ENDPOINT and AZURE_API_KEY:
         print(f"Error initializing Azure OpenAI client in assistant_config: {e}")
         client = None
 
+# Async client used by the FastAPI routes; the sync client above is kept for Streamlit
+async_client = None
+if AZURE_OPENAI_ENDPOINT and AZURE_API_KEY:
+    try:
+        async_client = AsyncAzureOpenAI(
+            api_key=AZURE_API_KEY,
+            api_version=AZURE_API_VERSION,
+            azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        )
+    except Exception as e:
+        print(f"Error initializing async Azure OpenAI client in assistant_config: {e}")
+        async_client = None
+
 # Shared state for assistant details (for simplicity in this example)
 assistant_details = {
     "assistant_id": None,
@@ -49,4 +62,4 @@ def initialize_openai_client():
             print(f"Error initializing Azure OpenAI client in assistant_config: {e}")
             client = None
 
-__all__ = ["client", "assistant_details", "AZURE_OPENAI_DEPLOYMENT_NAME", "initialize_openai_client"]
+__all__ = ["client", "async_client", "assistant_details", "AZURE_OPENAI_DEPLOYMENT_NAME", "initialize_openai_client"]
@@ -1,7 +1,10 @@
 import os
-import requests
+import httpx
 import json
 from dotenv import load_dotenv
+from app.core.http_client import get_http_client
+from .errors import LLMCallError
+from .streaming import chat_completion_delta, iter_sse_json
 
 # Load environment variables from .env file
 load_dotenv()
@@ -12,6 +15,15 @@ AZURE_DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")  # Example: "g
 AZURE_API_VERSION = os.getenv("AZURE_API_VERSION", "2024-12-01-preview")
 AZURE_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 
+# Sampling parameters sent with every chat completion request
+AZURE_SAMPLING_PARAMS = {
+    "max_tokens": 8192,
+    "temperature": 1.0,
+    "top_p": 1.0,
+    "frequency_penalty": 0.0,
+    "presence_penalty": 0.0,
+}
+
 def get_azure_api_key():
     """
     Get Azure OpenAI API key from environment variable.
@@ -20,23 +32,24 @@ def get_azure_api_key():
         print("Error: AZURE_OPENAI_API_KEY is not set.")
     return AZURE_API_KEY
 
-def call_azure_openai_api(prompt_text):
+async def call_azure_openai_api(prompt_text):
     """
-    Calls Azure OpenAI Chat Completion endpoint synchronously.
+    Calls Azure OpenAI Chat Completion endpoint asynchronously using the shared
+    pooled "azure" HTTP client.
     
     Args:
         prompt_text (str): The user prompt for the assistant.
 
     Returns:
         tuple: A tuple containing (assistant's response (str), input token count (int)).
-               Returns (error_message (str), 0) in case of an error.
+               Returns (error_message (LLMCallError), 0) in case of an error.
     """
     api_key = get_azure_api_key()
     if not api_key:
-        return "Error: API Key not found.", 0
+        return LLMCallError("Error: API Key not found."), 0
 
     if not AZURE_API_BASE_URL or not AZURE_DEPLOYMENT_NAME:
-        return "Error: Missing AZURE_OPENAI_ENDPOINT or AZURE_DEPLOYMENT_NAME.", 0
+        return LLMCallError("Error: Missing AZURE_OPENAI_ENDPOINT or AZURE_DEPLOYMENT_NAME."), 0
 
     url = f"{AZURE_API_BASE_URL}openai/deployments/{AZURE_DEPLOYMENT_NAME}/chat/completions?api-version={AZURE_API_VERSION}"
 
@@ -50,16 +63,13 @@ def call_azure_openai_api(prompt_text):
             {"role": "system", "content": "You are a helpful assistant."},
             {"role": "user", "content": prompt_text}
         ],
-        "max_tokens": 8192,
-        "temperature": 1.0,
-        "top_p": 1.0,
-        "frequency_penalty": 0.0,
-        "presence_penalty": 0.0
+        **AZURE_SAMPLING_PARAMS,
     }
 
     try:
         print(f"Calling Azure OpenAI at {url}...")
-        response = requests.post(url, headers=headers, json=payload, timeout=180)
+        client = get_http_client("azure")
+        response = await client.post(url, headers=headers, json=payload)
         response.raise_for_status()
         response_json = response.json()
 
@@ -84,18 +94,67 @@ def call_azure_openai_api(prompt_text):
 
         return assistant_response, input_tokens
 
-    except requests.exceptions.HTTPError as http_err:
+    except httpx.HTTPStatusError as http_err:
         print(f"HTTP Error: {http_err}")
         try:
             error_detail = json.dumps(http_err.response.json(), indent=2)
         except Exception:
             error_detail = f"{http_err.response.status_code} - {http_err.response.text}"
-        return f"HTTP Error: {http_err}", 0
+        return LLMCallError(f"HTTP Error: {http_err}"), 0
 
-    except requests.exceptions.RequestException as err:
+    except httpx.RequestError as err:
         print(f"Request Exception: {err}")
-        return f"Request Exception: {err}", 0
+        return LLMCallError(f"Request Exception: {err}"), 0
     except json.JSONDecodeError as json_err:
-        return f"JSON Decode Error: {json_err}", 0
+        return LLMCallError(f"JSON Decode Error: {json_err}"), 0
     except Exception as e:
-        return f"Unexpected Error: {e}", 0
+        return LLMCallError(f"Unexpected Error: {e}"), 0
+
+
+async def stream_azure_openai_api(prompt_text):
+    """
+    Streams an Azure OpenAI chat completion using the shared pooled "azure" HTTP client.
+
+    Args:
+        prompt_text (str): The user prompt for the assistant.
+
+    Yields:
+        str: Content fragments in the order the model produces them.
+
+    Raises:
+        ValueError: If the Azure configuration is incomplete.
+        httpx.HTTPError: On HTTP or connection errors.
+    """
+    api_key = get_azure_api_key()
+    if not api_key:
+        raise ValueError("API Key not found.")
+
+    if not AZURE_API_BASE_URL or not AZURE_DEPLOYMENT_NAME:
+        raise ValueError("Missing AZURE_OPENAI_ENDPOINT or AZURE_DEPLOYMENT_NAME.")
+
+    url = f"{AZURE_API_BASE_URL}openai/deployments/{AZURE_DEPLOYMENT_NAME}/chat/completions?api-version={AZURE_API_VERSION}"
+
+    headers = {
+        "Content-Type": "application/json",
+        "api-key": api_key
+    }
+
+    payload = {
+        "messages": [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": prompt_text}
+        ],
+        "stream": True,
+        **AZURE_SAMPLING_PARAMS,
+    }
+
+    client = get_http_client("azure")
+    async with client.stream("POST", url, headers=headers, json=payload) as response:
+        if response.is_error:
+            await response.aread()
+        response.raise_for_status()
+
+        async for chunk in iter_sse_json(response):
+            content_part = chat_completion_delta(chunk)
+            if content_part:
+                yield content_part
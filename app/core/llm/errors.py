@@ -0,0 +1,21 @@
+"""
+Typed failure results of the provider call functions.
+
+The call functions report failures by returning a message in place of the
+model's text. Those messages are LLMCallError, a str subclass, so callers that
+display or store the text keep working while the factory and experiment runner
+can tell a failure from a real response.
+"""
+
+from typing import Any
+
+
+class LLMCallError(str):
+    """Error message returned by a provider call instead of model output"""
+
+
+def is_llm_error(response: Any) -> bool:
+    """True for an LLMCallError, bare or as the text of a (text, tokens) tuple"""
+    if isinstance(response, (tuple, list)) and response:
+        response = response[0]
+    return response is None or isinstance(response, LLMCallError)
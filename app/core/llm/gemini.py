@@ -1,13 +1,24 @@
 import os
-import requests # For synchronous HTTP requests
+import httpx    # For asynchronous HTTP requests
 import json     # Used for working with JSON data
 from dotenv import load_dotenv
+from app.core.http_client import get_http_client
+from .errors import LLMCallError
+from .streaming import iter_sse_json
 
 # --- Configuration ---
 
 load_dotenv() # Loads environment variables from .env file
 
-GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+GEMINI_MODEL_NAME = "gemini-2.0-flash"
+GEMINI_API_BASE_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL_NAME}:generateContent"
+GEMINI_STREAM_API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL_NAME}:streamGenerateContent"
+
+# Sent as "generationConfig" with every request
+GEMINI_SAMPLING_PARAMS = {
+    "temperature": 0.7,
+    "maxOutputTokens": 4096,
+}
 
 
 def get_api_key():
@@ -24,20 +35,22 @@ def get_api_key():
         print("Example: GEMINI_API_KEY='your_actual_gemini_api_key_here'")
     return api_key
 
-def call_gemini_api(prompt_text): # Removed api_key from params, will call get_api_key inside
+async def call_gemini_api(prompt_text): # Removed api_key from params, will call get_api_key inside
     """
-    Calls the Gemini API synchronously with the API key (retrieved from env) and prompt.
+    Calls the Gemini API asynchronously with the API key (retrieved from env) and prompt,
+    using the shared pooled "gemini" HTTP client.
     This version uses the non-streaming generateContent method.
 
     Args:
         prompt_text (str): The prompt to send to the model.
 
     Returns:
-        str: The model's generated text if successful, otherwise None.
+        str: The model's generated text if successful, otherwise an error message
+             (an LLMCallError) or None.
     """
     api_key = get_api_key() # Get API key
     if not api_key:
-        return "Error: API Key not found. Please ensure GEMINI_API_KEY is set."
+        return LLMCallError("Error: API Key not found. Please ensure GEMINI_API_KEY is set.")
 
     if not GEMINI_API_BASE_URL:
         print("Error: GEMINI_API_BASE_URL is not configured.")
@@ -57,18 +70,15 @@ def call_gemini_api(prompt_text): # Removed api_key from params, will call get_a
             "role": "user",
             "parts": [{"text": prompt_text}]
         }],
-        # Optional: Add generationConfig if needed
-        "generationConfig": {
-           "temperature": 0.7, # Example temperature
-           "maxOutputTokens": 4096
-        }
+        "generationConfig": GEMINI_SAMPLING_PARAMS,
     }
 
     print(f"Sending prompt to Gemini API at {GEMINI_API_BASE_URL}...")
 
     try:
-        # Make the POST request using the requests library
-        response = requests.post(api_url, headers=headers, json=payload, timeout=180) # 3 minute timeout
+        # Make the POST request on the pooled client (3 minute timeout)
+        client = get_http_client("gemini")
+        response = await client.post(api_url, headers=headers, json=payload)
 
         # Raise an exception for HTTP errors (4xx or 5xx)
         response.raise_for_status()
@@ -93,34 +103,80 @@ def call_gemini_api(prompt_text): # Removed api_key from params, will call get_a
             if response_json.get("promptFeedback"):
                 error_detail = f"Prompt Feedback: {json.dumps(response_json['promptFeedback'], indent=2)}"
                 print(f"API call was successful but no content generated. {error_detail}")
-                return f"Error: No content generated. {error_detail}"
+                return LLMCallError(f"Error: No content generated. {error_detail}")
             
             print("Error: Could not find generated text in the API response structure.")
             print(f"Full response: {json.dumps(response_json, indent=2)}")
-            return "Error: Could not parse generated text from API response."
+            return LLMCallError("Error: Could not parse generated text from API response.")
 
-    except requests.exceptions.HTTPError as http_err:
+    except httpx.HTTPStatusError as http_err:
         print(f"HTTP error occurred: {http_err}")
         try:
             error_response_content = http_err.response.json()
             print(f"Error Response: {json.dumps(error_response_content, indent=2)}")
-            return f"HTTP Error: {http_err.response.status_code} - {json.dumps(error_response_content)}"
+            return LLMCallError(f"HTTP Error: {http_err.response.status_code} - {json.dumps(error_response_content)}")
         except json.JSONDecodeError:
             print(f"Error Response (not JSON): {http_err.response.text}")
-            return f"HTTP Error: {http_err.response.status_code} - {http_err.response.text}"
-    except requests.exceptions.ConnectionError as conn_err:
+            return LLMCallError(f"HTTP Error: {http_err.response.status_code} - {http_err.response.text}")
+    except httpx.ConnectError as conn_err:
         print(f"Error Connecting: {conn_err}")
-        return f"Connection Error: {conn_err}"
-    except requests.exceptions.Timeout as timeout_err:
+        return LLMCallError(f"Connection Error: {conn_err}")
+    except httpx.TimeoutException as timeout_err:
         print(f"Timeout Error: {timeout_err}")
-        return f"Timeout Error: {timeout_err}"
-    except requests.exceptions.RequestException as req_err:
+        return LLMCallError(f"Timeout Error: {timeout_err}")
+    except httpx.RequestError as req_err:
         print(f"An unexpected error occurred with the request: {req_err}")
-        return f"Request Error: {req_err}"
+        return LLMCallError(f"Request Error: {req_err}")
     except json.JSONDecodeError as json_err:
         # This would typically be caught by response.json() if the response isn't valid JSON
         print(f"JSON Decode Error: {json_err}. Response text: {response.text if 'response' in locals() else 'N/A'}")
-        return f"JSON Decode Error: Failed to parse API response. {json_err}"
+        return LLMCallError(f"JSON Decode Error: Failed to parse API response. {json_err}")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
-        return f"Unexpected Error: {e}"
\ No newline at end of file
+        return LLMCallError(f"Unexpected Error: {e}")
+
+
+async def stream_gemini_api(prompt_text):
+    """
+    Streams a Gemini response with streamGenerateContent (SSE) using the shared
+    pooled "gemini" HTTP client.
+
+    Args:
+        prompt_text (str): The prompt to send to the model.
+
+    Yields:
+        str: Text fragments in the order the model produces them.
+
+    Raises:
+        ValueError: If GEMINI_API_KEY is not set.
+        httpx.HTTPError: On HTTP or connection errors.
+    """
+    api_key = get_api_key()
+    if not api_key:
+        raise ValueError("API Key not found. Please ensure GEMINI_API_KEY is set.")
+
+    api_url = f"{GEMINI_STREAM_API_URL}?alt=sse&key={api_key}"
+
+    headers = {
+        "Content-Type": "application/json"
+    }
+
+    payload = {
+        "contents": [{
+            "role": "user",
+            "parts": [{"text": prompt_text}]
+        }],
+        "generationConfig": GEMINI_SAMPLING_PARAMS,
+    }
+
+    client = get_http_client("gemini")
+    async with client.stream("POST", api_url, headers=headers, json=payload) as response:
+        if response.is_error:
+            await response.aread()
+        response.raise_for_status()
+
+        async for chunk in iter_sse_json(response):
+            for candidate in chunk.get("candidates") or []:
+                for part in (candidate.get("content") or {}).get("parts") or []:
+                    if part.get("text"):
+                        yield part["text"]
@@ -1,18 +1,143 @@
-from typing import Callable
-from .azure_openai import call_azure_openai_api
-from .chutes import call_chutes_model_api
-from .gemini import call_gemini_api
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Tuple
+from .azure_openai import (
+    call_azure_openai_api,
+    stream_azure_openai_api,
+    AZURE_DEPLOYMENT_NAME,
+    AZURE_SAMPLING_PARAMS,
+)
+from .chutes import (
+    call_chutes_model_api,
+    stream_chutes_model_api,
+    CHUTES_MODEL_NAME,
+    CHUTES_SAMPLING_PARAMS,
+)
+from .gemini import (
+    call_gemini_api,
+    stream_gemini_api,
+    GEMINI_MODEL_NAME,
+    GEMINI_SAMPLING_PARAMS,
+)
+from .errors import is_llm_error
+from .rate_limit import get_rate_limiter
+from .response_cache import LLMResponseCache
 
-def get_llm_api_call_function(model_name: str) -> Callable:
+
+class LLMProvider:
     """
-    Returns the appropriate LLM API call function based on the model name.
-    The returned function will take prompt_text as an argument.
+    Async handle for one LLM provider.
+
+    Awaiting `provider(prompt_text)` performs the API call on the provider's
+    pooled HTTP client, so many calls can be in flight on one event loop.
+    Calls wait on the provider's rate limiter when one is configured.
+    The return value is whatever the underlying call function returns.
+
+    With the response cache enabled (see response_cache.py), identical prompts
+    for the same model, prompt_version and sampling params skip the API call.
+    Failed calls (see errors.py) are never cached.
+
+    `provider.stream(prompt_text)` yields the response text as it is generated.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: Optional[str],
+        sampling_params: dict,
+        call: Callable[[str], Awaitable[Any]],
+        stream: Optional[Callable[[str], AsyncIterator[str]]] = None,
+    ):
+        self.name = name
+        self.model = model
+        self.sampling_params = sampling_params
+        self._call = call
+        self._stream = stream
+        self.rate_limiter = get_rate_limiter(name)
+
+    async def __call__(
+        self,
+        prompt_text: str,
+        prompt_version: Optional[str] = None,
+        use_cache: Optional[bool] = None,
+    ) -> Any:
+        if not LLMResponseCache.enabled(use_cache):
+            return await self._request(prompt_text)
+
+        prompt_hash = LLMResponseCache.prompt_hash(prompt_text)
+        key = LLMResponseCache.make_key(
+            self.name, self.model, prompt_version, prompt_hash, self.sampling_params
+        )
+        cached = await LLMResponseCache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self._request(prompt_text)
+        # Failures are returned, not raised; only real model output is cached
+        if not is_llm_error(response):
+            await LLMResponseCache.set(
+                key, response, self.name, self.model, prompt_version, prompt_hash
+            )
+        return response
+
+    async def _request(self, prompt_text: str) -> Any:
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+        return await self._call(prompt_text)
+
+    async def stream(self, prompt_text: str) -> AsyncIterator[str]:
+        """Yields response text fragments; not cached"""
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+        if self._stream is None:
+            # Provider has no streaming endpoint: deliver the whole response at once
+            text, _ = normalize_llm_output(await self._call(prompt_text))
+            yield text
+            return
+        async for fragment in self._stream(prompt_text):
+            yield fragment
+
+    def __repr__(self) -> str:
+        return f"LLMProvider(name={self.name!r}, model={self.model!r})"
+
+
+def get_llm_api_call_function(model_name: str) -> LLMProvider:
+    """
+    Returns the async LLM provider based on the model name.
+    The returned provider is awaited with prompt_text as its argument.
     """
     if model_name.lower() == "azure":
-        return lambda prompt_text: call_azure_openai_api(prompt_text)
+        return LLMProvider(
+            "azure",
+            AZURE_DEPLOYMENT_NAME,
+            AZURE_SAMPLING_PARAMS,
+            call_azure_openai_api,
+            stream_azure_openai_api,
+        )
     elif model_name.lower() == "chutes":
-        return lambda prompt_text: call_chutes_model_api(prompt_text)
+        return LLMProvider(
+            "chutes",
+            CHUTES_MODEL_NAME,
+            CHUTES_SAMPLING_PARAMS,
+            call_chutes_model_api,
+            stream_chutes_model_api,
+        )
     elif model_name.lower() == "gemini":
-        return lambda prompt_text: call_gemini_api(prompt_text)
+        return LLMProvider(
+            "gemini",
+            GEMINI_MODEL_NAME,
+            GEMINI_SAMPLING_PARAMS,
+            call_gemini_api,
+            stream_gemini_api,
+        )
     else:
         raise ValueError(f"Unsupported LLM model: {model_name}")
+
+
+def normalize_llm_output(output: Any) -> Tuple[str, Optional[int]]:
+    """
+    Providers return either the response text or a (text, input_tokens) tuple.
+    Returns (text, input_tokens), with input_tokens None when not reported.
+    """
+    if isinstance(output, tuple):
+        text, input_tokens = output
+        return text, input_tokens
+    return output, None
@@ -0,0 +1,50 @@
+"""
+Per-provider request rate limiting for LLM calls.
+
+Limits are configured in requests per minute through LLM_RATE_LIMIT_RPM_<PROVIDER>
+(e.g. LLM_RATE_LIMIT_RPM_AZURE=120). Providers without a limit are not throttled.
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class AsyncRateLimiter:
+    """Token bucket: `rate_per_minute` requests per minute with bursts up to `burst`."""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(rate_per_minute // 60) or 1))
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so requests are released in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_limiters: dict[str, Optional[AsyncRateLimiter]] = {}
+
+
+def get_rate_limiter(provider: str) -> Optional[AsyncRateLimiter]:
+    """Returns the shared limiter for `provider`, or None when no limit is configured."""
+    if provider not in _limiters:
+        rpm = float(os.getenv(f"LLM_RATE_LIMIT_RPM_{provider.upper()}", "0"))
+        _limiters[provider] = AsyncRateLimiter(rpm) if rpm > 0 else None
+    return _limiters[provider]
@@ -0,0 +1,120 @@
+"""
+Opt-in cache of LLM responses for byte-identical prompts.
+
+Entries are keyed by sha256 of (provider, model, prompt_version, sha256(prompt),
+sampling params) and stored in the llm_response_cache table. Caching is off
+unless LLM_RESPONSE_CACHE_ENABLED is set or a caller passes use_cache=True;
+use_cache=False bypasses the cache for a single call.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Optional
+from dotenv import load_dotenv
+from tortoise import timezone
+from tortoise.expressions import F
+
+from app.models.models import LLMResponseCacheEntry
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+LLM_RESPONSE_CACHE_ENABLED = os.getenv("LLM_RESPONSE_CACHE_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Least recently used entries beyond this count are evicted on write
+LLM_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+
+
+class LLMResponseCache:
+    @staticmethod
+    def enabled(use_cache: Optional[bool] = None) -> bool:
+        return LLM_RESPONSE_CACHE_ENABLED if use_cache is None else use_cache
+
+    @staticmethod
+    def prompt_hash(prompt_text: str) -> str:
+        return hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: Optional[str],
+        prompt_version: Optional[str],
+        prompt_hash: str,
+        sampling_params: dict,
+    ) -> str:
+        payload = json.dumps(
+            [provider, model, prompt_version, prompt_hash, sampling_params],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    async def get(key: str) -> Optional[Any]:
+        """Returns the cached response or None, and marks the entry as recently used"""
+        try:
+            entry = await LLMResponseCacheEntry.get_or_none(key=key)
+            if entry is None:
+                return None
+            await LLMResponseCacheEntry.filter(id=entry.id).update(
+                hits=F("hits") + 1, last_used_at=timezone.now()
+            )
+        except Exception as e:
+            logger.warning(f"LLM response cache read failed: {e}")
+            return None
+
+        response = entry.response
+        # JSON has no tuples; (text, tokens) responses come back as lists
+        return tuple(response) if isinstance(response, list) else response
+
+    @staticmethod
+    async def set(
+        key: str,
+        response: Any,
+        provider: str,
+        model: Optional[str],
+        prompt_version: Optional[str],
+        prompt_hash: str,
+    ):
+        try:
+            await LLMResponseCacheEntry.bulk_create(
+                [
+                    LLMResponseCacheEntry(
+                        key=key,
+                        provider=provider,
+                        model=model,
+                        prompt_version=prompt_version,
+                        prompt_hash=prompt_hash,
+                        response=response,
+                        last_used_at=timezone.now(),
+                    )
+                ],
+                on_conflict=["key"],
+                update_fields=["response", "last_used_at"],
+            )
+            await LLMResponseCache.evict()
+        except Exception as e:
+            logger.warning(f"LLM response cache write failed: {e}")
+
+    @staticmethod
+    async def invalidate(key: str):
+        await LLMResponseCacheEntry.filter(key=key).delete()
+
+    @staticmethod
+    async def evict(max_entries: int = LLM_RESPONSE_CACHE_MAX_ENTRIES) -> int:
+        """Deletes the least recently used entries beyond `max_entries`"""
+        stale_ids = (
+            await LLMResponseCacheEntry.all()
+            .order_by("-last_used_at", "-id")
+            .offset(max_entries)
+            .values_list("id", flat=True)
+        )
+        if not stale_ids:
+            return 0
+        return await LLMResponseCacheEntry.filter(id__in=stale_ids).delete()
@@ -0,0 +1,43 @@
+"""
+Helpers for reading Server-Sent Events responses from LLM providers.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterator
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+async def iter_sse_json(response: httpx.Response) -> AsyncIterator[Any]:
+    """
+    Yields the decoded JSON payload of every "data:" line of an SSE response.
+    Stops at "[DONE]"; lines that are not valid JSON are skipped.
+    """
+    async for line in response.aiter_lines():
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data_str = line[5:].strip()
+        if data_str == "[DONE]":
+            break
+        if not data_str:
+            continue
+        try:
+            yield json.loads(data_str)
+        except json.JSONDecodeError:
+            logger.warning(f"Error parsing JSON chunk: {data_str}")
+
+
+def chat_completion_delta(chunk: Any) -> str:
+    """Text content of an OpenAI-style chat completion stream chunk"""
+    choices = chunk.get("choices") if isinstance(chunk, dict) else None
+    if not choices or not isinstance(choices, list):
+        return ""
+    choice = choices[0]
+    if "delta" in choice and choice["delta"].get("content"):
+        return choice["delta"]["content"]
+    if "message" in choice and choice["message"].get("content"):  # Some APIs use this
+        return choice["message"]["content"]
+    return ""
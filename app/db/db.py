@@ -1,6 +1,6 @@
 # app/db/db.py
 
-from tortoise import Tortoise
+from tortoise import Tortoise, connections
 from dotenv import load_dotenv
 import os
 
@@ -23,4 +23,26 @@ async def init_db():
     await Tortoise.generate_schemas()
 
 async def close_db():
-    await Tortoise.close_connections()
\ No newline at end of file
+    await Tortoise.close_connections()
+
+class SQLParams:
+    """
+    Collects values for a raw SQL query and returns the positional placeholder
+    for each one in the connection's dialect ($1 for asyncpg, ? for sqlite).
+    """
+
+    def __init__(self, connection):
+        self.dialect = connection.capabilities.dialect
+        self.values = []
+
+    def add(self, value) -> str:
+        self.values.append(value)
+        if self.dialect == "postgres":
+            return f"${len(self.values)}"
+        if self.dialect == "mysql":
+            return "%s"
+        return "?"
+
+
+def get_connection(name: str = "default"):
+    return connections.get(name)
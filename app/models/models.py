@@ -1,6 +1,6 @@
 from tortoise import fields
 from tortoise.models import Model
-from app.utils.util import AnswerType, StatusType
+from app.utils.util import AnswerType, StatusType, GradingJobStatus
 
 
 # ! helper functions
@@ -39,6 +39,8 @@ class Quiz(Model):
     end_time = fields.DatetimeField(null=True)
     created_at = fields.DatetimeField(auto_now_add=True)
     duration = fields.IntField(null=True)
+    # Bumped on every write to the quiz or its questions; keys cached quiz content
+    content_version = fields.IntField(default=0)
 
     questions: fields.ReverseRelation["Question"]
     participants: fields.ReverseRelation["QuizParticipant"]
@@ -214,3 +216,186 @@ class MissingConcept(Model):
 
     def __str__(self):
         return f"Missing Concept: {self.missing_concept[:50]}..."
+
+
+class GradingJob(Model):
+    """Queued AI grading request for one student's quiz submission"""
+
+    id = fields.IntField(pk=True)
+    quiz = fields.ForeignKeyField("models.Quiz", related_name="grading_jobs")
+    user = fields.ForeignKeyField("models.User", related_name="grading_jobs")
+    model_name = fields.CharField(max_length=50, default="azure")
+    status = fields.CharEnumField(GradingJobStatus, default=GradingJobStatus.QUEUED)
+    attempts = fields.IntField(default=0)
+    assessment = fields.ForeignKeyField(
+        "models.Assessment",
+        related_name="grading_jobs",
+        null=True,
+        on_delete=fields.SET_NULL,
+    )
+    error = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    started_at = fields.DatetimeField(null=True)
+    finished_at = fields.DatetimeField(null=True)
+
+    class Meta:
+        table = "grading_jobs"
+        indexes = [
+            ["status", "created_at"],
+        ]
+
+    def __str__(self):
+        return f"GradingJob {self.id} - Quiz {self.quiz_id} - {self.status}"
+
+
+class AIDetectionCacheEntry(Model):
+    """Cached AI-detector result for a normalized answer text"""
+
+    id = fields.IntField(pk=True)
+    # sha256 of detector, detector version and normalized text
+    key = fields.CharField(max_length=64, unique=True)
+    detector = fields.CharField(max_length=50)
+    detector_version = fields.CharField(max_length=50)
+    result = fields.JSONField()
+    created_at = fields.DatetimeField(auto_now_add=True)
+    expires_at = fields.DatetimeField(index=True)
+
+    class Meta:
+        table = "ai_detection_cache"
+
+    def __str__(self):
+        return f"AIDetectionCacheEntry {self.detector}:{self.key[:12]}"
+
+
+class LLMResponseCacheEntry(Model):
+    """Cached LLM response for an exact prompt, model and sampling configuration"""
+
+    id = fields.IntField(pk=True)
+    # sha256 of provider, model, prompt version, prompt hash and sampling params
+    key = fields.CharField(max_length=64, unique=True)
+    provider = fields.CharField(max_length=50)
+    model = fields.CharField(max_length=100, null=True)
+    prompt_version = fields.CharField(max_length=100, null=True)
+    prompt_hash = fields.CharField(max_length=64)
+    response = fields.JSONField()
+    hits = fields.IntField(default=0)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    last_used_at = fields.DatetimeField(index=True)
+
+    class Meta:
+        table = "llm_response_cache"
+
+    def __str__(self):
+        return f"LLMResponseCacheEntry {self.provider}:{self.key[:12]}"
+
+
+class QuizStatistics(Model):
+    """Running score aggregates for one quiz, kept up to date as assessments change"""
+
+    id = fields.IntField(pk=True)
+    quiz = fields.OneToOneField(
+        "models.Quiz", related_name="statistics", on_delete=fields.CASCADE
+    )
+    total_assessments = fields.IntField(default=0)
+    score_sum = fields.BigIntField(default=0)
+    max_score_sum = fields.BigIntField(default=0)
+    min_score = fields.IntField(null=True)
+    max_score = fields.IntField(null=True)
+    earliest_assessment = fields.DatetimeField(null=True)
+    latest_assessment = fields.DatetimeField(null=True)
+    # Assessments per grade bucket of overall_score / overall_max_score
+    grade_a = fields.IntField(default=0)
+    grade_b = fields.IntField(default=0)
+    grade_c = fields.IntField(default=0)
+    grade_d = fields.IntField(default=0)
+    grade_f = fields.IntField(default=0)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "quiz_statistics"
+
+    def __str__(self):
+        return f"QuizStatistics {self.quiz_id}"
+
+
+class PromptExperimentResult(Model):
+    """One prompt variant's output from a prompt comparison run"""
+
+    id = fields.IntField(pk=True)
+    # Shared by all variants dispatched together
+    experiment_id = fields.UUIDField(index=True)
+    quiz = fields.ForeignKeyField(
+        "models.Quiz", related_name="prompt_experiment_results"
+    )
+    user = fields.ForeignKeyField(
+        "models.User", related_name="prompt_experiment_results"
+    )
+    variant = fields.CharField(max_length=50)
+    provider = fields.CharField(max_length=50)
+    model = fields.CharField(max_length=100, null=True)
+    prompt_hash = fields.CharField(max_length=64)
+    output = fields.TextField(null=True)
+    input_tokens = fields.IntField(null=True)
+    latency_ms = fields.IntField()
+    error = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "prompt_experiment_results"
+
+    def __str__(self):
+        return f"PromptExperimentResult {self.experiment_id} - {self.variant}"
+
+
+class AssistantDocument(Model):
+    """Uploaded chatbot document indexed in an OpenAI vector store, shared by content hash"""
+
+    id = fields.IntField(pk=True)
+    # sha256 of the uploaded file bytes
+    content_hash = fields.CharField(max_length=64, unique=True)
+    filename = fields.CharField(max_length=255)
+    openai_file_id = fields.CharField(max_length=100)
+    vector_store_id = fields.CharField(max_length=100)
+    file_ids_in_store = fields.JSONField(default=list)
+    # Number of assistant sessions using this document
+    ref_count = fields.IntField(default=0)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    last_used_at = fields.DatetimeField()
+
+    class Meta:
+        table = "assistant_documents"
+        indexes = [
+            ["ref_count", "last_used_at"],
+        ]
+
+    def __str__(self):
+        return f"AssistantDocument {self.id} - {self.filename}"
+
+
+class AssistantSession(Model):
+    """A lecturer's chatbot session: OpenAI assistant, thread and document vector store"""
+
+    id = fields.IntField(pk=True)
+    user = fields.OneToOneField(
+        "models.User", related_name="assistant_session", on_delete=fields.CASCADE
+    )
+    assistant_id = fields.CharField(max_length=100, null=True)
+    thread_id = fields.CharField(max_length=100, null=True)
+    vector_store_id = fields.CharField(max_length=100, null=True)
+    document = fields.ForeignKeyField(
+        "models.AssistantDocument",
+        related_name="sessions",
+        null=True,
+        on_delete=fields.SET_NULL,
+    )
+    file_ids_in_store = fields.JSONField(default=list)
+    # OpenAI file ID -> original filename, used to render citations
+    openai_file_id_map = fields.JSONField(default=dict)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    last_used_at = fields.DatetimeField(index=True)
+
+    class Meta:
+        table = "assistant_sessions"
+
+    def __str__(self):
+        return f"AssistantSession {self.id} - User {self.user_id}"
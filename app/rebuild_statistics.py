@@ -0,0 +1,16 @@
+import asyncio
+import sys
+from app.db.db import init_db, close_db
+from app.services.quiz_statistics_service import QuizStatisticsService
+
+
+async def rebuild(quiz_id=None):
+    await init_db()
+    try:
+        rebuilt = await QuizStatisticsService.rebuild(quiz_id)
+        print(f"✅ Rebuilt statistics for {rebuilt} quiz(zes).")
+    finally:
+        await close_db()
+
+if __name__ == "__main__":
+    asyncio.run(rebuild(int(sys.argv[1]) if len(sys.argv) > 1 else None))
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException
+import json
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
-from app.prompts.prompt_generator import construct_overall_assignment_analysis_prompt_v3
 from app.prompts.prompt_generator_b import construct_model_answer_comparison_prompt_b
 from app.core.llm.llm_factory import get_llm_api_call_function
 from app.models.models import Quiz, Question
@@ -15,6 +16,16 @@ from app.schemas.question_response import (
     BulkQuestionResponseToAI,
 )
 from app.services.assesment_service import AssessmentService
+from app.services.grading_service import (
+    GradingService,
+    ANALYSIS_PROMPT_VERSION,
+    BULK_GRADING_CONCURRENCY,
+)
+from app.services.grading_queue import grading_queue
+from app.services.experiment_service import ExperimentService
+from app.models.models import GradingJob
+from app.schemas.grading_job import GradingJobRead
+from app.utils.sse import format_sse
 
 router = APIRouter()
 
@@ -23,6 +34,7 @@ router = APIRouter()
 async def analyze_quiz(
     quiz_id: int,
     model_name: str = "azure",
+    use_cache: Optional[bool] = None,
     current_user=Depends(get_current_user),
 ):
     """
@@ -31,6 +43,8 @@ async def analyze_quiz(
     Args:
         quiz_id: ID of the quiz to analyze
         model_name: LLM model to use (deepseek-chat, gemini, azure-openai)
+        use_cache: Reuse a cached LLM response for an identical prompt
+            (true/false overrides LLM_RESPONSE_CACHE_ENABLED)
         current_user: Current authenticated user
     """
     try:
@@ -48,78 +62,10 @@ async def analyze_quiz(
                 status_code=403, detail="Student is not a participant in this quiz"
             )
 
-        # Get all questions and student responses for this quiz from table (temporary)
-        responses = await QuestionResponse.filter(
-            user_id=current_user.id, question__quiz_id=quiz_id
-        ).prefetch_related("question")
-
-        # Get all questions for the quiz to ensure we include unanswered ones
-        questions = await Question.filter(quiz_id=quiz_id)
-
-        # Transform responses for AI analysis
-        ai_responses = []
-        for question in questions:
-            # Find matching response for this question
-            response = next(
-                (r for r in responses if r.question_id == question.id), None
-            )
-
-            ai_responses.append(
-                QuestionResponseToAI(
-                    question_id=question.id,
-                    answer={"text": response.answer} if response else {"text": ""},
-                    question_text=question.text,
-                    question_type=question.type,
-                    lecturer_answer_text=question.expected_answer,
-                    rubric=question.rubric,
-                    rubric_max_score=question.rubric_max_score,
-                )
-            )
-
-        if not ai_responses:
-            raise HTTPException(status_code=404, detail="No answers found for analysis")
-
-        # Prepare questions_and_answers structure for prompt generator
-        questions_and_answers = []
-        for response in ai_responses:
-            questions_and_answers.append(
-                {
-                    "question_id": response.question_id,
-                    "question_text": response.question_text,
-                    "student_answer_text": response.answer.get("text", ""),
-                    "lecturer_answer_text": response.lecturer_answer_text,
-                    "rubric": response.rubric,
-                    "rubric_max_score": response.rubric_max_score,
-                }
-            )
-
-        # Generate analysis prompt
-        prompt = construct_overall_assignment_analysis_prompt_v3(
-            quiz_id=quiz.id,  # Pass as int
-            student_id=current_user.id,  # Pass as int
-            model_name=model_name,
-            questions_and_answers=questions_and_answers,
-            overall_assignment_title=quiz.title,
-            lecturer_overall_notes=quiz.lecturer_overall_notes,
-        )
-
-        # Get LLM API call function
-        llm_call_function = get_llm_api_call_function(model_name)
-        
-        # Analyze with LLM
-        analysis_result, input_tokens = llm_call_function(prompt)
-
-        print(f"Analysis Result: {analysis_result}")
-        print(f"Input Tokens: {input_tokens}")
-
-        # Create assessment from analysis result
-        assessment = await AssessmentService.create_assessment_from_json(
-            analysis_result
+        # Build the prompt, call the LLM and store the assessment
+        result = await GradingService.grade_submission(
+            quiz, current_user.id, model_name, use_cache=use_cache
         )
-        if not assessment:
-            raise HTTPException(
-                status_code=500, detail="Failed to create assessment from analysis"
-            )
 
         # Update participant status to graded
         # participant.status = "graded"
@@ -127,12 +73,12 @@ async def analyze_quiz(
 
         return {
             "success": True,
-            "analysis": analysis_result,
-            "assessment_id": assessment.id,  # Return the integer ID
+            "analysis": result["analysis"],
+            "assessment_id": result["assessment"].id,  # Return the integer ID
             "model_used": model_name,
             "quiz_id": quiz.id,
             "student_id": current_user.id,
-            "input_tokens": input_tokens, # Add input tokens to the response
+            "input_tokens": result["input_tokens"], # Add input tokens to the response
         }
 
     except HTTPException as he:
@@ -142,10 +88,160 @@ async def analyze_quiz(
         raise HTTPException(status_code=500, detail=f"Quiz analysis failed: {str(e)}")
 
 
+@router.post(
+    "/analyze-quiz/{quiz_id}/jobs", response_model=GradingJobRead, status_code=202
+)
+async def enqueue_analyze_quiz(
+    quiz_id: int,
+    model_name: str = "azure",
+    current_user=Depends(get_current_user),
+):
+    """
+    Queue the analysis of the current student's answers and return immediately.
+    Poll GET /jobs/{job_id} for the job state and the resulting assessment_id.
+
+    Args:
+        quiz_id: ID of the quiz to analyze
+        model_name: LLM model to use (chutes, gemini, azure)
+        current_user: Current authenticated user
+    """
+    try:
+        get_llm_api_call_function(model_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not await Quiz.filter(id=quiz_id).exists():
+        raise HTTPException(status_code=404, detail="Quiz not found")
+
+    if not await QuizParticipant.filter(
+        user_id=current_user.id, quiz_id=quiz_id
+    ).exists():
+        raise HTTPException(
+            status_code=403, detail="Student is not a participant in this quiz"
+        )
+
+    job = await grading_queue.enqueue(quiz_id, current_user.id, model_name)
+    return GradingJobRead.model_validate(job)
+
+
+@router.get("/jobs/{job_id}", response_model=GradingJobRead)
+async def get_grading_job(job_id: int, current_user=Depends(get_current_user)):
+    """
+    Get the state of a grading job (queued, running, completed, failed).
+    Visible to the student it grades and to the quiz creator.
+    """
+    job = await GradingJob.get_or_none(id=job_id).select_related("quiz")
+    if not job or current_user.id not in (job.user_id, job.quiz.creator_id):
+        raise HTTPException(status_code=404, detail="Grading job not found")
+    return GradingJobRead.model_validate(job)
+
+
+@router.post("/analyze-quiz/{quiz_id}/all")
+async def analyze_quiz_all_students(
+    quiz_id: int,
+    model_name: str = "azure",
+    concurrency: int = Query(
+        BULK_GRADING_CONCURRENCY, ge=1, le=64, description="Max parallel LLM calls"
+    ),
+    current_user=Depends(get_current_user),
+):
+    """
+    Grade every submitted participant of a quiz in one call (LECTURER ONLY).
+
+    Streams newline-delimited JSON progress events: "started", then one
+    "graded" or "failed" event per student as assessments land, then "finished".
+
+    Args:
+        quiz_id: ID of the quiz to grade
+        model_name: LLM model to use (chutes, gemini, azure)
+        concurrency: Maximum number of students graded in parallel
+        current_user: Current authenticated user (must be the quiz creator)
+    """
+    try:
+        get_llm_api_call_function(model_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    quiz = await Quiz.get_or_none(id=quiz_id)
+    if not quiz:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    if quiz.creator_id != current_user.id:
+        raise HTTPException(
+            status_code=403, detail="Only the quiz creator can grade all students"
+        )
+
+    async def progress_stream():
+        async for event in GradingService.grade_quiz(quiz, model_name, concurrency):
+            yield json.dumps(event, default=str) + "\n"
+
+    return StreamingResponse(progress_stream(), media_type="application/x-ndjson")
+
+
+@router.post("/analyze-quiz/{quiz_id}/stream")
+async def analyze_quiz_stream(
+    quiz_id: int,
+    model_name: str = "azure",
+    student_id: Optional[int] = None,
+    include_tokens: bool = True,
+    current_user=Depends(get_current_user),
+):
+    """
+    Analyze one submission and stream the result as Server-Sent Events.
+
+    Events: "token" (raw LLM text, when include_tokens), "question_assessment"
+    (each per-question assessment as soon as the LLM finishes it), then
+    "assessment" with the stored assessment, or "error".
+
+    Args:
+        quiz_id: ID of the quiz to analyze
+        model_name: LLM model to use (chutes, gemini, azure)
+        student_id: Student to grade (quiz creator only); defaults to the current user
+        include_tokens: Forward raw LLM tokens as "token" events
+        current_user: Current authenticated user
+    """
+    try:
+        get_llm_api_call_function(model_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    quiz = await Quiz.get_or_none(id=quiz_id)
+    if not quiz:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+
+    user_id = current_user.id if student_id is None else student_id
+    if user_id != current_user.id and quiz.creator_id != current_user.id:
+        raise HTTPException(
+            status_code=403, detail="Only the quiz creator can grade other students"
+        )
+
+    participant = await QuizParticipant.get_or_none(user_id=user_id, quiz_id=quiz_id)
+    if not participant:
+        raise HTTPException(
+            status_code=403, detail="Student is not a participant in this quiz"
+        )
+
+    async def event_stream():
+        try:
+            async for event in GradingService.stream_grade_submission(
+                quiz, user_id, model_name, include_tokens=include_tokens
+            ):
+                yield format_sse(event["data"], event=event["event"])
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield format_sse({"detail": f"Quiz analysis failed: {detail}"}, event="error")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/analyze-quiz-ab-test/{quiz_id}")
 async def analyze_quiz_ab_test(
     quiz_id: int,
     model_name: str = "azure",
+    use_cache: Optional[bool] = None,
     current_user=Depends(get_current_user)
 ):
     """
@@ -155,6 +251,7 @@ async def analyze_quiz_ab_test(
     Args:
         quiz_id: ID of the quiz to analyze
         model_name: LLM model to use (deepseek-chat, gemini, azure-openai)
+        use_cache: Reuse cached LLM responses for identical prompts
         current_user: Current authenticated user
     """
     try:
@@ -174,72 +271,30 @@ async def analyze_quiz_ab_test(
                 detail="Student is not a participant in this quiz"
             )
 
-        # Get all questions and student responses for this quiz from table (temporary)
+        # Get all questions and student responses for this quiz
         responses = await QuestionResponse.filter(
             user_id=current_user.id,
             question__quiz_id=quiz_id
-        ).prefetch_related('question')
-        
-        # Get all questions for the quiz to ensure we include unanswered ones
+        )
         questions = await Question.filter(quiz_id=quiz_id)
-        
-        # Transform responses for AI analysis
-        ai_responses = []
-        for question in questions:
-            # Find matching response for this question
-            response = next((r for r in responses if r.question_id == question.id), None)
-            
-            ai_responses.append(QuestionResponseToAI(
-                question_id=question.id,
-                answer={'text': response.answer} if response else {'text': ''},
-                question_text=question.text,
-                question_type=question.type,
-                lecturer_answer_text=question.expected_answer,
-                rubric=question.rubric,
-                rubric_max_score=question.rubric_max_score
-            ))
-        
-        if not ai_responses:
-            raise HTTPException(
-                status_code=404,
-                detail="No answers found for analysis"
-            )
-        
-        # Prepare questions_and_answers structure for prompt generator v3
-        questions_and_answers_v3 = []
-        for response in ai_responses:
-            questions_and_answers_v3.append({
-                "question_id": response.question_id,
-                "question_text": response.question_text,
-                "student_answer_text": response.answer.get('text', ''),
-                "lecturer_answer_text": response.lecturer_answer_text,
-                "rubric": response.rubric,
-                "rubric_max_score": response.rubric_max_score
-            })
-        
-        # Prepare questions_and_answers structure for prompt generator b
-        # Note: prompt_generator_b uses 'max_score' instead of 'rubric_max_score'
-        questions_and_answers_for_b = []
-        for response in ai_responses:
-            questions_and_answers_for_b.append({
-                "question_id": response.question_id,
-                "question_text": response.question_text,
-                "student_answer_text": response.answer.get('text', ''),
-                "lecturer_answer_text": response.lecturer_answer_text,
-                "max_score": response.rubric_max_score # Use rubric_max_score as max_score for prompt_b
-            })
 
         # Generate analysis prompt for v3
-        prompt_v3 = construct_overall_assignment_analysis_prompt_v3(
-            quiz_id=quiz.id,
-            student_id=current_user.id,
-            model_name=model_name,
-            questions_and_answers=questions_and_answers_v3,
-            overall_assignment_title=quiz.title,
-            lecturer_overall_notes=quiz.lecturer_overall_notes
+        prompt_v3 = await GradingService.build_analysis_prompt(
+            quiz, current_user.id, model_name, questions, responses
         )
-        
+
         # Generate analysis prompt for v3_b
+        # Note: prompt_generator_b uses 'max_score' instead of 'rubric_max_score'
+        questions_and_answers_for_b = [
+            {
+                "question_id": qa["question_id"],
+                "question_text": qa["question_text"],
+                "student_answer_text": qa["student_answer_text"],
+                "lecturer_answer_text": qa["lecturer_answer_text"],
+                "max_score": qa["rubric_max_score"],
+            }
+            for qa in GradingService.build_questions_and_answers(questions, responses)
+        ]
         prompt_v3_b = construct_model_answer_comparison_prompt_b(
             quiz_id=quiz.id,
             student_id=current_user.id,
@@ -248,31 +303,43 @@ async def analyze_quiz_ab_test(
             overall_assignment_title=quiz.title,
             lecturer_overall_notes=quiz.lecturer_overall_notes
         )
-        
-        # Get LLM API call function
-        llm_call_function = get_llm_api_call_function(model_name)
-
-        # Analyze with LLM for both prompts
-        analysis_result_v3, input_tokens_v3 = llm_call_function(prompt_v3)
-        analysis_result_v3_b, input_tokens_v3_b = llm_call_function(prompt_v3_b)
-
-        print("Analysis Result V3:", analysis_result_v3)
-        print("Analysis Result V3_B:", analysis_result_v3_b)
-        print("Input Tokens V3:", input_tokens_v3)
-        print("Input Tokens V3_B:", input_tokens_v3_b)
-        
+
+        # Analyze both prompts concurrently and store the results for comparison
+        experiment = await ExperimentService.run_variants(
+            quiz.id,
+            current_user.id,
+            model_name,
+            {ANALYSIS_PROMPT_VERSION: prompt_v3, "comparison_b": prompt_v3_b},
+            use_cache=use_cache,
+        )
+        result_v3 = experiment["variants"][ANALYSIS_PROMPT_VERSION]
+        result_v3_b = experiment["variants"]["comparison_b"]
+
+        print("Analysis Result V3:", result_v3["analysis"])
+        print("Analysis Result V3_B:", result_v3_b["analysis"])
+        print("Input Tokens V3:", result_v3["input_tokens"])
+        print("Input Tokens V3_B:", result_v3_b["input_tokens"])
+
+        if result_v3["error"] and result_v3_b["error"]:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Quiz analysis failed: {result_v3['error']}"
+            )
+
         # Return both analysis results for comparison
         return {
             "success": True,
-            "analysis_v3": analysis_result_v3,
-            "analysis_v3_b": analysis_result_v3_b,
+            "analysis_v3": result_v3["analysis"],
+            "analysis_v3_b": result_v3_b["analysis"],
             "model_used": model_name,
             "quiz_id": quiz.id,
             "student_id": current_user.id,
-            "input_tokens_v3": input_tokens_v3, # Add input tokens for v3
-            "input_tokens_v3_b": input_tokens_v3_b # Add input tokens for v3_b
+            "input_tokens_v3": result_v3["input_tokens"],
+            "input_tokens_v3_b": result_v3_b["input_tokens"],
+            "experiment_id": experiment["experiment_id"],
+            "variants": experiment["variants"],
         }
-        
+
     except HTTPException as he:
         # Re-raise HTTP exceptions with their original status code
         raise he
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Literal, Optional, Dict, Any, Union
 from datetime import datetime
 from pydantic import BaseModel
 from fastapi import Response
@@ -10,6 +10,12 @@ from typing import Optional
 from datetime import datetime
 
 from app.services.assesment_service import AssessmentService
+from app.utils.json_response import encoded_json_response
+from app.utils.pagination import (
+    decode_participant_cursor,
+    decode_timestamp_cursor,
+    encode_timestamp_cursor,
+)
 from app.schemas.assesment import (
     AssessmentResponse,
     AssessmentSummary,
@@ -20,6 +26,13 @@ from app.schemas.assesment import (
 
 router = APIRouter()
 
+
+def validate_cursor(cursor: str, decode):
+    try:
+        decode(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
 # Pydantic models for request bodies
 class QuestionScoreUpdate(BaseModel):
     question_id: int
@@ -30,7 +43,7 @@ class AssessmentGradingUpdate(BaseModel):
 
 
 @router.get("/{id}", response_model=Optional[AssessmentResponse])
-async def get_assessment(id: int, quiz_id: Optional[int] = None):
+async def get_assessment(request: Request, id: int, quiz_id: Optional[int] = None):
     """
     Get assessment by ID
 
@@ -38,10 +51,10 @@ async def get_assessment(id: int, quiz_id: Optional[int] = None):
         id: Assessment ID
         quiz_id: Optional quiz ID to verify assessment belongs to specified quiz
     """
-    result = await AssessmentService.get_assessment_by_id(id)
-    if not result:
+    payload = await AssessmentService.get_assessment_payload(id)
+    if not payload:
         raise HTTPException(status_code=404, detail="Assessment not found")
-    return result
+    return encoded_json_response(request, payload)
 
 
 
@@ -98,9 +111,10 @@ async def download_assessment_csv(id: int, quiz_id: Optional[int] = None):
     })
 
 
-@router.get("/", response_model=List[AssessmentResponse])
+@router.get("/", response_model=Union[List[AssessmentResponse], List[Dict[str, Any]]])
 async def get_assessments(
     quiz_id: int,
+    response: Response,
     user_id: Optional[int] = None,
     min_score: Optional[float] = None,
     max_score: Optional[float] = None,
@@ -108,11 +122,24 @@ async def get_assessments(
     to_date: Optional[datetime] = None,
     offset: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = Query(None, description="Next-page cursor from the X-Next-Cursor header"),
+    view: Literal["full", "summary"] = Query(
+        "full", description="summary returns top-level columns only, without question details"
+    ),
+    fields: Optional[List[str]] = Query(
+        None, description="Columns to return with view=summary (default: all summary columns)"
+    ),
 ):
     """
     Get filtered assessments with pagination
     this is use for FILTER (PENCARIAN WAK)
+
+    Results are ordered newest first. When a full page is returned, the
+    X-Next-Cursor response header holds the cursor for the following page.
+    view=summary selects only the scores and metadata in a single query.
     """
+    if cursor:
+        validate_cursor(cursor, decode_timestamp_cursor)
     filter_params = AssessmentFilter(
         user_id=user_id,
         quiz_id=quiz_id,
@@ -122,8 +149,34 @@ async def get_assessments(
         to_date=to_date,
         offset=offset,
         limit=limit,
+        cursor=cursor,
     )
-    return await AssessmentService.get_assessments_by_filter(filter_params)
+
+    if view == "summary":
+        try:
+            AssessmentService.resolve_summary_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        assessments = await AssessmentService.get_assessment_summaries(
+            filter_params, fields
+        )
+    elif fields:
+        raise HTTPException(status_code=400, detail="fields requires view=summary")
+    else:
+        assessments = await AssessmentService.get_assessments_by_filter(filter_params)
+
+    if len(assessments) == filter_params.limit:
+        last = assessments[-1]
+        if view == "summary":
+            next_cursor = encode_timestamp_cursor(
+                last["assessment_timestamp_utc"], last["id"]
+            )
+        else:
+            next_cursor = encode_timestamp_cursor(
+                last.assessment_timestamp_utc, last.id
+            )
+        response.headers["X-Next-Cursor"] = next_cursor
+    return assessments
 
 
 # 1. GET ALL STUDENTS ASSESSMENTS (FOR TEACHERS)
@@ -134,8 +187,9 @@ async def get_all_students_assessments(
     min_score: Optional[float] = Query(None, description="Minimum score filter"),
     max_score: Optional[float] = Query(None, description="Maximum score filter"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    offset: int = Query(0, description="Pagination offset"),
-    limit: int = Query(10, description="Number of results per page"),
+    offset: int = Query(0, ge=0, description="Pagination offset"),
+    limit: int = Query(10, ge=1, le=100, description="Number of results per page"),
+    cursor: Optional[str] = Query(None, description="pagination.next_cursor from the previous page"),
 ) -> Dict[str, Any]:
     """
     Get all students' assessments for a specific quiz (TEACHER VIEW)
@@ -149,7 +203,10 @@ async def get_all_students_assessments(
         status: Optional status filter (submited, graded, etc.)
         offset: Pagination offset
         limit: Number of results per page
+        cursor: Keyset cursor from the previous page; replaces offset
     """
+    if cursor:
+        validate_cursor(cursor, decode_participant_cursor)
     try:
         result = await AssessmentService.get_all_students_assessments(
             quiz_id=quiz_id,
@@ -159,6 +216,7 @@ async def get_all_students_assessments(
             status=status,
             offset=offset,
             limit=limit,
+            cursor=cursor,
         )
         return result
     except Exception as e:
@@ -210,8 +268,9 @@ async def get_my_assessments(
     user_id: int,  # This should come from current_user authorization
     quiz_id: Optional[int] = Query(None, description="Filter by specific quiz"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    offset: int = Query(0, description="Pagination offset"),
-    limit: int = Query(10, description="Number of results per page"),
+    offset: int = Query(0, ge=0, description="Pagination offset"),
+    limit: int = Query(10, ge=1, le=100, description="Number of results per page"),
+    cursor: Optional[str] = Query(None, description="pagination.next_cursor from the previous page"),
 ) -> Dict[str, Any]:
     """
     Get student's own assessments (STUDENT VIEW)
@@ -223,7 +282,10 @@ async def get_my_assessments(
         status: Optional status filter
         offset: Pagination offset
         limit: Number of results per page
+        cursor: Keyset cursor from the previous page; replaces offset
     """
+    if cursor:
+        validate_cursor(cursor, decode_timestamp_cursor)
     try:
         result = await AssessmentService.get_student_own_assessments(
             user_id=user_id,
@@ -231,6 +293,7 @@ async def get_my_assessments(
             status=status,
             offset=offset,
             limit=limit,
+            cursor=cursor,
         )
         return result
     except Exception as e:
@@ -358,12 +421,21 @@ async def get_quiz_assessments(
 
 # FIXED: Add missing route path
 @router.get("/quiz/{quiz_id}/statistics")
-async def get_quiz_statistics(quiz_id: int) -> Dict[str, Any]:
+async def get_quiz_statistics(
+    quiz_id: int,
+    view: Literal["full", "summary"] = Query(
+        "full",
+        description="summary reads only the precomputed aggregates and grade distribution",
+    ),
+) -> Dict[str, Any]:
     """
     Get comprehensive statistics for a specific quiz
 
     Args:
         quiz_id: Quiz ID to get statistics for
+        view: "summary" reads the quiz's single quiz_statistics row, suited to
+            dashboards polling during a live quiz; "full" adds percentiles and
+            top/bottom performers
 
     Returns:
         Dictionary containing various statistics including:
@@ -374,7 +446,10 @@ async def get_quiz_statistics(quiz_id: int) -> Dict[str, Any]:
         - Date range of assessments
     """
     try:
-        statistics = await AssessmentService.get_quiz_statistics(quiz_id)
+        if view == "summary":
+            statistics = await AssessmentService.get_quiz_statistics_summary(quiz_id)
+        else:
+            statistics = await AssessmentService.get_quiz_statistics(quiz_id)
         if not statistics:
             raise HTTPException(
                 status_code=404, detail="No assessments found for this quiz"
@@ -1,8 +1,12 @@
 import uvicorn
-from fastapi import FastAPI, Request, UploadFile, File, HTTPException, Form,APIRouter
-from fastapi.responses import HTMLResponse, JSONResponse
-from app.core.llm.azure_assistant import initialize_openai_client, assistant_details, AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_DEPLOYMENT_NAME, client as openai_client
-from app.services.assistant_service import setup_assistant_resources, process_chat_message
+from fastapi import FastAPI, Request, UploadFile, File, HTTPException, Form,APIRouter, Depends
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from app.core.llm.azure_assistant import initialize_openai_client, AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_DEPLOYMENT_NAME, async_client as openai_client
+from app.dependencies import get_current_user
+from app.services.assistant_service import ASSISTANT_MAX_UPLOAD_BYTES, process_chat_message, stream_chat_message
+from app.services.assistant_session_service import AssistantSessionService
+from app.utils.sse import format_sse
+from app.utils.uploads import spool_upload
 
 
 router = APIRouter()
@@ -15,25 +19,49 @@ router = APIRouter()
 #         return HTMLResponse(content="<html><body><h1>Error</h1><p>Azure OpenAI client not initialized. Please check server logs and environment variables (AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_MODEL_DEPLOYMENT_NAME).</p></body></html>", status_code=503)
 #     return HTMLResponse(content=get_html_page())
 
-@router.post("/setup_assistant_and_thread")
-async def handle_setup_assistant_and_thread(pdfFile: UploadFile = File(...)):
+# Documented by hand because the body is streamed instead of parsed as a form
+SETUP_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["pdfFile"],
+                    "properties": {"pdfFile": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+@router.post("/setup_assistant_and_thread", openapi_extra=SETUP_UPLOAD_OPENAPI)
+async def handle_setup_assistant_and_thread(
+    request: Request, current_user=Depends(get_current_user)
+):
     """
     Handles PDF upload, creates an assistant with file_search tool,
-    a vector store with the file, and a new thread.
+    a vector store with the file, and a new thread for the current user.
+    Replaces the user's previous session, if any.
+
+    The upload is streamed to a temp file in chunks and hashed on the way, and
+    is rejected with a 413 once it exceeds ASSISTANT_MAX_UPLOAD_BYTES.
     """
     if not openai_client:
         raise HTTPException(status_code=503, detail="Azure OpenAI client not initialized. Check server logs.")
 
-    if not pdfFile.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Invalid file type. Only PDF is allowed.")
-
+    upload = await spool_upload(request, "pdfFile", ASSISTANT_MAX_UPLOAD_BYTES)
     try:
-        contents = await pdfFile.read() # Read file content
+        if not upload.filename.endswith('.pdf'):
+            raise HTTPException(status_code=400, detail="Invalid file type. Only PDF is allowed.")
+
         # Call the logic function to handle the setup
-        result = await setup_assistant_resources(
-            file_content=contents,
-            filename=pdfFile.filename,
-            assistant_config=assistant_details # Pass the shared state
+        result = await AssistantSessionService.setup_session(
+            user_id=current_user.id,
+            file=upload.file,
+            filename=upload.filename,
+            content_hash=upload.sha256,
         )
         return JSONResponse(content=result)
     except HTTPException as http_exc: # Re-raise FastAPI's own exceptions
@@ -43,10 +71,14 @@ async def handle_setup_assistant_and_thread(pdfFile: UploadFile = File(...)):
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred during setup: {str(e)}")
+    finally:
+        upload.close()
 
 @router.post("/chat")
-async def handle_chat_with_assistant(request: Request):
-    """Handles a user message, runs the assistant, and returns the reply."""
+async def handle_chat_with_assistant(
+    request: Request, current_user=Depends(get_current_user)
+):
+    """Handles a user message, runs the user's assistant, and returns the reply."""
     if not openai_client:
         raise HTTPException(status_code=503, detail="Azure OpenAI client not initialized. Check server logs.")
 
@@ -59,19 +91,19 @@ async def handle_chat_with_assistant(request: Request):
     if not user_message_content:
         raise HTTPException(status_code=400, detail="No message content provided ('user_message' field missing).")
 
-    # Retrieve stored IDs from the shared state
-    thread_id = assistant_details.get("thread_id")
-    assistant_id = assistant_details.get("assistant_id")
+    # Retrieve the user's session
+    session = await AssistantSessionService.get_session(current_user.id)
 
-    if not thread_id or not assistant_id:
+    if not session or not session.thread_id or not session.assistant_id:
         raise HTTPException(status_code=400, detail="Assistant or thread not initialized. Please upload a PDF first via /setup_assistant_and_thread.")
 
     try:
         # Call the logic function to handle the chat message
         response_data = await process_chat_message(
             user_message=user_message_content,
-            thread_id=thread_id,
-            assistant_id=assistant_id,
+            thread_id=session.thread_id,
+            assistant_id=session.assistant_id,
+            file_id_map=session.openai_file_id_map,
         )
         return JSONResponse(content=response_data)
     except HTTPException as http_exc: # Re-raise FastAPI's own exceptions
@@ -80,4 +112,60 @@ async def handle_chat_with_assistant(request: Request):
         print(f"Error in /chat: {e}")
         import traceback
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred during chat: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred during chat: {str(e)}")
+
+
+@router.post("/chat/stream")
+async def handle_chat_with_assistant_stream(
+    request: Request, current_user=Depends(get_current_user)
+):
+    """
+    Streaming variant of /chat: relays the assistant's reply as Server-Sent
+    Events while the run is producing it.
+
+    Events: "delta" ({"text"}) for each text fragment, then "done"
+    ({"assistant_reply"}) with the full reply, or "error" ({"detail"}).
+    """
+    if not openai_client:
+        raise HTTPException(status_code=503, detail="Azure OpenAI client not initialized. Check server logs.")
+
+    try:
+        data = await request.json()
+        user_message_content = data.get('user_message')
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload.")
+
+    if not user_message_content:
+        raise HTTPException(status_code=400, detail="No message content provided ('user_message' field missing).")
+
+    session = await AssistantSessionService.get_session(current_user.id)
+
+    if not session or not session.thread_id or not session.assistant_id:
+        raise HTTPException(status_code=400, detail="Assistant or thread not initialized. Please upload a PDF first via /setup_assistant_and_thread.")
+
+    async def event_stream():
+        try:
+            async for event in stream_chat_message(
+                user_message=user_message_content,
+                thread_id=session.thread_id,
+                assistant_id=session.assistant_id,
+                file_id_map=session.openai_file_id_map,
+            ):
+                yield format_sse(event["data"], event=event["event"])
+        except Exception as e:
+            print(f"Error in /chat/stream: {e}")
+            yield format_sse({"detail": f"An unexpected error occurred during chat: {str(e)}"}, event="error")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete("/session")
+async def handle_end_session(current_user=Depends(get_current_user)):
+    """Ends the current user's session and deletes its assistant, thread, vector store and file."""
+    if not await AssistantSessionService.end_session(current_user.id):
+        raise HTTPException(status_code=404, detail="No active assistant session.")
+    return {"message": "Assistant session ended."}
@@ -3,6 +3,7 @@ from tortoise.exceptions import DoesNotExist
 from app.models.models import Question, User
 from app.schemas.question import QuestionCreate, QuestionRead
 from app.dependencies import get_current_user
+from app.services.quiz_service import QuizService
 from tortoise.contrib.pydantic import pydantic_model_creator
 from app.models.models import QuestionResponse, Question, QuizParticipant, Quiz
 
@@ -32,5 +33,6 @@ async def create_question(
         rubric=payload.rubric,
         rubric_max_score=payload.rubric_max_score
     )
+    await QuizService.bump_content_version(payload.quiz_id)
     return await Question_Pydantic.from_tortoise_orm(question)
 
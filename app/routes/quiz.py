@@ -1,5 +1,9 @@
 # app/routes/quiz.py
-from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File, Form
+from pydantic import ValidationError
 from tortoise.exceptions import IntegrityError
 from app.models.models import Quiz, User, Question, QuizParticipant
 from app.schemas.quiz import QuizCreate, QuizRead, QuizWithStatusAll
@@ -7,6 +11,13 @@ from app.schemas.question import QuizWithQuestionsCreate
 from app.schemas.quiz import QuizReadWithQuestions
 from app.schemas.question import QuestionReadForStudent, QuestionRead
 
+from app.services.quiz_service import (
+    QuizService,
+    QUIZ_IMPORT_MAX_BYTES,
+    QUIZ_IMPORT_MAX_QUESTIONS,
+)
+from app.utils.json_response import encoded_json_response
+from app.utils.quiz_import import parse_question_bank
 from app.utils.util import make_join_code
 from tortoise.contrib.pydantic import pydantic_model_creator
 from app.dependencies import get_current_user
@@ -70,84 +81,83 @@ async def create_quiz_with_questions(
     payload: QuizWithQuestionsCreate,
     current_user: User = Depends(get_current_user)
 ):
-    for _ in range(5):
-        code = make_join_code(6)
-        try:
-            quiz = await Quiz.create(
-                creator=current_user,
-                title=payload.title,
-                description=payload.description,
-                lecturer_overall_notes=payload.lecturer_overall_notes,
-                start_time=payload.start_time,
-                end_time=payload.end_time,
-                duration=payload.duration,
-                join_code=code,
-            )
-            break
-        except IntegrityError:
-            continue
-    else:
-        raise HTTPException(status_code=500, detail="Could not generate a unique join code")
-
-    # Create questions
-    for q in payload.questions:
-        await Question.create(
-            quiz=quiz,
-            text=q.text,
-            type=q.type,
-            options=q.options,
-            expected_answer=q.expected_answer,
-            rubric=q.rubric,
-            rubric_max_score=q.rubric_max_score,
-        )
+    try:
+        quiz = await QuizService.create_quiz_with_questions(current_user.id, payload)
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
     return {"message": "Quiz and questions created successfully", "quiz_id": quiz.id}
 
+# ! import a quiz with questions from a CSV or JSON quiz bank
+@router.post("/import")
+async def import_quiz(
+    file: UploadFile = File(...),
+    title: Optional[str] = Form(None),
+    description: Optional[str] = Form(None),
+    duration: Optional[int] = Form(None),
+    lecturer_overall_notes: Optional[str] = Form(None),
+    start_time: Optional[datetime] = Form(None),
+    end_time: Optional[datetime] = Form(None),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Creates a quiz from an uploaded question bank in one transaction. Quiz
+    fields given as form fields override those inside a JSON bank; a CSV bank
+    carries questions only, so title, description and duration are required.
+    """
+    if file.size is not None and file.size > QUIZ_IMPORT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Quiz bank is too large")
+    content = await file.read(QUIZ_IMPORT_MAX_BYTES + 1)
+    if len(content) > QUIZ_IMPORT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Quiz bank is too large")
+
+    try:
+        quiz_fields, questions = parse_question_bank(file.filename or "", content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    overrides = {
+        "title": title,
+        "description": description,
+        "duration": duration,
+        "lecturer_overall_notes": lecturer_overall_notes,
+        "start_time": start_time,
+        "end_time": end_time,
+    }
+    quiz_fields.update({k: v for k, v in overrides.items() if v is not None})
+    try:
+        payload = QuizWithQuestionsCreate(**quiz_fields, questions=questions)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422, detail=e.errors(include_url=False, include_input=False)
+        )
+    if not payload.questions:
+        raise HTTPException(status_code=400, detail="Quiz bank contains no questions")
+    if len(payload.questions) > QUIZ_IMPORT_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Quiz bank has more than {QUIZ_IMPORT_MAX_QUESTIONS} questions",
+        )
+
+    try:
+        quiz = await QuizService.create_quiz_with_questions(current_user.id, payload)
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        "message": "Quiz imported successfully",
+        "quiz_id": quiz.id,
+        "question_count": len(payload.questions),
+    }
+
 @router.get("/quiz/{quiz_id}", response_model=QuizReadWithQuestions)
 async def get_quiz_with_questions(
     quiz_id: int,
+    request: Request,
     current_user=Depends(get_current_user)
 ):
-    # Check if quiz exists
-    quiz = await Quiz.get_or_none(id=quiz_id)
-    if not quiz:
-        raise HTTPException(status_code=404, detail="Quiz not found")
-
-    # Check if user is participant in the quiz
-    participant = await QuizParticipant.get_or_none(
-        user_id=current_user.id,
-        quiz_id=quiz_id
-    )
-    if not participant:
-        raise HTTPException(
-            status_code=403,
-            detail="You are not a participant in this quiz"
-        )
-
-    # Get all questions for the specified quiz
-    questions = await Question.filter(quiz_id=quiz_id)
-    await quiz.fetch_related('creator')
-    
-    return QuizReadWithQuestions(
-        id=quiz.id,
-        title=quiz.title,
-        creator_id=quiz.creator.id,
-        description=quiz.description,
-        join_code=quiz.join_code,
-        created_at=quiz.created_at,
-        duration=quiz.duration,
-        questions=[
-            QuestionRead(
-                id=q.id,
-                quiz_id=q.quiz_id,
-                text=q.text,
-                type=q.type,
-                options=q.options,
-                expected_answer=q.expected_answer,
-                created_at=q.created_at
-            ) for q in questions
-        ]
-    )
+    content = await QuizService.get_quiz_for_participant(quiz_id, current_user.id)
+    return encoded_json_response(request, content)
 
 
 # ! create a quiz
@@ -1,20 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from tortoise.exceptions import IntegrityError
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request
+from tortoise.transactions import in_transaction
 from app.models.models import QuestionResponse, Question, QuizParticipant, Quiz
 from app.schemas.question_response import (
     QuestionResponseCreate,
     QuestionResponseRead,
     BulkQuestionResponseCreate,
     QuestionResponseToAI,
-    BulkQuestionResponseToAI
+    BulkQuestionResponseToAI,
+    AnswerDraftCreate,
+    AnswerDraftSaved
 )
 from app.schemas.quiz import QuizReadWithQuestions
 from app.schemas.question import QuestionReadForStudent
 from app.dependencies import get_current_user
+from app.services.answer_draft_service import AnswerDraftService
+from app.services.quiz_service import QuizService
+from app.utils.json_response import encoded_json_response
+from app.utils.util import StatusType
 from datetime import datetime
 from tortoise.contrib.pydantic import pydantic_model_creator
 from typing import List
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 StudentResponse = pydantic_model_creator(QuestionResponse, name="QuestionResponse")
@@ -22,110 +31,140 @@ StudentResponse = pydantic_model_creator(QuestionResponse, name="QuestionRespons
 @router.get("/quiz/{quiz_id}", response_model=QuizReadWithQuestions)
 async def get_quiz_with_questions(
     quiz_id: int,
+    request: Request,
     current_user=Depends(get_current_user)
 ):
-    # Check if quiz exists
-    quiz = await Quiz.get_or_none(id=quiz_id)
-    if not quiz:
-        raise HTTPException(status_code=404, detail="Quiz not found")
+    content = await QuizService.get_quiz_for_participant(quiz_id, current_user.id)
+    return encoded_json_response(request, content)
 
-    # Check if user is participant in the quiz
-    participant = await QuizParticipant.get_or_none(
-        user_id=current_user.id,
-        quiz_id=quiz_id
+# ! autosave one answer while the quiz is in progress
+@router.put("/draft", response_model=AnswerDraftSaved)
+async def save_answer_draft(
+    draft: AnswerDraftCreate,
+    current_user=Depends(get_current_user)
+):
+    return await AnswerDraftService.save_draft(
+        current_user.id, draft.quiz_id, draft.question_id, draft.answer
     )
-    if not participant:
-        raise HTTPException(
-            status_code=403,
-            detail="You are not a participant in this quiz"
-        )
 
-    # Get all questions for the specified quiz
-    questions = await Question.filter(quiz_id=quiz_id)
-    await quiz.fetch_related('creator')
-    
-    return QuizReadWithQuestions(
-        id=quiz.id,
-        title=quiz.title,
-        creator_id=quiz.creator.id,
-        description=quiz.description,
-        join_code=quiz.join_code,
-        created_at=quiz.created_at,
-        duration=quiz.duration,
-        questions=[
-            QuestionReadForStudent(
-                id=q.id,
-                quiz_id=q.quiz_id,
-                text=q.text,
-                type=q.type,
-                options=q.options,
-                created_at=q.created_at
-            ) for q in questions
-        ]
-    )
+# ! answers saved so far, to resume an interrupted attempt
+@router.get("/draft/{quiz_id}", response_model=List[QuestionResponseRead])
+async def get_answer_drafts(
+    quiz_id: int,
+    current_user=Depends(get_current_user)
+):
+    return await AnswerDraftService.get_drafts(current_user.id, quiz_id)
 
 @router.post("/", response_model=List[QuestionResponseRead])
 async def submit_all_answers(
     bulk_response_data: BulkQuestionResponseCreate,
     current_user=Depends(get_current_user)
 ):
-    # Check if quiz exists
-    quiz = await Quiz.get_or_none(id=bulk_response_data.quiz_id)
-    if not quiz:
-        raise HTTPException(status_code=404, detail="Quiz not found")
-
-    # Check if user is participant in the quiz
-    participant = await QuizParticipant.get_or_none(
-        user_id=current_user.id,
-        quiz_id=bulk_response_data.quiz_id
-    )
-    if not participant:
-        raise HTTPException(
-            status_code=403,
-            detail="You are not a participant in this quiz"
-        )
-    
-    # Update participant status to submitted
-    participant.status = "submited"
-    await participant.save()
-
-    # Get all questions for the specified quiz
-    quiz_questions = await Question.filter(quiz_id=bulk_response_data.quiz_id)
-    valid_question_ids = {q.id for q in quiz_questions}
+    quiz_id = bulk_response_data.quiz_id
 
-    submitted_responses = []
+    # Validate every answer against the quiz's questions before writing anything
+    questions = {
+        q.id: q for q in await Question.filter(quiz_id=quiz_id).only("id", "text", "type")
+    }
+    if not questions and not await Quiz.exists(id=quiz_id):
+        raise HTTPException(status_code=404, detail="Quiz not found")
+    answers = {}
     for response_data in bulk_response_data.responses:
-        # Validate if the question_id belongs to the specified quiz
-        if response_data.question_id not in valid_question_ids:
+        if response_data.question_id not in questions:
             raise HTTPException(
                 status_code=400,
-                detail=f"Question with ID {response_data.question_id} does not belong to Quiz ID {bulk_response_data.quiz_id}"
+                detail=f"Question with ID {response_data.question_id} does not belong to Quiz ID {quiz_id}"
+            )
+        # Only the first answer to a question in one submission counts
+        answers.setdefault(response_data.question_id, response_data.answer)
+
+    async with in_transaction() as conn:
+        # Locking the participant row serialises concurrent submissions of one student
+        participant = (
+            await QuizParticipant.filter(user_id=current_user.id, quiz_id=quiz_id)
+            .select_for_update()
+            .using_db(conn)
+            .first()
+        )
+        if not participant:
+            raise HTTPException(
+                status_code=403,
+                detail="You are not a participant in this quiz"
             )
 
-        try:
-            # Create response
-            response = await QuestionResponse.create(
-                user_id=current_user.id,
-                question_id=response_data.question_id,
-                answer=response_data.answer
+        if participant.status == StatusType.UNFINISHED:
+            # Answers autosaved as drafts are overwritten by the submitted ones
+            if answers:
+                await QuestionResponse.bulk_create(
+                    [
+                        QuestionResponse(
+                            user_id=current_user.id,
+                            question_id=question_id,
+                            answer=answer,
+                        )
+                        for question_id, answer in answers.items()
+                    ],
+                    on_conflict=["user_id", "question_id"],
+                    update_fields=["answer"],
+                    using_db=conn,
+                )
+            # The submission is every answer the student has saved for this quiz
+            submitted_question_ids = list(questions)
+        else:
+            answered = set(
+                await QuestionResponse.filter(
+                    user_id=current_user.id, question_id__in=list(answers)
+                )
+                .using_db(conn)
+                .values_list("question_id", flat=True)
             )
-            await response.fetch_related('question')
-            submitted_responses.append(
-                QuestionResponseRead(
-                    id=response.id,
-                    question_id=response.question.id,
-                    question_text=response.question.text,
-                    question_type=response.question.type,
-                    answer=response.answer,
-                    joined_at=response.joined_at
+            if answered:
+                logger.info(f"User {current_user.id} has already answered questions {sorted(answered)}. Skipping.")
+            submitted_question_ids = [
+                question_id for question_id in answers if question_id not in answered
+            ]
+            if submitted_question_ids:
+                await QuestionResponse.bulk_create(
+                    [
+                        QuestionResponse(
+                            user_id=current_user.id,
+                            question_id=question_id,
+                            answer=answers[question_id],
+                        )
+                        for question_id in submitted_question_ids
+                    ],
+                    ignore_conflicts=True,
+                    using_db=conn,
                 )
+
+        # Bulk inserts do not return primary keys, so read back the rows in one query
+        created = await (
+            QuestionResponse.filter(
+                user_id=current_user.id, question_id__in=submitted_question_ids
             )
-        except IntegrityError:
-            print(f"User {current_user.id} has already answered question {response_data.question_id}. Skipping.")
-            pass
-    
-    if not submitted_responses:
-        raise HTTPException(status_code=400, detail="No new answers were submitted or all were duplicates.")
+            .using_db(conn)
+            .values("id", "question_id", "answer", "joined_at")
+        ) if submitted_question_ids else []
+        if not created:
+            raise HTTPException(status_code=400, detail="No new answers were submitted or all were duplicates.")
 
-    return submitted_responses
+        # Mark the submission only once its answers are written
+        await QuizParticipant.filter(id=participant.id).using_db(conn).update(
+            status=StatusType.SUBMITED
+        )
+    AnswerDraftService.forget(current_user.id, quiz_id)
 
+    # Submitted answers in request order, then remaining drafts by question
+    position = {question_id: i for i, question_id in enumerate(answers)}
+    created.sort(key=lambda row: (position.get(row["question_id"], len(position)), row["question_id"]))
+    return [
+        QuestionResponseRead(
+            id=row["id"],
+            question_id=row["question_id"],
+            question_text=questions[row["question_id"]].text,
+            question_type=questions[row["question_id"]].type,
+            answer=row["answer"],
+            joined_at=row["joined_at"]
+        )
+        for row in created
+    ]
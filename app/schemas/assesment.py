@@ -167,6 +167,8 @@ class AssessmentFilter(BaseModel):
     to_date: Optional[datetime] = None
     limit: int = Field(default=10, ge=1, le=100)
     offset: int = Field(default=0, ge=0)
+    # Opaque keyset cursor from a previous page; takes precedence over offset
+    cursor: Optional[str] = None
 
 
 class StudentFilter(BaseModel):
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from app.utils.util import GradingJobStatus
+
+
+class GradingJobRead(BaseModel):
+    id: int
+    quiz_id: int
+    user_id: int
+    model_name: str
+    status: GradingJobStatus
+    attempts: int
+    assessment_id: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
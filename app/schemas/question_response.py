@@ -24,6 +24,14 @@ class QuestionResponseRead(QuestionResponseBase):
     class Config:
         from_attributes = True
 
+class AnswerDraftCreate(QuestionResponseBase):
+    quiz_id: int = Field(..., description="ID of the quiz the question belongs to")
+
+class AnswerDraftSaved(BaseModel):
+    id: int
+    question_id: int
+    saved_at: datetime
+
 class BulkQuestionResponseCreate(BaseModel):
     quiz_id: int = Field(..., description="ID of the quiz for which answers are being submitted")
     title: str = Field(..., description="Title of the quiz")
@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+from dotenv import load_dotenv
+from tortoise import timezone
+
+from app.models.models import AIDetectionCacheEntry
+from app.utils.cache import TTLCache
+from app.utils.util import check_ai_plagiarism, check_ai_with_sapling
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Bump when the detector model behind an API changes so old scores are not reused
+SAPLING_DETECTOR_VERSION = os.getenv("SAPLING_DETECTOR_VERSION", "v1")
+# Cached detector results are reused for this many seconds (default 30 days)
+AI_DETECTION_CACHE_TTL = int(os.getenv("AI_DETECTION_CACHE_TTL", str(30 * 24 * 3600)))
+# Entries kept in the in-process tier
+AI_DETECTION_CACHE_SIZE = int(os.getenv("AI_DETECTION_CACHE_SIZE", "2048"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class AIDetectionService:
+    """
+    AI-detector calls behind a content-addressed cache.
+
+    Results are keyed by sha256(detector, detector version, normalized text) and
+    looked up in an in-process LRU first, then in the ai_detection_cache table.
+    Only successful detector responses are cached.
+    """
+
+    _memory = TTLCache(maxsize=AI_DETECTION_CACHE_SIZE, ttl=AI_DETECTION_CACHE_TTL)
+    _in_flight: Dict[str, "asyncio.Future"] = {}
+    stats = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Unicode-normalizes the text and collapses runs of whitespace"""
+        text = unicodedata.normalize("NFKC", text)
+        return _WHITESPACE_RE.sub(" ", text).strip()
+
+    @staticmethod
+    def cache_key(detector: str, detector_version: str, text: str) -> str:
+        normalized = AIDetectionService.normalize_text(text)
+        payload = f"{detector}\0{detector_version}\0{normalized}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    @staticmethod
+    async def check_sapling(text: str) -> Optional[dict]:
+        """Cached `check_ai_with_sapling`"""
+        return await AIDetectionService._cached(
+            "sapling", SAPLING_DETECTOR_VERSION, text, check_ai_with_sapling
+        )
+
+    @staticmethod
+    async def check_plagiarism(text: str, version: str = "v1") -> Optional[float]:
+        """Cached `check_ai_plagiarism`"""
+        return await AIDetectionService._cached(
+            "ai_detector",
+            version,
+            text,
+            lambda t: check_ai_plagiarism(t, version=version),
+        )
+
+    @staticmethod
+    async def purge_expired() -> int:
+        """Deletes expired rows from the persistent tier"""
+        return await AIDetectionCacheEntry.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+
+    @staticmethod
+    async def _cached(
+        detector: str,
+        detector_version: str,
+        text: str,
+        detect: Callable[[str], Awaitable[Any]],
+    ) -> Any:
+        key = AIDetectionService.cache_key(detector, detector_version, text)
+
+        cached = AIDetectionService._memory.get(key)
+        if cached is not None:
+            AIDetectionService.stats["memory_hits"] += 1
+            return cached
+
+        # Identical answers checked at the same time share one lookup
+        in_flight = AIDetectionService._in_flight.get(key)
+        if in_flight is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # Only give up if this caller was cancelled, not the shared lookup
+                if not in_flight.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        AIDetectionService._in_flight[key] = future
+        try:
+            result = await AIDetectionService._lookup_or_detect(
+                key, detector, detector_version, text, detect
+            )
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            AIDetectionService._in_flight.pop(key, None)
+
+    @staticmethod
+    async def _lookup_or_detect(
+        key: str,
+        detector: str,
+        detector_version: str,
+        text: str,
+        detect: Callable[[str], Awaitable[Any]],
+    ) -> Any:
+        now = timezone.now()
+        try:
+            entry = await AIDetectionCacheEntry.get_or_none(key=key, expires_at__gt=now)
+        except Exception as e:
+            logger.warning(f"AI detection cache read failed: {e}")
+            entry = None
+
+        if entry is not None:
+            AIDetectionService.stats["db_hits"] += 1
+            remaining = (entry.expires_at - now).total_seconds()
+            AIDetectionService._memory.set(key, entry.result, ttl=remaining)
+            return entry.result
+
+        AIDetectionService.stats["misses"] += 1
+        result = await detect(text)
+        if result is None:
+            # Detector errors are not cached so the next call retries
+            return None
+
+        AIDetectionService._memory.set(key, result)
+        try:
+            await AIDetectionCacheEntry.bulk_create(
+                [
+                    AIDetectionCacheEntry(
+                        key=key,
+                        detector=detector,
+                        detector_version=detector_version,
+                        result=result,
+                        expires_at=now + timedelta(seconds=AI_DETECTION_CACHE_TTL),
+                    )
+                ],
+                on_conflict=["key"],
+                update_fields=["result", "expires_at"],
+            )
+        except Exception as e:
+            logger.warning(f"AI detection cache write failed: {e}")
+        return result
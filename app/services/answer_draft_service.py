@@ -0,0 +1,126 @@
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from tortoise import timezone
+
+from app.db.db import SQLParams, get_connection
+from app.models.models import Question, QuestionResponse, Quiz, QuizParticipant
+from app.utils.cache import TTLCache
+from app.utils.util import StatusType
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Seconds a validated (student, quiz) pair is trusted before drafts re-check it
+ANSWER_DRAFT_SESSION_TTL = int(os.getenv("ANSWER_DRAFT_SESSION_TTL", "900"))
+# (student, quiz) pairs kept in the in-process tier
+ANSWER_DRAFT_SESSION_CACHE_SIZE = int(os.getenv("ANSWER_DRAFT_SESSION_CACHE_SIZE", "10000"))
+
+
+@dataclass(frozen=True)
+class DraftSession:
+    """What the first draft of a student in a quiz validated"""
+
+    participant_id: int
+    question_ids: FrozenSet[int]
+
+
+class AnswerDraftService:
+    """
+    Autosaved answers. Drafts are ordinary QuestionResponse rows written while
+    the participant is still unfinished; the final submission only has to flip
+    the participant's status.
+
+    The first draft of a student in a quiz loads the participant and the quiz's
+    question ids, and caches them in-process. Every later draft is a single
+    upsert whose WHERE clause re-checks that the participant is unfinished, so
+    a draft arriving after submission never overwrites a submitted answer, in
+    this worker or any other.
+    """
+
+    _sessions = TTLCache(maxsize=ANSWER_DRAFT_SESSION_CACHE_SIZE, ttl=ANSWER_DRAFT_SESSION_TTL)
+
+    @staticmethod
+    async def save_draft(
+        user_id: int, quiz_id: int, question_id: int, answer: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Inserts or overwrites the student's answer to one question.
+
+        Raises:
+            HTTPException: unknown quiz (404) or question (400), not a
+                participant (403), or the quiz was already submitted (409)
+        """
+        session = await AnswerDraftService._session(user_id, quiz_id)
+        if question_id not in session.question_ids:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Question with ID {question_id} does not belong to Quiz ID {quiz_id}"
+            )
+
+        saved_at = timezone.now()
+        fields_map = QuestionResponse._meta.fields_map
+        connection = get_connection()
+        params = SQLParams(connection)
+        # Waits for an in-flight submission's row lock, then sees its new status
+        share_lock = "FOR SHARE" if params.dialect == "postgres" else ""
+        _, rows = await connection.execute_query(
+            f"""
+            INSERT INTO "questionresponse" ("user_id", "question_id", "answer", "joined_at")
+            SELECT {params.add(user_id)}, {params.add(question_id)},
+                {params.add(fields_map["answer"].to_db_value(answer, None))},
+                {params.add(fields_map["joined_at"].to_db_value(saved_at, None))}
+            WHERE EXISTS (
+                SELECT 1 FROM "quizparticipant"
+                WHERE "id" = {params.add(session.participant_id)}
+                    AND "status" = {params.add(StatusType.UNFINISHED.value)}
+                {share_lock}
+            )
+            ON CONFLICT ("user_id", "question_id") DO UPDATE SET "answer" = excluded."answer"
+            RETURNING "id"
+            """,
+            params.values,
+        )
+        if not rows:
+            AnswerDraftService.forget(user_id, quiz_id)
+            raise HTTPException(status_code=409, detail="This quiz has already been submitted")
+        return {"id": rows[0]["id"], "question_id": question_id, "saved_at": saved_at}
+
+    @staticmethod
+    async def get_drafts(user_id: int, quiz_id: int) -> List[Dict[str, Any]]:
+        """The student's saved answers for a quiz, to restore an interrupted attempt"""
+        return await (
+            QuestionResponse.filter(user_id=user_id, question__quiz_id=quiz_id)
+            .order_by("question_id")
+            .values("id", "question_id", "answer", "joined_at")
+        )
+
+    @staticmethod
+    def forget(user_id: int, quiz_id: int):
+        """Drops the cached validation, e.g. once the student has submitted"""
+        AnswerDraftService._sessions.pop((user_id, quiz_id))
+
+    @staticmethod
+    async def _session(user_id: int, quiz_id: int) -> DraftSession:
+        key = (user_id, quiz_id)
+        session: Optional[DraftSession] = AnswerDraftService._sessions.get(key)
+        if session is not None:
+            return session
+
+        participant = await QuizParticipant.get_or_none(user_id=user_id, quiz_id=quiz_id)
+        if not participant:
+            if not await Quiz.exists(id=quiz_id):
+                raise HTTPException(status_code=404, detail="Quiz not found")
+            raise HTTPException(status_code=403, detail="You are not a participant in this quiz")
+        if participant.status != StatusType.UNFINISHED:
+            raise HTTPException(status_code=409, detail="This quiz has already been submitted")
+
+        question_ids = await Question.filter(quiz_id=quiz_id).values_list("id", flat=True)
+        session = DraftSession(participant.id, frozenset(question_ids))
+        AnswerDraftService._sessions.set(key, session)
+        return session
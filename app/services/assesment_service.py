@@ -1,12 +1,25 @@
+import asyncio
 import json
-from typing import List, Optional, Dict, Any
+import os
+from typing import List, Optional, Dict, Any, Tuple
 from tortoise.transactions import in_transaction
 from tortoise.exceptions import DoesNotExist, IntegrityError
 from tortoise.queryset import QuerySet
 from datetime import datetime
 import logging
 from fastapi import HTTPException
-from app.utils.util import check_ai_plagiarism, check_ai_with_sapling
+from app.db.db import SQLParams, get_connection
+from app.services.ai_detection_service import AIDetectionService
+from app.services.quiz_statistics_service import QuizStatisticsService, ScoreSnapshot
+from app.utils.cache import TTLCache
+from app.utils.json_response import EncodedJSON
+from app.utils.pagination import (
+    decode_participant_cursor,
+    encode_cursor,
+    encode_timestamp_cursor,
+    keyset_after,
+    split_page,
+)
 
 # Import models and schemas (assuming they're in separate files)
 from app.models.models import (
@@ -22,6 +35,10 @@ from app.models.models import (
 from app.schemas.assesment import (
     AssessmentCreate,
     AssessmentResponse,
+    QuestionAssessmentResponse,
+    RubricComponentResponse,
+    StudentKeyPointResponse,
+    MissingConceptResponse,
     AssessmentSummary,
     StudentPerformanceSummary,
     AssessmentFilter,
@@ -30,10 +47,41 @@ from app.schemas.assesment import (
 
 logger = logging.getLogger(__name__)
 
+# AI detection calls in flight per assessment, and the time budget for each call
+AI_DETECTION_CONCURRENCY = int(os.getenv("AI_DETECTION_CONCURRENCY", "8"))
+AI_DETECTION_TIMEOUT = float(os.getenv("AI_DETECTION_TIMEOUT", "15"))
+
+# Percentiles of the score percentage reported by quiz statistics
+QUIZ_STATISTICS_PERCENTILES = (25, 50, 75, 90)
+# Number of top and bottom performers reported by quiz statistics
+QUIZ_STATISTICS_PERFORMERS = 5
+
+# Top-level assessment columns a summary list may select
+ASSESSMENT_SUMMARY_FIELDS = (
+    "id",
+    "user_id",
+    "quiz_id",
+    "overall_score",
+    "overall_max_score",
+    "assessment_timestamp_utc",
+    "submission_timestamp_utc",
+    "model_used",
+    "prompt_version",
+)
+
+
+# Encoded single-assessment responses kept in-process, keyed by (id, updated_at)
+ASSESSMENT_RESPONSE_CACHE_SIZE = int(os.getenv("ASSESSMENT_RESPONSE_CACHE_SIZE", "1024"))
+ASSESSMENT_RESPONSE_CACHE_TTL = int(os.getenv("ASSESSMENT_RESPONSE_CACHE_TTL", "3600"))
+
 
 class AssessmentService:
     """Service class for handling assessment operations with Tortoise ORM"""
 
+    _response_cache = TTLCache(
+        maxsize=ASSESSMENT_RESPONSE_CACHE_SIZE, ttl=ASSESSMENT_RESPONSE_CACHE_TTL
+    )
+
     @staticmethod
     async def create_assessment_from_json(
         assessment_json: str,
@@ -76,6 +124,17 @@ class AssessmentService:
         """
         Create a complete assessment with all related data
         """
+        # == AI ANALYZER CHECK ==
+        # Run AI detection for every answer concurrently before opening the
+        # transaction, so detector latency does not hold a DB connection
+        answer_texts = [
+            AssessmentService._extract_answer_text(question_data.student_answer_text)
+            for question_data in assessment_data.question_assessments
+        ]
+        plagiarism_scores = await AssessmentService._detect_ai_scores(
+            [detection_text for _, detection_text in answer_texts]
+        )
+
         async with in_transaction() as conn:
             try:
                 # Fetch User and Quiz objects
@@ -124,113 +183,93 @@ class AssessmentService:
                     ),
                     using_db=conn,
                 )
+                await QuizStatisticsService.record_change(
+                    quiz_obj.id, added=ScoreSnapshot.of(assessment), using_db=conn
+                )
 
                 # Create question assessments
-                for question_data in assessment_data.question_assessments:
-                    # == AI ANALYZER CHECK ==
-                    print(
-                        "==question_data.student_answer_text : ",
-                        question_data.student_answer_text,
+                question_assessments = []
+                for (
+                    question_data,
+                    (string_student_answer_text, _),
+                    plagiarism_score_final,
+                ) in zip(
+                    assessment_data.question_assessments,
+                    answer_texts,
+                    plagiarism_scores,
+                ):
+                    question_assessments.append(
+                        QuestionAssessment(
+                            assessment=assessment,
+                            question_id=question_data.question_id,
+                            question_text=question_data.question_text,
+                            student_answer_text=string_student_answer_text,
+                            lecturer_answer_text=question_data.lecturer_answer_text,
+                            rubric=question_data.rubric,
+                            rubric_max_score=question_data.rubric_max_score,
+                            score=question_data.score,
+                            rating_plagiarism=plagiarism_score_final,
+                            max_score_possible=question_data.max_score_possible,
+                            overall_question_feedback=question_data.overall_question_feedback,
+                        )
                     )
-                    print(type(question_data.student_answer_text))
 
-                    temp_student_answer_text = question_data.student_answer_text
-                    string_student_answer_text = question_data.student_answer_text["text"] if isinstance(question_data.student_answer_text, dict) else question_data.student_answer_text
-
-                    # Check if it's a string that needs parsing
-                    if isinstance(temp_student_answer_text, str):
-                        try:
-                            # First try JSON parsing (for properly formatted JSON)
-                            temp_student_answer_text = json.loads(
-                                temp_student_answer_text
-                            )
-                            print("Successfully parsed JSON string")
-                        except json.JSONDecodeError:
-                            try:
-                                # If JSON fails, try using ast.literal_eval for Python dict strings
-                                import ast
-
-                                temp_student_answer_text = ast.literal_eval(
-                                    temp_student_answer_text
-                                )
-                                print("Successfully parsed Python dict string")
-                            except (ValueError, SyntaxError):
-                                # If both fail, wrap the string in a dict with "text" key
-                                temp_student_answer_text = {
-                                    "text": temp_student_answer_text
-                                }
-                                print("Wrapped plain text in JSON dict with 'text' key")
-                    # If it's already a dict, no need to parse
-                    elif isinstance(temp_student_answer_text, dict):
-                        print("Already a dictionary, no parsing needed")
-
-                    plagiarism_score_final = None  # Default value if not set by checks
-
-                    # Now check if we have a dictionary with text content
-                    if isinstance(temp_student_answer_text, dict):
-                        if "text" in temp_student_answer_text:
-                            text = temp_student_answer_text["text"]
-                            plagiarism_score_result = await check_ai_with_sapling(text)
-                            print(f"AI detector result: {plagiarism_score_result}")
-
-                            # Append the AI detector score to the dictionary (rounded to 2 decimal places)
-                            plagiarism_score_final = round(
-                                plagiarism_score_result["score"], 2
-                            )
-
-                            print(f"AI detection score appended: {plagiarism_score_final}")
-                        else:
-                            print("No 'text' key found in dictionary")
-                            plagiarism_score_final = None
-                    else:
-                        print("student_answer_text is not a dictionary")
-                        plagiarism_score_final = None
-
-                    print(f"Final AI detection score: {plagiarism_score_final}")
-                    question_assessment = await QuestionAssessment.create(
-                        assessment=assessment,
-                        question_id=question_data.question_id,
-                        question_text=question_data.question_text,
-                        student_answer_text=string_student_answer_text,
-                        lecturer_answer_text=question_data.lecturer_answer_text,
-                        rubric=question_data.rubric,
-                        rubric_max_score=question_data.rubric_max_score,
-                        score=question_data.score,
-                        rating_plagiarism=plagiarism_score_final,
-                        max_score_possible=question_data.max_score_possible,
-                        overall_question_feedback=question_data.overall_question_feedback,
-                        using_db=conn,
-                    )
+                # Insert question assessments in one batch, then their children one batch per table
+                await AssessmentService._bulk_create_with_ids(
+                    QuestionAssessment,
+                    question_assessments,
+                    QuestionAssessment.filter(assessment_id=assessment.id),
+                    conn,
+                )
 
-                    # Create rubric components
-                    for component_data in question_data.rubric_component_feedback:
-                        await RubricComponentFeedback.create(
+                rubric_components, key_points, missing_concepts = [], [], []
+                for question_assessment, question_data in zip(
+                    question_assessments, assessment_data.question_assessments
+                ):
+                    question_assessment._rubric_components = [
+                        RubricComponentFeedback(
                             question_assessment=question_assessment,
                             component_description=component_data.component_description,
                             component_evaluation=component_data.component_evaluation,
                             component_strengths=component_data.component_strengths,
                             component_areas_for_improvement=component_data.component_areas_for_improvement,
-                            using_db=conn,
                         )
-
-                    # Create key points
-                    for key_point in question_data.key_points_covered_by_student:
-                        await StudentKeyPoint.create(
-                            question_assessment=question_assessment,
-                            key_point=key_point,
-                            using_db=conn,
+                        for component_data in question_data.rubric_component_feedback
+                    ]
+                    question_assessment._key_points = [
+                        StudentKeyPoint(
+                            question_assessment=question_assessment, key_point=key_point
                         )
-
-                    # Create missing concepts
-                    for concept in question_data.missing_concepts_in_student_answer:
-                        await MissingConcept.create(
+                        for key_point in question_data.key_points_covered_by_student
+                    ]
+                    question_assessment._missing_concepts = [
+                        MissingConcept(
                             question_assessment=question_assessment,
                             missing_concept=concept,
-                            using_db=conn,
                         )
+                        for concept in question_data.missing_concepts_in_student_answer
+                    ]
+                    rubric_components += question_assessment._rubric_components
+                    key_points += question_assessment._key_points
+                    missing_concepts += question_assessment._missing_concepts
+
+                question_assessment_ids = [qa.id for qa in question_assessments]
+                for model, rows in (
+                    (RubricComponentFeedback, rubric_components),
+                    (StudentKeyPoint, key_points),
+                    (MissingConcept, missing_concepts),
+                ):
+                    await AssessmentService._bulk_create_with_ids(
+                        model,
+                        rows,
+                        model.filter(question_assessment_id__in=question_assessment_ids),
+                        conn,
+                    )
 
-                # Return the created assessment with all relations
-                return await AssessmentService.get_assessment_by_id(assessment.id)
+                # Build the response from the rows just written instead of re-reading them
+                return AssessmentService._build_assessment_response(
+                    assessment, question_assessments
+                )
 
             except IntegrityError as e:
                 logger.error(f"Integrity error creating assessment: {e}")
@@ -242,6 +281,148 @@ class AssessmentService:
                 logger.error(f"Unexpected error creating assessment: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
 
+    @staticmethod
+    def _extract_answer_text(student_answer_text: Any) -> Tuple[Any, Optional[str]]:
+        """
+        Normalise a student answer coming from the LLM output.
+
+        Returns:
+            tuple: (text stored on the question assessment,
+                    text to run AI detection on or None when there is no "text" key)
+        """
+        string_student_answer_text = (
+            student_answer_text["text"]
+            if isinstance(student_answer_text, dict)
+            else student_answer_text
+        )
+
+        parsed_answer = student_answer_text
+        # Check if it's a string that needs parsing
+        if isinstance(parsed_answer, str):
+            try:
+                # First try JSON parsing (for properly formatted JSON)
+                parsed_answer = json.loads(parsed_answer)
+            except json.JSONDecodeError:
+                try:
+                    # If JSON fails, try using ast.literal_eval for Python dict strings
+                    import ast
+
+                    parsed_answer = ast.literal_eval(parsed_answer)
+                except (ValueError, SyntaxError):
+                    # If both fail, wrap the string in a dict with "text" key
+                    parsed_answer = {"text": parsed_answer}
+
+        if isinstance(parsed_answer, dict) and "text" in parsed_answer:
+            return string_student_answer_text, parsed_answer["text"]
+        return string_student_answer_text, None
+
+    @staticmethod
+    async def _detect_ai_scores(texts: List[Optional[str]]) -> List[Optional[float]]:
+        """
+        Run AI detection for all answers concurrently.
+
+        At most AI_DETECTION_CONCURRENCY calls are in flight and each call gets
+        AI_DETECTION_TIMEOUT seconds; failed or timed-out checks score None.
+        """
+        semaphore = asyncio.Semaphore(AI_DETECTION_CONCURRENCY)
+
+        async def detect(text: Optional[str]) -> Optional[float]:
+            if text is None:
+                return None
+            async with semaphore:
+                try:
+                    result = await asyncio.wait_for(
+                        AIDetectionService.check_sapling(text),
+                        timeout=AI_DETECTION_TIMEOUT,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("AI detection timed out")
+                    return None
+            if not result or result.get("score") is None:
+                return None
+            # AI detector score rounded to 2 decimal places
+            return round(result["score"], 2)
+
+        return await asyncio.gather(*(detect(text) for text in texts))
+
+    @staticmethod
+    async def _bulk_create_with_ids(
+        model, rows: List[Any], inserted_rows_query: QuerySet, conn
+    ) -> None:
+        """
+        bulk_create `rows` and assign their primary keys.
+
+        bulk_create does not populate IntField primary keys, so the ids are read
+        back with one query over the freshly inserted rows (`inserted_rows_query`).
+        Inserts run in order on one connection, so ascending ids match `rows`.
+        """
+        if not rows:
+            return
+        await model.bulk_create(rows, using_db=conn)
+        ids = (
+            await inserted_rows_query.using_db(conn)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        for row, row_id in zip(rows, ids):
+            row.id = row_id
+            row._saved_in_db = True
+
+    @staticmethod
+    def _build_assessment_response(
+        assessment: Assessment, question_assessments: List[QuestionAssessment]
+    ) -> AssessmentResponse:
+        """
+        Build an AssessmentResponse from in-memory rows created by create_assessment
+        """
+        return AssessmentResponse(
+            id=assessment.id,
+            user_id=assessment.user_id,
+            quiz_id=assessment.quiz_id,
+            submission_timestamp_utc=assessment.submission_timestamp_utc,
+            assessment_timestamp_utc=assessment.assessment_timestamp_utc,
+            overall_score=assessment.overall_score,
+            overall_max_score=assessment.overall_max_score,
+            summary_of_performance=assessment.summary_of_performance,
+            general_positive_feedback=assessment.general_positive_feedback,
+            general_areas_for_improvement=assessment.general_areas_for_improvement,
+            overall_scoring_confidence=assessment.overall_scoring_confidence,
+            feedback_generation_confidence=assessment.feedback_generation_confidence,
+            model_used=assessment.model_used,
+            prompt_version=assessment.prompt_version,
+            created_at=assessment.created_at,
+            updated_at=assessment.updated_at,
+            question_assessments=[
+                QuestionAssessmentResponse(
+                    id=qa.id,
+                    question_id=qa.question_id,
+                    question_text=qa.question_text,
+                    student_answer_text=qa.student_answer_text,
+                    lecturer_answer_text=qa.lecturer_answer_text,
+                    rubric=qa.rubric,
+                    rubric_max_score=qa.rubric_max_score,
+                    score=qa.score,
+                    max_score_possible=qa.max_score_possible,
+                    overall_question_feedback=qa.overall_question_feedback,
+                    rating_plagiarism=qa.rating_plagiarism,
+                    created_at=qa.created_at,
+                    rubric_components=[
+                        RubricComponentResponse.model_validate(rc)
+                        for rc in qa._rubric_components
+                    ],
+                    key_points=[
+                        StudentKeyPointResponse.model_validate(kp)
+                        for kp in qa._key_points
+                    ],
+                    missing_concepts=[
+                        MissingConceptResponse.model_validate(mc)
+                        for mc in qa._missing_concepts
+                    ],
+                )
+                for qa in question_assessments
+            ],
+        )
+
     @staticmethod
     async def get_assessment_by_id(id: int) -> Optional[AssessmentResponse]:
         """
@@ -264,47 +445,76 @@ class AssessmentService:
             return None
 
     @staticmethod
-    async def get_assessments_by_filter(
-        filter_params: AssessmentFilter,
-    ) -> List[AssessmentResponse]:
+    async def get_assessment_payload(id: int) -> Optional[EncodedJSON]:
         """
-        Get assessments based on filter parameters
+        Complete assessment by ID, encoded once per version. Every write to an
+        assessment saves it and so moves updated_at, which makes the stamp a
+        version: a cache hit costs one indexed lookup instead of the prefetch
+        of all question feedback plus validation and encoding.
         """
-        try:
-            query = Assessment.all()
+        stamp = await Assessment.filter(id=id).values_list("updated_at", flat=True)
+        if not stamp:
+            logger.warning(f"Assessment with ID {id} not found")
+            return None
+        key = (id, stamp[0])
+        payload = AssessmentService._response_cache.get(key)
+        if payload is None:
+            assessment = await AssessmentService.get_assessment_by_id(id)
+            if assessment is None:
+                return None
+            payload = EncodedJSON.of(assessment)
+            # Cached under the stamp the assessment was actually read with
+            AssessmentService._response_cache.set((id, assessment.updated_at), payload)
+        return payload
 
-            # Apply filters
-            if filter_params.user_id:
-                query = query.filter(user_id=filter_params.user_id)
+    @staticmethod
+    def _filtered_assessments_query(filter_params: AssessmentFilter) -> QuerySet:
+        """One page of assessments matching the filter, newest first"""
+        query = Assessment.all()
 
-            if filter_params.quiz_id:
-                query = query.filter(quiz_id=filter_params.quiz_id)
+        # Apply filters
+        if filter_params.user_id:
+            query = query.filter(user_id=filter_params.user_id)
 
-            if filter_params.min_score is not None:
-                query = query.filter(overall_score__gte=filter_params.min_score)
+        if filter_params.quiz_id:
+            query = query.filter(quiz_id=filter_params.quiz_id)
 
-            if filter_params.max_score is not None:
-                query = query.filter(overall_score__lte=filter_params.max_score)
+        if filter_params.min_score is not None:
+            query = query.filter(overall_score__gte=filter_params.min_score)
 
-            if filter_params.from_date:
-                query = query.filter(
-                    assessment_timestamp_utc__gte=filter_params.from_date
-                )
+        if filter_params.max_score is not None:
+            query = query.filter(overall_score__lte=filter_params.max_score)
 
-            if filter_params.to_date:
-                query = query.filter(
-                    assessment_timestamp_utc__lte=filter_params.to_date
-                )
+        if filter_params.from_date:
+            query = query.filter(assessment_timestamp_utc__gte=filter_params.from_date)
+
+        if filter_params.to_date:
+            query = query.filter(assessment_timestamp_utc__lte=filter_params.to_date)
+
+        # Newest first, with id as tie-breaker so pages are stable
+        query = query.order_by("-assessment_timestamp_utc", "-id")
+        if filter_params.cursor:
+            query = query.filter(keyset_after(filter_params.cursor))
+        else:
+            query = query.offset(filter_params.offset)
 
+        return query.limit(filter_params.limit)
+
+    @staticmethod
+    async def get_assessments_by_filter(
+        filter_params: AssessmentFilter,
+    ) -> List[AssessmentResponse]:
+        """
+        Get assessments based on filter parameters
+        """
+        try:
             # Apply pagination and prefetch relations
-            assessments = (
-                await query.offset(filter_params.offset)
-                .limit(filter_params.limit)
-                .prefetch_related(
-                    "question_assessments__rubric_components",
-                    "question_assessments__key_points",
-                    "question_assessments__missing_concepts",
-                )
+            assessments = await AssessmentService._filtered_assessments_query(
+                filter_params
+            ).prefetch_related(
+                "question_assessments__rubric_components",
+                "question_assessments__key_points",
+                "question_assessments__missing_concepts",
             )
 
             return [
@@ -315,6 +525,40 @@ class AssessmentService:
             logger.error(f"Error filtering assessments: {e}")
             return []
 
+    @staticmethod
+    def resolve_summary_fields(fields: Optional[List[str]] = None) -> List[str]:
+        """
+        Columns to select for a summary list. Raises ValueError for fields that
+        are not summary columns. The cursor key columns are always included.
+        """
+        if not fields:
+            return list(ASSESSMENT_SUMMARY_FIELDS)
+        unknown = [field for field in fields if field not in ASSESSMENT_SUMMARY_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields {unknown}; choose from {list(ASSESSMENT_SUMMARY_FIELDS)}"
+            )
+        selected = ["id", "assessment_timestamp_utc"]
+        return selected + [field for field in fields if field not in selected]
+
+    @staticmethod
+    async def get_assessment_summaries(
+        filter_params: AssessmentFilter,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Summary variant of get_assessments_by_filter: selects only the given
+        top-level columns in a single query, without the nested question data.
+        """
+        fields = AssessmentService.resolve_summary_fields(fields)
+        try:
+            return await AssessmentService._filtered_assessments_query(
+                filter_params
+            ).values(*fields)
+        except Exception as e:
+            logger.error(f"Error filtering assessment summaries: {e}")
+            return []
+
     @staticmethod
     async def get_student_assessments(
         user_id: int, limit: int = 10
@@ -437,9 +681,20 @@ class AssessmentService:
         Update overall score for an assessment
         """
         try:
-            assessment = await Assessment.get(id=id)
-            assessment.overall_score = new_score
-            await assessment.save()
+            async with in_transaction() as conn:
+                # Locked so concurrent writers cannot snapshot the same old score
+                assessment = (
+                    await Assessment.filter(id=id).select_for_update().using_db(conn).get()
+                )
+                previous = ScoreSnapshot.of(assessment)
+                assessment.overall_score = new_score
+                await assessment.save(using_db=conn)
+                await QuizStatisticsService.record_change(
+                    assessment.quiz_id,
+                    added=ScoreSnapshot.of(assessment),
+                    removed=previous,
+                    using_db=conn,
+                )
             return True
 
         except DoesNotExist:
@@ -455,8 +710,15 @@ class AssessmentService:
         Delete assessment and all related data
         """
         try:
-            assessment = await Assessment.get(id=id)
-            await assessment.delete()
+            async with in_transaction() as conn:
+                # Locked so concurrent writers cannot snapshot the same old score
+                assessment = (
+                    await Assessment.filter(id=id).select_for_update().using_db(conn).get()
+                )
+                await assessment.delete(using_db=conn)
+                await QuizStatisticsService.record_change(
+                    assessment.quiz_id, removed=ScoreSnapshot.of(assessment), using_db=conn
+                )
             return True
 
         except DoesNotExist:
@@ -467,55 +729,13 @@ class AssessmentService:
             return False
 
     @staticmethod
-    async def get_assessment_statistics() -> Dict[str, Any]:
+    async def get_assessment_statistics(quiz_id: Optional[int] = None) -> Dict[str, Any]:
         """
-        Get overall assessment statistics
+        Get overall assessment statistics, optionally for one quiz, from the
+        incrementally maintained quiz_statistics rows
         """
         try:
-            from tortoise.functions import Count, Avg, Min, Max
-
-            stats = (
-                await Assessment.all()
-                .annotate(
-                    total_assessments=Count("id"),
-                    average_score=Avg("overall_score"),
-                    min_score=Min("overall_score"),
-                    max_score=Max("overall_score"),
-                    earliest_assessment=Min("assessment_timestamp_utc"),
-                    latest_assessment=Max("assessment_timestamp_utc"),
-                )
-                .values(
-                    "total_assessments",
-                    "average_score",
-                    "min_score",
-                    "max_score",
-                    "earliest_assessment",
-                    "latest_assessment",
-                )
-            )
-
-            if stats:
-                return {
-                    "total_assessments": stats[0]["total_assessments"],
-                    "average_score": (
-                        round(stats[0]["average_score"], 2)
-                        if stats[0]["average_score"]
-                        else 0
-                    ),
-                    "min_score": stats[0]["min_score"] or 0,
-                    "max_score": stats[0]["max_score"] or 0,
-                    "earliest_assessment": stats[0]["earliest_assessment"],
-                    "latest_assessment": stats[0]["latest_assessment"],
-                }
-            else:
-                return {
-                    "total_assessments": 0,
-                    "average_score": 0,
-                    "min_score": 0,
-                    "max_score": 0,
-                    "earliest_assessment": None,
-                    "latest_assessment": None,
-                }
+            return await QuizStatisticsService.get_overview(quiz_id)
 
         except Exception as e:
             logger.error(f"Error getting assessment statistics: {e}")
@@ -562,14 +782,17 @@ class AssessmentService:
                 .limit(limit)
             )
 
+            # Participant status for every student on the page in one query
+            participant_statuses = dict(
+                await QuizParticipant.filter(
+                    quiz_id=quiz_id,
+                    user_id__in={assessment.user_id for assessment in assessments},
+                ).values_list("user_id", "status")
+            )
+
             # Format response with student information
             assessment_results = []
             for assessment in assessments:
-                # Get participant status for this user and quiz
-                participant = await QuizParticipant.get_or_none(
-                    user_id=assessment.user_id, quiz_id=quiz_id
-                )
-
                 assessment_results.append(
                     {
                         "id": assessment.id,
@@ -599,8 +822,8 @@ class AssessmentService:
                         "summary_of_performance": assessment.summary_of_performance,
                         "general_positive_feedback": assessment.general_positive_feedback,
                         "general_areas_for_improvement": assessment.general_areas_for_improvement,
-                        "participant_status": (
-                            participant.status if participant else None
+                        "participant_status": participant_statuses.get(
+                            assessment.user_id
                         ),
                     }
                 )
@@ -628,169 +851,172 @@ class AssessmentService:
             logger.error(f"Error getting quiz assessments: {e}")
             return {"quiz": None, "assessments": [], "error": str(e)}
 
+    @staticmethod
+    def _percentile_sql(alias: str, numerator: int, denominator: int) -> str:
+        """
+        Aggregate over a (value, pos, n) ranking that linearly interpolates the
+        numerator/denominator percentile like PostgreSQL's percentile_cont,
+        using only integer division so it also runs on SQLite.
+        """
+        lower = f"((n - 1) * {numerator}) / {denominator} + 1"
+        fraction = (
+            f"(((n - 1) * {numerator}) - (((n - 1) * {numerator}) / {denominator})"
+            f" * {denominator}) * 1.0 / {denominator}"
+        )
+        lower_value = f"MAX(CASE WHEN pos = {lower} THEN value END)"
+        upper_value = f"MAX(CASE WHEN pos = {lower} + 1 THEN value END)"
+        return (
+            f"{lower_value} + MAX({fraction})"
+            f" * (COALESCE({upper_value}, {lower_value}) - {lower_value}) AS {alias}"
+        )
+
     @staticmethod
     async def get_quiz_statistics(quiz_id: int) -> Dict[str, Any]:
         """
         Get comprehensive statistics for a specific quiz
+
+        Aggregates, grade buckets, percentiles and the top and bottom five are
+        all computed by the database in one round trip.
         """
         try:
-            from tortoise.functions import Count, Avg, Min, Max, Sum
+            connection = get_connection()
+            params = SQLParams(connection)
 
-            # Get basic statistics
-            stats = (
-                await Assessment.filter(quiz_id=quiz_id)
-                .annotate(
-                    total_assessments=Count("id"),
-                    average_score=Avg("overall_score"),
-                    min_score=Min("overall_score"),
-                    max_score=Max("overall_score"),
-                    average_max_score=Avg("overall_max_score"),
-                    earliest_assessment=Min("assessment_timestamp_utc"),
-                    latest_assessment=Max("assessment_timestamp_utc"),
-                )
-                .values(
-                    "total_assessments",
-                    "average_score",
-                    "min_score",
-                    "max_score",
-                    "average_max_score",
-                    "earliest_assessment",
-                    "latest_assessment",
+            percentile_columns = ",\n".join(
+                AssessmentService._percentile_sql(f"p{pct}", pct, 100)
+                for pct in QUIZ_STATISTICS_PERCENTILES
+            )
+            rows = await connection.execute_query_dict(
+                f"""
+                WITH scored AS (
+                    SELECT
+                        a.id, a.user_id, a.overall_score, a.overall_max_score,
+                        a.assessment_timestamp_utc,
+                        CASE WHEN a.overall_max_score > 0
+                            THEN a.overall_score * 100.0 / a.overall_max_score
+                        END AS percentage,
+                        ROW_NUMBER() OVER (ORDER BY a.overall_score DESC, a.id ASC) AS top_rank,
+                        ROW_NUMBER() OVER (ORDER BY a.overall_score ASC, a.id ASC) AS bottom_rank
+                    FROM "assessments" a
+                    WHERE a.quiz_id = {params.add(quiz_id)}
+                ),
+                summary AS (
+                    SELECT
+                        COUNT(*) AS total_assessments,
+                        AVG(overall_score) AS average_score,
+                        MIN(overall_score) AS min_score,
+                        MAX(overall_score) AS max_score,
+                        AVG(overall_max_score) AS average_max_score,
+                        MIN(assessment_timestamp_utc) AS earliest_assessment,
+                        MAX(assessment_timestamp_utc) AS latest_assessment,
+                        SUM(CASE WHEN percentage >= 90 THEN 1 ELSE 0 END) AS grade_a,
+                        SUM(CASE WHEN percentage >= 80 AND percentage < 90 THEN 1 ELSE 0 END) AS grade_b,
+                        SUM(CASE WHEN percentage >= 70 AND percentage < 80 THEN 1 ELSE 0 END) AS grade_c,
+                        SUM(CASE WHEN percentage >= 60 AND percentage < 70 THEN 1 ELSE 0 END) AS grade_d,
+                        SUM(CASE WHEN percentage < 60 THEN 1 ELSE 0 END) AS grade_f
+                    FROM scored
+                ),
+                ranked AS (
+                    SELECT
+                        percentage AS value,
+                        ROW_NUMBER() OVER (ORDER BY percentage) AS pos,
+                        COUNT(*) OVER () AS n
+                    FROM scored
+                    WHERE percentage IS NOT NULL
+                ),
+                percentiles AS (
+                    SELECT
+                        {percentile_columns}
+                    FROM ranked
+                ),
+                score_ranked AS (
+                    SELECT
+                        overall_score AS value,
+                        ROW_NUMBER() OVER (ORDER BY overall_score) AS pos,
+                        COUNT(*) OVER () AS n
+                    FROM scored
+                ),
+                median_score AS (
+                    SELECT {AssessmentService._percentile_sql("median_score", 1, 2)}
+                    FROM score_ranked
                 )
+                SELECT
+                    summary.*, percentiles.*, median_score.*,
+                    performer.top_rank, performer.bottom_rank,
+                    performer.overall_score AS performer_score,
+                    performer.overall_max_score AS performer_max_score,
+                    performer.percentage AS performer_percentage,
+                    u.name AS performer_name
+                FROM summary
+                CROSS JOIN percentiles
+                CROSS JOIN median_score
+                LEFT JOIN scored performer
+                    ON performer.top_rank <= {QUIZ_STATISTICS_PERFORMERS}
+                    OR performer.bottom_rank <= {QUIZ_STATISTICS_PERFORMERS}
+                LEFT JOIN "user" u ON u.id = performer.user_id
+                """,
+                params.values,
             )
+            stats = rows[0]
 
-            # Get score distribution (grade ranges)
-            assessments = await Assessment.filter(quiz_id=quiz_id).values(
-                "overall_score", "overall_max_score"
-            )
+            def performer(row) -> Dict[str, Any]:
+                return {
+                    "student_name": row["performer_name"],
+                    "score": row["performer_score"],
+                    "max_score": row["performer_max_score"],
+                    "percentage": round(float(row["performer_percentage"] or 0), 2),
+                }
 
-            grade_distribution = {
-                "A (90-100%)": 0,
-                "B (80-89%)": 0,
-                "C (70-79%)": 0,
-                "D (60-69%)": 0,
-                "F (0-59%)": 0,
-            }
+            def rounded(value) -> Optional[float]:
+                return round(float(value), 2) if value is not None else None
 
-            for assessment in assessments:
-                if assessment["overall_max_score"] > 0:
-                    percentage = (
-                        assessment["overall_score"] / assessment["overall_max_score"]
-                    ) * 100
-                    if percentage >= 90:
-                        grade_distribution["A (90-100%)"] += 1
-                    elif percentage >= 80:
-                        grade_distribution["B (80-89%)"] += 1
-                    elif percentage >= 70:
-                        grade_distribution["C (70-79%)"] += 1
-                    elif percentage >= 60:
-                        grade_distribution["D (60-69%)"] += 1
-                    else:
-                        grade_distribution["F (0-59%)"] += 1
-
-            # Get top and bottom performers
-            top_performers = (
-                await Assessment.filter(quiz_id=quiz_id)
-                .select_related("user")
-                .order_by("-overall_score")
-                .limit(5)
-            )
-            bottom_performers = (
-                await Assessment.filter(quiz_id=quiz_id)
-                .select_related("user")
-                .order_by("overall_score")
-                .limit(5)
-            )
+            average_score = float(stats["average_score"] or 0)
+            average_max_score = float(stats["average_max_score"] or 0)
+            percentiles = {
+                f"p{pct}": rounded(stats[f"p{pct}"])
+                for pct in QUIZ_STATISTICS_PERCENTILES
+            }
 
-            if stats:
-                result = {
-                    "quiz_id": quiz_id,
-                    "total_assessments": stats[0]["total_assessments"],
-                    "average_score": (
-                        round(stats[0]["average_score"], 2)
-                        if stats[0]["average_score"]
-                        else 0
-                    ),
-                    "average_percentage": (
-                        round(
-                            (
-                                stats[0]["average_score"]
-                                / stats[0]["average_max_score"]
-                                * 100
-                            ),
-                            2,
-                        )
-                        if stats[0]["average_score"] and stats[0]["average_max_score"]
-                        else 0
-                    ),
-                    "min_score": stats[0]["min_score"] or 0,
-                    "max_score": stats[0]["max_score"] or 0,
-                    "earliest_assessment": stats[0]["earliest_assessment"],
-                    "latest_assessment": stats[0]["latest_assessment"],
-                    "grade_distribution": grade_distribution,
-                    "top_performers": [
-                        {
-                            "student_name": (
-                                performer.user.name
-                                if hasattr(performer.user, "name")
-                                else performer.user.username
-                            ),
-                            "score": performer.overall_score,
-                            "max_score": performer.overall_max_score,
-                            "percentage": (
-                                round(
-                                    (
-                                        performer.overall_score
-                                        / performer.overall_max_score
-                                        * 100
-                                    ),
-                                    2,
-                                )
-                                if performer.overall_max_score > 0
-                                else 0
-                            ),
-                        }
-                        for performer in top_performers
-                    ],
-                    "bottom_performers": [
-                        {
-                            "student_name": (
-                                performer.user.name
-                                if hasattr(performer.user, "name")
-                                else performer.user.username
-                            ),
-                            "score": performer.overall_score,
-                            "max_score": performer.overall_max_score,
-                            "percentage": (
-                                round(
-                                    (
-                                        performer.overall_score
-                                        / performer.overall_max_score
-                                        * 100
-                                    ),
-                                    2,
-                                )
-                                if performer.overall_max_score > 0
-                                else 0
-                            ),
-                        }
-                        for performer in bottom_performers
-                    ],
-                }
-            else:
-                result = {
-                    "quiz_id": quiz_id,
-                    "total_assessments": 0,
-                    "average_score": 0,
-                    "average_percentage": 0,
-                    "min_score": 0,
-                    "max_score": 0,
-                    "earliest_assessment": None,
-                    "latest_assessment": None,
-                    "grade_distribution": grade_distribution,
-                    "top_performers": [],
-                    "bottom_performers": [],
-                }
+            result = {
+                "quiz_id": quiz_id,
+                "total_assessments": stats["total_assessments"],
+                "average_score": round(average_score, 2),
+                "average_percentage": (
+                    round(average_score / average_max_score * 100, 2)
+                    if average_score and average_max_score
+                    else 0
+                ),
+                "min_score": stats["min_score"] or 0,
+                "max_score": stats["max_score"] or 0,
+                "median_score": rounded(stats["median_score"]),
+                "median_percentage": percentiles["p50"],
+                "percentiles": percentiles,
+                "earliest_assessment": stats["earliest_assessment"],
+                "latest_assessment": stats["latest_assessment"],
+                "grade_distribution": {
+                    "A (90-100%)": int(stats["grade_a"] or 0),
+                    "B (80-89%)": int(stats["grade_b"] or 0),
+                    "C (70-79%)": int(stats["grade_c"] or 0),
+                    "D (60-69%)": int(stats["grade_d"] or 0),
+                    "F (0-59%)": int(stats["grade_f"] or 0),
+                },
+                "top_performers": [
+                    performer(row)
+                    for row in sorted(
+                        (r for r in rows if r["top_rank"] is not None
+                         and r["top_rank"] <= QUIZ_STATISTICS_PERFORMERS),
+                        key=lambda r: r["top_rank"],
+                    )
+                ],
+                "bottom_performers": [
+                    performer(row)
+                    for row in sorted(
+                        (r for r in rows if r["bottom_rank"] is not None
+                         and r["bottom_rank"] <= QUIZ_STATISTICS_PERFORMERS),
+                        key=lambda r: r["bottom_rank"],
+                    )
+                ],
+            }
 
             return result
 
@@ -798,6 +1024,18 @@ class AssessmentService:
             logger.error(f"Error getting quiz statistics: {e}")
             return {}
 
+    @staticmethod
+    async def get_quiz_statistics_summary(quiz_id: int) -> Dict[str, Any]:
+        """
+        Aggregates and grade distribution for a quiz from its quiz_statistics
+        row, without touching the assessments table
+        """
+        try:
+            return await QuizStatisticsService.get_quiz_summary(quiz_id)
+        except Exception as e:
+            logger.error(f"Error getting quiz statistics summary: {e}")
+            return {}
+
     @staticmethod
     async def get_all_students_assessments(
         quiz_id: int,
@@ -807,10 +1045,14 @@ class AssessmentService:
         status: Optional[str] = None,
         offset: int = 0,
         limit: int = 10,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Get all students' assessments for a specific quiz (TEACHER VIEW)
         Shows scores for all students in one quiz
+
+        Pass the returned next_cursor as cursor to seek to the following page
+        instead of using offset; total is only counted for offset pages.
         """
         try:
             # Get quiz information first
@@ -818,114 +1060,150 @@ class AssessmentService:
             if not quiz:
                 return {"quiz": None, "assessments": [], "error": "Quiz not found"}
 
-            # Get quiz participants to check status
-            participants_query = QuizParticipant.filter(quiz_id=quiz_id).select_related(
-                "user"
-            )
+            # One page of participants LEFT JOIN their assessments, with the
+            # total row count computed by the database in the same query
+            connection = get_connection()
+            params = SQLParams(connection)
+            conditions = [f"p.quiz_id = {params.add(quiz_id)}"]
 
             # Filter by student name if provided
             if student_name:
-                participants_query = participants_query.filter(
-                    user__name__icontains=student_name
+                pattern = (
+                    student_name.replace("\\", "\\\\")
+                    .replace("%", "\\%")
+                    .replace("_", "\\_")
+                )
+                conditions.append(
+                    f"UPPER(u.name) LIKE UPPER({params.add(f'%{pattern}%')}) ESCAPE '\\'"
                 )
 
             # Filter by status if provided
             if status:
-                participants_query = participants_query.filter(status=status)
-
-            participants = await participants_query
-
-            # Get assessments for these participants
-            user_ids = [p.user_id for p in participants]
-            assessment_query = Assessment.filter(
-                quiz_id=quiz_id, user_id__in=user_ids
-            ).select_related("user")
+                conditions.append(f"p.status = {params.add(status)}")
 
-            # Apply score filters
+            # Score filters only match participants that have an assessment.
+            # Cast so asyncpg accepts a float bound against the integer column
             if min_score is not None:
-                assessment_query = assessment_query.filter(overall_score__gte=min_score)
+                conditions.append(
+                    f"a.overall_score >= CAST({params.add(min_score)} AS DOUBLE PRECISION)"
+                )
             if max_score is not None:
-                assessment_query = assessment_query.filter(overall_score__lte=max_score)
+                conditions.append(
+                    f"a.overall_score <= CAST({params.add(max_score)} AS DOUBLE PRECISION)"
+                )
 
-            # Get assessments with pagination
-            assessments = (
-                await assessment_query.order_by("-assessment_timestamp_utc")
-                .offset(offset)
-                .limit(limit)
+            from_clause = """
+                FROM "quizparticipant" p
+                JOIN "user" u ON u.id = p.user_id
+                LEFT JOIN "assessments" a ON a.quiz_id = p.quiz_id AND a.user_id = p.user_id
+            """
+
+            if cursor:
+                # Seek past the last row of the previous page in the sort order
+                # below; unassessed participants (null timestamp) come last
+                timestamp, assessment_id, participant_id = decode_participant_cursor(
+                    cursor
+                )
+                if timestamp is None:
+                    conditions.append(
+                        "(a.assessment_timestamp_utc IS NULL"
+                        f" AND p.id > {params.add(participant_id)})"
+                    )
+                else:
+                    conditions.append(
+                        "(a.assessment_timestamp_utc IS NULL"
+                        f" OR a.assessment_timestamp_utc < {params.add(timestamp)}"
+                        f" OR (a.assessment_timestamp_utc = {params.add(timestamp)}"
+                        f" AND a.id < {params.add(assessment_id)}))"
+                    )
+                total_column = ""
+                page_clause = f"LIMIT {params.add(limit + 1)}"
+            else:
+                total_column = ", COUNT(*) OVER () AS total_count"
+                page_clause = f"LIMIT {params.add(limit + 1)} OFFSET {params.add(offset)}"
+
+            rows = await connection.execute_query_dict(
+                f"""
+                SELECT
+                    p.id AS participant_id, p.user_id, p.status,
+                    u.name AS student_name, u.email AS student_email,
+                    a.id AS assessment_id, a.overall_score, a.overall_max_score,
+                    a.assessment_timestamp_utc, a.submission_timestamp_utc,
+                    a.summary_of_performance, a.general_positive_feedback,
+                    a.general_areas_for_improvement
+                    {total_column}
+                {from_clause}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY a.assessment_timestamp_utc IS NULL,
+                    a.assessment_timestamp_utc DESC, a.id DESC, p.id ASC
+                {page_clause}
+                """,
+                params.values,
             )
+            rows, has_more = split_page(rows, limit)
+
+            if cursor:
+                total = None
+            elif rows:
+                total = rows[0]["total_count"]
+            elif offset > 0:
+                # Past the last page: the window count has no row to ride on
+                count_rows = await connection.execute_query_dict(
+                    f"""
+                    SELECT COUNT(*) AS total_count
+                    {from_clause}
+                    WHERE {" AND ".join(conditions)}
+                    """,
+                    params.values[:-2],
+                )
+                total = count_rows[0]["total_count"]
+            else:
+                total = 0
+
+            next_cursor = None
+            if has_more:
+                last = rows[-1]
+                next_cursor = encode_cursor(
+                    last["assessment_timestamp_utc"],
+                    last["assessment_id"],
+                    last["participant_id"],
+                )
 
-            # Create a mapping of participants for quick lookup
-            participant_map = {p.user_id: p for p in participants}
-
-            # Format response
+            # Format response; participants without an assessment have null scores
             assessment_results = []
-            for assessment in assessments:
-                participant = participant_map.get(assessment.user_id)
-
+            for row in rows:
+                assessed = row["assessment_id"] is not None
+                max_score_possible = row["overall_max_score"] or 0
                 assessment_results.append(
                     {
-                        "assessment_id": assessment.id,
-                        "user_id": assessment.user_id,
-                        "student_name": (
-                            assessment.user.name
-                            if hasattr(assessment.user, "name")
-                            else assessment.user.username
-                        ),
-                        "student_email": getattr(assessment.user, "email", None),
-                        "overall_score": assessment.overall_score,
-                        "overall_max_score": assessment.overall_max_score,
-                        "score_percentage": round(
-                            (
+                        "assessment_id": row["assessment_id"],
+                        "user_id": row["user_id"],
+                        "student_name": row["student_name"],
+                        "student_email": row["student_email"],
+                        "overall_score": row["overall_score"],
+                        "overall_max_score": row["overall_max_score"],
+                        "score_percentage": (
+                            round(
                                 (
-                                    assessment.overall_score
-                                    / assessment.overall_max_score
-                                    * 100
-                                )
-                                if assessment.overall_max_score > 0
-                                else 0
-                            ),
-                            2,
-                        ),
-                        "status": participant.status if participant else "unknown",
-                        "assessment_timestamp_utc": assessment.assessment_timestamp_utc,
-                        "submission_timestamp_utc": assessment.submission_timestamp_utc,
-                        "summary_of_performance": assessment.summary_of_performance,
-                        "general_positive_feedback": assessment.general_positive_feedback,
-                        "general_areas_for_improvement": assessment.general_areas_for_improvement,
-                        "can_be_graded": (
-                            participant.status == "submited" if participant else False
+                                    row["overall_score"] / max_score_possible * 100
+                                    if max_score_possible > 0
+                                    else 0
+                                ),
+                                2,
+                            )
+                            if assessed
+                            else None
                         ),
+                        "status": row["status"],
+                        "assessment_timestamp_utc": row["assessment_timestamp_utc"],
+                        "submission_timestamp_utc": row["submission_timestamp_utc"],
+                        "summary_of_performance": row["summary_of_performance"],
+                        "general_positive_feedback": row["general_positive_feedback"],
+                        "general_areas_for_improvement": row["general_areas_for_improvement"],
+                        "can_be_graded": assessed and row["status"] == "submited",
                     }
                 )
 
-            # Also include participants who haven't submitted yet
-            assessed_user_ids = {a.user_id for a in assessments}
-            print(assessed_user_ids)
-            for participant in participants:
-                if participant.user_id not in assessed_user_ids:
-                    assessment_results.append(
-                        {
-                            "id": None,
-                            "user_id": participant.user_id,
-                            "student_name": (
-                                participant.user.name
-                                if hasattr(participant.user, "name")
-                                else participant.user.username
-                            ),
-                            "student_email": getattr(participant.user, "email", None),
-                            "overall_score": None,
-                            "overall_max_score": None,
-                            "score_percentage": None,
-                            "status": participant.status,
-                            "assessment_timestamp_utc": None,
-                            "submission_timestamp_utc": None,
-                            "summary_of_performance": None,
-                            "general_positive_feedback": None,
-                            "general_areas_for_improvement": None,
-                            "can_be_graded": False,
-                        }
-                    )
-
             # Prepare quiz information
             quiz_info = {
                 "id": quiz.id,
@@ -950,6 +1228,9 @@ class AssessmentService:
                     "offset": offset,
                     "limit": limit,
                     "total_returned": len(assessment_results),
+                    "total": total,
+                    "has_more": has_more,
+                    "next_cursor": next_cursor,
                 },
                 "filters_applied": {
                     "student_name": student_name,
@@ -977,13 +1258,19 @@ class AssessmentService:
         """
         async with in_transaction() as conn:
             try:
-                # Get the assessment with all question assessments
-                assessment = await Assessment.get(id=assessment_id).prefetch_related(
-                    "question_assessments"
+                # Get the assessment with all question assessments, locked so
+                # concurrent regrades cannot snapshot the same old score
+                assessment = (
+                    await Assessment.filter(id=assessment_id)
+                    .select_for_update()
+                    .using_db(conn)
+                    .prefetch_related("question_assessments")
+                    .get()
                 )
 
                 if not assessment:
                     return None
+                previous = ScoreSnapshot.of(assessment)
 
                 # Update individual question scores
                 total_score = 0
@@ -995,7 +1282,7 @@ class AssessmentService:
 
                     # Find and update the specific question assessment
                     question_assessment = await QuestionAssessment.get_or_none(
-                        assessment_id=assessment_id, question_id=question_id
+                        assessment_id=assessment_id, question_id=question_id, using_db=conn
                     )
 
                     if question_assessment:
@@ -1009,10 +1296,16 @@ class AssessmentService:
                 assessment.overall_score = total_score
                 assessment.overall_max_score = total_max_score
                 await assessment.save(using_db=conn)
+                await QuizStatisticsService.record_change(
+                    assessment.quiz_id,
+                    added=ScoreSnapshot.of(assessment),
+                    removed=previous,
+                    using_db=conn,
+                )
 
                 # Update participant status to "graded"
                 participant = await QuizParticipant.get_or_none(
-                    user_id=assessment.user_id, quiz_id=assessment.quiz_id
+                    user_id=assessment.user_id, quiz_id=assessment.quiz_id, using_db=conn
                 )
 
                 if participant:
@@ -1043,10 +1336,12 @@ class AssessmentService:
         status: Optional[str] = None,
         offset: int = 0,
         limit: int = 10,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Get student's own assessments (STUDENT VIEW)
         Student can only see their own assessments when status is "graded"
+        Pass the returned next_cursor as cursor to fetch the following page.
         """
         try:
             # Get participant records for this student
@@ -1077,6 +1372,7 @@ class AssessmentService:
                         "offset": offset,
                         "limit": limit,
                         "total_returned": 0,
+                        "next_cursor": None,
                     },
                     "message": "No graded assessments available yet",
                 }
@@ -1092,10 +1388,24 @@ class AssessmentService:
                 )
             )
 
-            assessments = (
-                await assessment_query.order_by("-assessment_timestamp_utc")
-                .offset(offset)
-                .limit(limit)
+            assessment_query = assessment_query.order_by(
+                "-assessment_timestamp_utc", "-id"
+            )
+            if cursor:
+                assessment_query = assessment_query.filter(keyset_after(cursor))
+            else:
+                assessment_query = assessment_query.offset(offset)
+
+            # One extra row tells whether another page follows
+            assessments, has_more = split_page(
+                await assessment_query.limit(limit + 1), limit
+            )
+            next_cursor = (
+                encode_timestamp_cursor(
+                    assessments[-1].assessment_timestamp_utc, assessments[-1].id
+                )
+                if has_more
+                else None
             )
 
             # Create participant mapping for status lookup
@@ -1163,6 +1473,7 @@ class AssessmentService:
                     "offset": offset,
                     "limit": limit,
                     "total_returned": len(assessment_results),
+                    "next_cursor": next_cursor,
                 },
                 "filters_applied": {
                     "quiz_id": quiz_id,
@@ -0,0 +1,104 @@
+import logging
+import os
+from datetime import timedelta
+from typing import BinaryIO
+from dotenv import load_dotenv
+from tortoise import timezone
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F
+
+from app.models.models import AssistantDocument
+from app.services.assistant_service import delete_document_resources, ingest_document
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Unreferenced documents stay indexed this long so a quick re-upload is still instant
+ASSISTANT_DOCUMENT_RETENTION = int(os.getenv("ASSISTANT_DOCUMENT_RETENTION", "3600"))
+
+
+class AssistantDocumentService:
+    """
+    Content-addressed index of documents already uploaded and indexed in an
+    OpenAI vector store. Sessions hold references; unreferenced documents are
+    evicted after ASSISTANT_DOCUMENT_RETENTION seconds.
+    """
+
+    @staticmethod
+    async def acquire(
+        file: BinaryIO, filename: str, content_hash: str
+    ) -> tuple[AssistantDocument, bool]:
+        """
+        Returns the indexed document with this content hash with one more
+        reference, ingesting the file first if it is not indexed yet. The file
+        is only read when it has to be uploaded.
+
+        Returns:
+            tuple: (AssistantDocument, True if an existing index was reused)
+        """
+        document = await AssistantDocumentService._reference(content_hash)
+        if document:
+            logger.info(f"Reusing indexed document {document.id} for '{filename}'")
+            return document, True
+
+        ingested = await ingest_document(file, filename)
+        try:
+            document = await AssistantDocument.create(
+                content_hash=content_hash,
+                filename=filename,
+                openai_file_id=ingested["openai_file_id"],
+                vector_store_id=ingested["vector_store_id"],
+                file_ids_in_store=ingested["file_ids_in_store"],
+                ref_count=1,
+                last_used_at=timezone.now(),
+            )
+            return document, False
+        except IntegrityError:
+            # Another request indexed the same document concurrently; use theirs
+            await delete_document_resources(
+                ingested["vector_store_id"], ingested["openai_file_id"]
+            )
+            document = await AssistantDocumentService._reference(content_hash)
+            if not document:
+                raise
+            return document, True
+
+    @staticmethod
+    async def release(document_id: int):
+        """Drops one reference; the document is evicted later once unreferenced"""
+        await AssistantDocument.filter(id=document_id, ref_count__gt=0).update(
+            ref_count=F("ref_count") - 1, last_used_at=timezone.now()
+        )
+
+    @staticmethod
+    async def evict_unused() -> int:
+        """Deletes documents unreferenced for longer than the retention period"""
+        stale_before = timezone.now() - timedelta(seconds=ASSISTANT_DOCUMENT_RETENTION)
+        candidates = await AssistantDocument.filter(
+            ref_count__lte=0, last_used_at__lt=stale_before
+        )
+
+        evicted = 0
+        for document in candidates:
+            # Re-check the count in the delete so a concurrent acquire wins
+            deleted = await AssistantDocument.filter(
+                id=document.id, ref_count__lte=0
+            ).delete()
+            if deleted:
+                await delete_document_resources(
+                    document.vector_store_id, document.openai_file_id
+                )
+                evicted += 1
+        if evicted:
+            logger.info(f"Evicted {evicted} unused assistant document(s)")
+        return evicted
+
+    @staticmethod
+    async def _reference(content_hash: str):
+        updated = await AssistantDocument.filter(content_hash=content_hash).update(
+            ref_count=F("ref_count") + 1, last_used_at=timezone.now()
+        )
+        if not updated:
+            return None
+        return await AssistantDocument.get_or_none(content_hash=content_hash)
@@ -1,19 +1,40 @@
+import asyncio
+import os
 import time
 import io  # For BytesIO
 import logging
+from types import SimpleNamespace
+from typing import AsyncIterator, BinaryIO
+from dotenv import load_dotenv
 from openai import APIError  # Import APIError from openai directly
 from app.core.llm.azure_assistant import (
     client as openai_client_func,
+    async_client as async_openai_client,
     assistant_details,
     AZURE_OPENAI_DEPLOYMENT_NAME,
 )
 
+load_dotenv()
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Maximum time an assistant run may take before it is cancelled
+ASSISTANT_RUN_TIMEOUT = float(os.getenv("ASSISTANT_RUN_TIMEOUT", "60"))
+# Run status polling starts fast and backs off exponentially up to the max interval
+ASSISTANT_POLL_INITIAL_INTERVAL = 0.25
+ASSISTANT_POLL_MAX_INTERVAL = 2.0
+
+RUN_PENDING_STATUSES = ("queued", "in_progress", "cancelling")
+
+# Largest document accepted for the chatbot; larger uploads are rejected while streaming
+ASSISTANT_MAX_UPLOAD_BYTES = int(
+    os.getenv("ASSISTANT_MAX_UPLOAD_BYTES", str(20 * 1024 * 1024))
+)
+
 
 def get_openai_client():
     """Get the OpenAI client instance"""
@@ -29,102 +50,124 @@ def get_openai_client():
         return None
 
 
-async def setup_assistant_resources(
-    file_content: bytes, filename: str, assistant_config: dict
-):
+def get_async_openai_client():
+    """Get the async OpenAI client instance"""
+    return async_openai_client
+
+
+ASSISTANT_INSTRUCTIONS = (
+    "You are an expert assistant lecturer. Your primary role is to help lecturers "
+    "discuss and create effective quizzes and assessment materials. "
+    "You should use the content from the provided PDF document(s) to answer questions, "
+    "suggest quiz questions, explain concepts relevant to quiz topics, and help structure quizzes. "
+    "When referring to the document, be specific if possible by citing the source file. Always be helpful, polite, and focus on educational best practices."
+)
+
+
+def api_error_message(e: Exception) -> str:
+    return e.message if hasattr(e, "message") else str(e)
+
+
+async def ingest_document(file: BinaryIO, filename: str) -> dict:
     """
-    Sets up OpenAI resources: uploads file, creates vector store, assistant, and thread.
-    Manages state in the passed assistant_config dictionary.
+    Uploads a document to OpenAI and indexes it in a new vector store.
+    The file handle is streamed to OpenAI from its current position.
+    Everything created is deleted again if indexing fails.
+
+    Returns:
+        dict: {"openai_file_id", "vector_store_id", "file_ids_in_store"}
     """
-    openai_client = get_openai_client()
+    openai_client = get_async_openai_client()
 
     if not openai_client:
         raise Exception("OpenAI client not initialized.")
 
-    # Initialize the openai_file_id_map if it doesn't exist
-    if "openai_file_id_map" not in assistant_config:
-        assistant_config["openai_file_id_map"] = {}
-
+    openai_file = None
+    vector_store = None
     try:
         # 1. Upload file to OpenAI
         logger.info("Uploading file to OpenAI...")
-        # Use BytesIO to treat bytes as a file-like object
-        file_like_object = io.BytesIO(file_content)
-        file_like_object.name = filename  # OpenAI SDK might use the .name attribute
-
-        openai_file = openai_client.files.create(
-            file=file_like_object, purpose="assistants"
+        openai_file = await openai_client.files.create(
+            file=(filename, file), purpose="assistants"
         )
         logger.info(f"File '{filename}' uploaded to OpenAI. File ID: {openai_file.id}")
-        assistant_config["openai_file_id_map"][openai_file.id] = filename
-
-        # 2. Create a Vector Store if it doesn't exist or needs to be fresh
-        # For simplicity, we create a new one each time. In a real app, you might reuse or update.
-        if assistant_config.get("vector_store_id"):
-            try:
-                logger.info(
-                    f"Attempting to delete old vector store: {assistant_config['vector_store_id']}"
-                )
-                openai_client.vector_stores.delete(
-                    vector_store_id=assistant_config["vector_store_id"]
-                )
-                logger.info(
-                    f"Old vector store {assistant_config['vector_store_id']} deleted."
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Could not delete old vector store {assistant_config.get('vector_store_id')}: {e}"
-                )
 
+        # 2. Create a Vector Store
         logger.info("Creating new vector store...")
-        vector_store = openai_client.vector_stores.create(
+        vector_store = await openai_client.vector_stores.create(
             name=f"QuizDocs_{filename.split('.')[0]}_{int(time.time())}",
             # expires_after={"anchor": "last_active_at", "days": 1} # Optional: auto-delete
         )
-        assistant_config["vector_store_id"] = vector_store.id
         logger.info(f"Vector store created. ID: {vector_store.id}")
 
         # 3. Add the file to the Vector Store
         logger.info(
             f"Adding file {openai_file.id} to vector store {vector_store.id}..."
         )
-        file_batch = openai_client.vector_stores.file_batches.create_and_poll(
+        file_batch = await openai_client.vector_stores.file_batches.create_and_poll(
             vector_store_id=vector_store.id, file_ids=[openai_file.id]
         )
         logger.info(f"File batch processing status: {file_batch.status}")
 
-        if file_batch.status == "completed":
-            # Verify files in store
-            vs_files = openai_client.vector_stores.files.list(
-                vector_store_id=vector_store.id
-            )
-            assistant_config["file_ids_in_store"] = [f.id for f in vs_files.data]
-            logger.info(
-                f"Files confirmed in vector store: {assistant_config['file_ids_in_store']}"
-            )
-        else:
-            # Attempt to clean up if file batch failed
-            try:
-                openai_client.vector_stores.delete(vector_store_id=vector_store.id)
-            except:
-                pass
-            try:
-                openai_client.files.delete(file_id=openai_file.id)
-            except:
-                pass
+        if file_batch.status != "completed":
             raise Exception(
                 f"Failed to add file to vector store. Status: {file_batch.status}. Cleaned up resources."
             )
 
-        # 4. Create or Update Assistant
-        assistant_instructions = (
-            "You are an expert assistant lecturer. Your primary role is to help lecturers "
-            "discuss and create effective quizzes and assessment materials. "
-            "You should use the content from the provided PDF document(s) to answer questions, "
-            "suggest quiz questions, explain concepts relevant to quiz topics, and help structure quizzes. "
-            "When referring to the document, be specific if possible by citing the source file. Always be helpful, polite, and focus on educational best practices."
+        # Verify files in store
+        vs_files = await openai_client.vector_stores.files.list(
+            vector_store_id=vector_store.id
         )
+        file_ids_in_store = [f.id for f in vs_files.data]
+        logger.info(f"Files confirmed in vector store: {file_ids_in_store}")
 
+        return {
+            "openai_file_id": openai_file.id,
+            "vector_store_id": vector_store.id,
+            "file_ids_in_store": file_ids_in_store,
+        }
+
+    except Exception as e:
+        # Attempt to clean up resources if an error occurs mid-way
+        await delete_document_resources(
+            vector_store.id if vector_store else None,
+            openai_file.id if openai_file else None,
+        )
+        if isinstance(e, APIError):
+            logger.error(f"Azure OpenAI API Error during setup: {e}")
+            raise Exception(f"Azure OpenAI API Error: {api_error_message(e)}")
+        raise
+
+
+async def delete_document_resources(vector_store_id: str = None, openai_file_id: str = None):
+    """Best-effort deletion of an indexed document's vector store and file"""
+    openai_client = get_async_openai_client()
+    if not openai_client:
+        return
+    if vector_store_id:
+        try:
+            await openai_client.vector_stores.delete(vector_store_id=vector_store_id)
+        except Exception as e:
+            logger.warning(f"Could not delete vector store {vector_store_id}: {e}")
+    if openai_file_id:
+        try:
+            await openai_client.files.delete(file_id=openai_file_id)
+        except Exception as e:
+            logger.warning(f"Could not delete file {openai_file_id}: {e}")
+
+
+async def create_assistant_and_thread(vector_store_id: str, assistant_config: dict):
+    """
+    Creates an assistant searching `vector_store_id` and a new thread, replacing
+    (and deleting) the assistant and thread recorded in assistant_config.
+    """
+    openai_client = get_async_openai_client()
+
+    if not openai_client:
+        raise Exception("OpenAI client not initialized.")
+
+    try:
+        # 4. Create or Update Assistant
         # For simplicity, create a new assistant each time.
         # Alternatively, you could update an existing one if assistant_config["assistant_id"] exists.
         if assistant_config.get("assistant_id"):
@@ -132,7 +175,7 @@ async def setup_assistant_resources(
                 logger.info(
                     f"Attempting to delete old assistant: {assistant_config['assistant_id']}"
                 )
-                openai_client.assistants.delete(
+                await openai_client.beta.assistants.delete(
                     assistant_id=assistant_config["assistant_id"]
                 )
                 logger.info(
@@ -144,12 +187,12 @@ async def setup_assistant_resources(
                 )
 
         logger.info("Creating new assistant...")
-        assistant = openai_client.beta.assistants.create(
+        assistant = await openai_client.beta.assistants.create(
             name="FastAPILecturerQuizHelper",
-            instructions=assistant_instructions,
+            instructions=ASSISTANT_INSTRUCTIONS,
             model=AZURE_OPENAI_DEPLOYMENT_NAME,
             tools=[{"type": "file_search"}],
-            tool_resources={"file_search": {"vector_store_ids": [vector_store.id]}},
+            tool_resources={"file_search": {"vector_store_ids": [vector_store_id]}},
         )
         assistant_config["assistant_id"] = assistant.id
         logger.info(f"Assistant created. ID: {assistant.id}")
@@ -160,7 +203,7 @@ async def setup_assistant_resources(
                 logger.info(
                     f"Attempting to delete old thread: {assistant_config['thread_id']}"
                 )
-                openai_client.threads.delete(
+                await openai_client.beta.threads.delete(
                     thread_id=assistant_config["thread_id"]
                 )
                 logger.info(f"Old thread {assistant_config['thread_id']} deleted.")
@@ -170,51 +213,153 @@ async def setup_assistant_resources(
                 )
 
         logger.info("Creating new thread...")
-        thread = openai_client.beta.threads.create()
+        thread = await openai_client.beta.threads.create()
         assistant_config["thread_id"] = thread.id
         logger.info(f"Thread created. ID: {thread.id}")
 
+    except APIError as e:
+        logger.error(f"Azure OpenAI API Error during setup: {e}")
+        raise Exception(f"Azure OpenAI API Error: {api_error_message(e)}")
+
+
+async def setup_assistant_resources(
+    file_content: bytes, filename: str, assistant_config: dict
+):
+    """
+    Sets up OpenAI resources: uploads file, creates vector store, assistant, and thread.
+    Manages state in the passed assistant_config dictionary; the previous vector
+    store is deleted. Per-user sessions use AssistantSessionService instead.
+    """
+    # Initialize the openai_file_id_map if it doesn't exist
+    if "openai_file_id_map" not in assistant_config:
+        assistant_config["openai_file_id_map"] = {}
+
+    try:
+        if assistant_config.get("vector_store_id"):
+            logger.info(
+                f"Attempting to delete old vector store: {assistant_config['vector_store_id']}"
+            )
+            await delete_document_resources(
+                vector_store_id=assistant_config["vector_store_id"]
+            )
+
+        document = await ingest_document(io.BytesIO(file_content), filename)
+        assistant_config["openai_file_id_map"][document["openai_file_id"]] = filename
+        assistant_config["vector_store_id"] = document["vector_store_id"]
+        assistant_config["file_ids_in_store"] = document["file_ids_in_store"]
+
+        await create_assistant_and_thread(document["vector_store_id"], assistant_config)
+
         return {
             "message": "Assistant, vector store, and thread configured successfully with the new PDF.",
-            "assistant_id": assistant.id,
-            "thread_id": thread.id,
-            "vector_store_id": vector_store.id,
-            "openai_file_id": openai_file.id,
+            "assistant_id": assistant_config["assistant_id"],
+            "thread_id": assistant_config["thread_id"],
+            "vector_store_id": document["vector_store_id"],
+            "openai_file_id": document["openai_file_id"],
             "original_filename": filename,
             "files_in_vector_store": assistant_config["file_ids_in_store"],
         }
 
-    except APIError as e:
-        logger.error(f"Azure OpenAI API Error during setup: {e}")
-        # Attempt to clean up resources if an error occurs mid-way
-        if assistant_config.get("vector_store_id"):
-            try:
-                openai_client.vector_stores.delete(
-                    vector_store_id=assistant_config["vector_store_id"]
-                )
-            except:
-                pass
-        if (
-            "openai_file" in locals() and openai_file
-        ):  # Check if openai_file was defined
-            try:
-                openai_client.files.delete(file_id=openai_file.id)
-            except:
-                pass
-        raise Exception(
-            f"Azure OpenAI API Error: {e.message if hasattr(e, 'message') else str(e)}"
-        )
     except Exception as e:
         logger.error(f"An unexpected error occurred during setup: {e}")
         raise Exception(f"An unexpected error occurred: {str(e)}")
 
 
-async def process_chat_message(user_message: str, thread_id: str, assistant_id: str):
+def replace_file_citations(text: str, annotations, file_id_map: dict) -> str:
+    """Replaces file citation markers in `text` with "[Source: <filename>]" """
+    for annotation in annotations or []:
+        if annotation.type == "file_citation" and annotation.text:
+            cited_file_id = annotation.file_citation.file_id
+            original_filename = file_id_map.get(cited_file_id, cited_file_id)
+            text = text.replace(annotation.text, f"[Source: {original_filename}]")
+    return text
+
+
+def extract_assistant_reply(messages, run_id: str, file_id_map: dict = None):
+    """
+    Returns the text of the assistant message produced by `run_id`, with file
+    citations replaced by "[Source: <filename>]", or None if there is none.
+    `file_id_map` maps OpenAI file IDs to filenames (defaults to assistant_details).
+    """
+    if file_id_map is None:
+        file_id_map = assistant_details.get("openai_file_id_map", {})
+    for msg in messages.data:
+        if msg.run_id == run_id and msg.role == "assistant":
+            if msg.content and len(msg.content) > 0:
+                text_content_item = msg.content[0]
+                if text_content_item.type == "text":
+                    # Handle annotations (file citations)
+                    return replace_file_citations(
+                        text_content_item.text.value,
+                        text_content_item.text.annotations,
+                        file_id_map,
+                    )
+    return None
+
+
+async def wait_for_run(openai_client, thread_id: str, run, timeout: float = ASSISTANT_RUN_TIMEOUT):
+    """
+    Polls a run until it leaves the queued/in_progress states, sleeping with
+    exponential backoff between retrievals.
+
+    The run is cancelled on the OpenAI side if it exceeds `timeout` seconds or
+    if the awaiting task is cancelled (e.g. the HTTP client disconnected).
+    """
+
+    async def poll(run):
+        interval = ASSISTANT_POLL_INITIAL_INTERVAL
+        while run.status in RUN_PENDING_STATUSES:
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, ASSISTANT_POLL_MAX_INTERVAL)
+            run = await openai_client.beta.threads.runs.retrieve(
+                thread_id=thread_id, run_id=run.id
+            )
+            logger.debug(f"Run status: {run.status}")
+        return run
+
+    try:
+        return await asyncio.wait_for(poll(run), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.error(f"Run timed out after {timeout} seconds")
+        await cancel_run(openai_client, thread_id, run.id)
+        raise Exception(f"Assistant run timed out after {timeout} seconds")
+    except asyncio.CancelledError:
+        # Do not leave the run consuming tokens for a caller that went away
+        asyncio.ensure_future(cancel_run(openai_client, thread_id, run.id))
+        raise
+
+
+async def cancel_run(openai_client, thread_id: str, run_id: str):
+    try:
+        await openai_client.beta.threads.runs.cancel(thread_id=thread_id, run_id=run_id)
+    except Exception as e:
+        logger.warning(f"Could not cancel run {run_id}: {e}")
+
+
+RUN_FAILED_EVENTS = (
+    "thread.run.failed",
+    "thread.run.cancelled",
+    "thread.run.expired",
+    "thread.run.incomplete",
+)
+
+
+def run_error_message(run) -> str:
+    if run.last_error:
+        return f"Run failed: {run.last_error.message} (Code: {run.last_error.code})"
+    if getattr(run, "incomplete_details", None):
+        return f"Run incomplete: {run.incomplete_details.reason}"
+    return f"Assistant run did not complete successfully. Status: {run.status}"
+
+
+async def process_chat_message(
+    user_message: str, thread_id: str, assistant_id: str, file_id_map: dict = None
+):
     """
     Adds a message to a thread, runs the assistant, and retrieves the reply.
-    Uses manual polling approach as shown in your example.
+    Waits for the run with non-blocking exponential backoff polling.
     """
-    openai_client = get_openai_client()
+    openai_client = get_async_openai_client()
 
     if not openai_client:
         raise Exception("OpenAI client not initialized.")
@@ -222,68 +367,31 @@ async def process_chat_message(user_message: str, thread_id: str, assistant_id:
     try:
         # 1. Add message to the thread
         logger.info(f"Adding message to thread {thread_id}: '{user_message}'")
-        message = openai_client.beta.threads.messages.create(
+        message = await openai_client.beta.threads.messages.create(
             thread_id=thread_id, role="user", content=user_message
         )
 
         # 2. Create a Run (not create_and_poll)
         logger.info(f"Creating run for assistant {assistant_id} on thread {thread_id}")
-        run = openai_client.beta.threads.runs.create(
+        run = await openai_client.beta.threads.runs.create(
             thread_id=thread_id, assistant_id=assistant_id
         )
         logger.info(f"Run created. ID: {run.id}, Status: {run.status}")
 
-        # 3. Manual polling until the run completes or fails
-        max_wait_time = 60  # Maximum wait time in seconds
-        start_time = time.time()
-
-        while run.status in ["queued", "in_progress", "cancelling"]:
-            # Check if we've exceeded maximum wait time
-            if time.time() - start_time > max_wait_time:
-                logger.error(f"Run timed out after {max_wait_time} seconds")
-                raise Exception(
-                    f"Assistant run timed out after {max_wait_time} seconds"
-                )
-
-            time.sleep(1)  # Wait 1 second before checking again
-            run = openai_client.beta.threads.runs.retrieve(
-                thread_id=thread_id, run_id=run.id
-            )
-            logger.debug(f"Run status: {run.status}")
+        # 3. Wait until the run completes or fails
+        run = await wait_for_run(openai_client, thread_id, run)
 
         # 4. Handle the completed run
         if run.status == "completed":
             # Get the messages from the thread
-            messages = openai_client.beta.threads.messages.list(
+            messages = await openai_client.beta.threads.messages.list(
                 thread_id=thread_id, order="desc"  # Get newest messages first
             )
 
             # Find the assistant's response
-            assistant_reply_content = None
-            for msg in messages.data:
-                if msg.run_id == run.id and msg.role == "assistant":
-                    if msg.content and len(msg.content) > 0:
-                        text_content_item = msg.content[0]
-                        if text_content_item.type == "text":
-                            assistant_reply_content = text_content_item.text.value
-
-                            # Handle annotations (file citations)
-                            annotations = text_content_item.text.annotations
-                            if annotations:
-                                for annotation in annotations:
-                                    if annotation.type == "file_citation":
-                                        cited_file_id = annotation.file_citation.file_id
-                                        # Use the map from assistant_config if available
-                                        original_filename = assistant_details.get(
-                                            "openai_file_id_map", {}
-                                        ).get(cited_file_id, cited_file_id)
-                                        citation_text = f"[Source: {original_filename}]"
-                                        assistant_reply_content = (
-                                            assistant_reply_content.replace(
-                                                annotation.text, citation_text
-                                            )
-                                        )
-                            break
+            assistant_reply_content = extract_assistant_reply(
+                messages, run.id, file_id_map
+            )
 
             if assistant_reply_content:
                 logger.info(f"Assistant reply received successfully")
@@ -302,14 +410,7 @@ async def process_chat_message(user_message: str, thread_id: str, assistant_id:
 
         else:
             # Handle failed, cancelled, expired, etc.
-            error_message = (
-                f"Assistant run did not complete successfully. Status: {run.status}"
-            )
-            if run.last_error:
-                error_message = f"Run failed: {run.last_error.message} (Code: {run.last_error.code})"
-            elif hasattr(run, "incomplete_details") and run.incomplete_details:
-                error_message = f"Run incomplete: {run.incomplete_details.reason}"
-
+            error_message = run_error_message(run)
             logger.error(error_message)
             raise Exception(error_message)
 
@@ -326,6 +427,99 @@ async def process_chat_message(user_message: str, thread_id: str, assistant_id:
         raise Exception(f"An unexpected error occurred: {str(e)}")
 
 
+async def stream_chat_message(
+    user_message: str,
+    thread_id: str,
+    assistant_id: str,
+    file_id_map: dict = None,
+    timeout: float = ASSISTANT_RUN_TIMEOUT,
+) -> AsyncIterator[dict]:
+    """
+    Streaming variant of `process_chat_message` using the runs streaming API.
+
+    Yields "delta" events ({"text"}) as the assistant produces text, then one
+    "done" event with the full {"assistant_reply"}. Failures are raised. The
+    run is cancelled if it exceeds `timeout` seconds or the consumer goes away.
+    """
+    openai_client = get_async_openai_client()
+
+    if not openai_client:
+        raise Exception("OpenAI client not initialized.")
+    file_id_map = file_id_map or {}
+
+    try:
+        logger.info(f"Adding message to thread {thread_id}: '{user_message}'")
+        await openai_client.beta.threads.messages.create(
+            thread_id=thread_id, role="user", content=user_message
+        )
+
+        logger.info(f"Streaming run for assistant {assistant_id} on thread {thread_id}")
+        stream = await openai_client.beta.threads.runs.create(
+            thread_id=thread_id, assistant_id=assistant_id, stream=True
+        )
+    except APIError as e:
+        logger.error(f"Azure OpenAI API Error during chat: {e}")
+        raise Exception(f"Azure OpenAI API Error: {api_error_message(e)}")
+
+    deadline = asyncio.get_running_loop().time() + timeout
+    events = stream.__aiter__()
+    run_id = None
+    reply_parts = []
+    final_reply = None
+    finished = False
+    try:
+        while True:
+            remaining = deadline - asyncio.get_running_loop().time()
+            try:
+                event = await asyncio.wait_for(events.__anext__(), timeout=remaining)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                logger.error(f"Run timed out after {timeout} seconds")
+                raise Exception(f"Assistant run timed out after {timeout} seconds")
+
+            if event.event == "thread.run.created":
+                run_id = event.data.id
+                logger.info(f"Run created. ID: {run_id}")
+            elif event.event == "thread.message.delta":
+                for block in event.data.delta.content or []:
+                    if block.type == "text" and block.text and block.text.value:
+                        text = replace_file_citations(
+                            block.text.value, block.text.annotations, file_id_map
+                        )
+                        reply_parts.append(text)
+                        yield {"event": "delta", "data": {"text": text}}
+            elif event.event == "thread.message.completed":
+                final_reply = extract_assistant_reply(
+                    SimpleNamespace(data=[event.data]), event.data.run_id, file_id_map
+                )
+            elif event.event == "thread.run.completed":
+                finished = True
+            elif event.event == "thread.run.requires_action":
+                raise Exception(
+                    "Run requires further action (e.g. tool calls), which is not fully implemented for automatic handling in this example."
+                )
+            elif event.event in RUN_FAILED_EVENTS:
+                finished = True
+                raise Exception(run_error_message(event.data))
+            elif event.event == "error":
+                raise Exception(f"Azure OpenAI API Error: {event.data.message}")
+    except APIError as e:
+        logger.error(f"Azure OpenAI API Error during chat: {e}")
+        raise Exception(f"Azure OpenAI API Error: {api_error_message(e)}")
+    finally:
+        if run_id and not finished:
+            # Do not leave the run consuming tokens after a timeout, error or disconnect
+            asyncio.ensure_future(cancel_run(openai_client, thread_id, run_id))
+        await stream.close()
+
+    reply = final_reply or "".join(reply_parts)
+    if not reply:
+        reply = "Assistant processed the request but provided no textual reply."
+    logger.info("Assistant reply streamed successfully")
+    yield {"event": "done", "data": {"assistant_reply": reply}}
+
+
 def process_chat_message_sync(user_message: str, thread_id: str, assistant_id: str):
     """
     Synchronous version of process_chat_message for use with Streamlit.
@@ -369,30 +563,7 @@ def process_chat_message_sync(user_message: str, thread_id: str, assistant_id: s
                 thread_id=thread_id, order="desc"
             )
 
-            assistant_reply_content = None
-            for msg in messages.data:
-                if msg.run_id == run.id and msg.role == "assistant":
-                    if msg.content and len(msg.content) > 0:
-                        text_content_item = msg.content[0]
-                        if text_content_item.type == "text":
-                            assistant_reply_content = text_content_item.text.value
-
-                            # Handle annotations
-                            annotations = text_content_item.text.annotations
-                            if annotations:
-                                for annotation in annotations:
-                                    if annotation.type == "file_citation":
-                                        cited_file_id = annotation.file_citation.file_id
-                                        original_filename = assistant_details.get(
-                                            "openai_file_id_map", {}
-                                        ).get(cited_file_id, cited_file_id)
-                                        citation_text = f"[Source: {original_filename}]"
-                                        assistant_reply_content = (
-                                            assistant_reply_content.replace(
-                                                annotation.text, citation_text
-                                            )
-                                        )
-                            break
+            assistant_reply_content = extract_assistant_reply(messages, run.id)
 
             if assistant_reply_content:
                 return {"assistant_reply": assistant_reply_content}
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+from datetime import timedelta
+from typing import BinaryIO, Optional
+from dotenv import load_dotenv
+from tortoise import timezone
+
+from app.models.models import AssistantSession
+from app.services.assistant_document_service import AssistantDocumentService
+from app.services.assistant_service import (
+    create_assistant_and_thread,
+    delete_document_resources,
+    get_async_openai_client,
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Sessions idle for longer than this are evicted together with their OpenAI resources
+ASSISTANT_SESSION_TTL = int(os.getenv("ASSISTANT_SESSION_TTL", str(24 * 3600)))
+# Least recently used sessions beyond this count are evicted
+ASSISTANT_SESSION_MAX = int(os.getenv("ASSISTANT_SESSION_MAX", "100"))
+
+
+class AssistantSessionService:
+    """
+    Per-user chatbot sessions persisted in the assistant_sessions table, so any
+    app worker can serve a user's chat and sessions survive restarts.
+    """
+
+    @staticmethod
+    async def get_session(user_id: int) -> Optional[AssistantSession]:
+        """Returns the user's live session and marks it as recently used"""
+        session = await AssistantSession.get_or_none(
+            user_id=user_id,
+            last_used_at__gt=timezone.now() - timedelta(seconds=ASSISTANT_SESSION_TTL),
+        )
+        if session:
+            session.last_used_at = timezone.now()
+            await session.save(update_fields=["last_used_at"])
+        return session
+
+    @staticmethod
+    async def setup_session(
+        user_id: int, file: BinaryIO, filename: str, content_hash: str
+    ) -> dict:
+        """
+        Creates (or replaces) the user's assistant and thread for a document.
+        The document's vector store is shared with every session that uploaded
+        the same bytes (same sha256 content_hash), so re-uploads skip the upload
+        and indexing entirely.
+        """
+        session = await AssistantSession.get_or_none(user_id=user_id)
+        assistant_config = {
+            "assistant_id": session.assistant_id if session else None,
+            "thread_id": session.thread_id if session else None,
+        }
+
+        # Take the new reference before releasing the old one, so re-uploading
+        # the current document never drops it to zero references
+        document, reused = await AssistantDocumentService.acquire(
+            file, filename, content_hash
+        )
+        try:
+            await create_assistant_and_thread(
+                document.vector_store_id, assistant_config
+            )
+        except Exception:
+            await AssistantDocumentService.release(document.id)
+            raise
+
+        if session:
+            await AssistantSessionService._release_document(session)
+
+        fields_to_save = {
+            "assistant_id": assistant_config["assistant_id"],
+            "thread_id": assistant_config["thread_id"],
+            "vector_store_id": document.vector_store_id,
+            "document_id": document.id,
+            "file_ids_in_store": document.file_ids_in_store,
+            "openai_file_id_map": {document.openai_file_id: filename},
+            "last_used_at": timezone.now(),
+        }
+        if session:
+            await session.update_from_dict(fields_to_save).save()
+        else:
+            await AssistantSession.create(user_id=user_id, **fields_to_save)
+
+        await AssistantSessionService.evict_sessions()
+        return {
+            "message": "Assistant, vector store, and thread configured successfully with the new PDF.",
+            "assistant_id": assistant_config["assistant_id"],
+            "thread_id": assistant_config["thread_id"],
+            "vector_store_id": document.vector_store_id,
+            "openai_file_id": document.openai_file_id,
+            "original_filename": filename,
+            "files_in_vector_store": document.file_ids_in_store,
+            "reused_document": reused,
+        }
+
+    @staticmethod
+    async def end_session(user_id: int) -> bool:
+        session = await AssistantSession.get_or_none(user_id=user_id)
+        if not session:
+            return False
+        return await AssistantSessionService._evict(session)
+
+    @staticmethod
+    async def evict_sessions() -> int:
+        """Evicts sessions idle past the TTL and the least recently used beyond the cap"""
+        expired = await AssistantSession.filter(
+            last_used_at__lte=timezone.now() - timedelta(seconds=ASSISTANT_SESSION_TTL)
+        )
+        over_capacity = (
+            await AssistantSession.all()
+            .order_by("-last_used_at", "-id")
+            .offset(ASSISTANT_SESSION_MAX)
+        )
+        sessions = {session.id: session for session in expired + over_capacity}
+
+        evicted = 0
+        for session in sessions.values():
+            if await AssistantSessionService._evict(session):
+                evicted += 1
+        if evicted:
+            logger.info(f"Evicted {evicted} assistant session(s)")
+
+        await AssistantDocumentService.evict_unused()
+        return evicted
+
+    @staticmethod
+    async def _evict(session: AssistantSession) -> bool:
+        # Only the worker whose delete matches cleans up, and not if the session was just used
+        deleted = await AssistantSession.filter(
+            id=session.id, last_used_at=session.last_used_at
+        ).delete()
+        if not deleted:
+            return False
+        await AssistantSessionService.delete_remote_resources(session)
+        return True
+
+    @staticmethod
+    async def delete_remote_resources(session: AssistantSession):
+        """Deletes the session's assistant and thread and releases its document"""
+        openai_client = get_async_openai_client()
+        if openai_client:
+            deletions = []
+            if session.assistant_id:
+                deletions.append(
+                    openai_client.beta.assistants.delete(
+                        assistant_id=session.assistant_id
+                    )
+                )
+            if session.thread_id:
+                deletions.append(
+                    openai_client.beta.threads.delete(thread_id=session.thread_id)
+                )
+            for result in await asyncio.gather(*deletions, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.warning(f"Could not delete assistant resource: {result}")
+
+        await AssistantSessionService._release_document(session)
+
+    @staticmethod
+    async def _release_document(session: AssistantSession):
+        if session.document_id:
+            await AssistantDocumentService.release(session.document_id)
+        elif session.vector_store_id:
+            # Session created before documents were shared: its store is private
+            await delete_document_resources(vector_store_id=session.vector_store_id)
+            for openai_file_id in session.openai_file_id_map:
+                await delete_document_resources(openai_file_id=openai_file_id)
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app.core.llm.errors import is_llm_error
+from app.core.llm.llm_factory import get_llm_api_call_function, normalize_llm_output
+from app.core.llm.response_cache import LLMResponseCache
+from app.models.models import PromptExperimentResult
+
+logger = logging.getLogger(__name__)
+
+
+class ExperimentService:
+    """Runs several prompt variants for one submission side by side"""
+
+    @staticmethod
+    async def run_variants(
+        quiz_id: int,
+        user_id: int,
+        model_name: str,
+        variants: Dict[str, str],
+        use_cache: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sends every prompt variant to the LLM concurrently and stores each
+        variant's output, input tokens and latency in prompt_experiment_results.
+
+        Args:
+            variants: variant name -> prompt text; the name doubles as the
+                prompt_version of the LLM response cache key
+
+        Returns:
+            dict: {"experiment_id": str, "variants": {name: {"analysis", "input_tokens",
+                   "latency_ms", "error"}}}
+        """
+        llm_call_function = get_llm_api_call_function(model_name)
+        experiment_id = uuid.uuid4()
+
+        async def run_one(variant: str, prompt: str) -> PromptExperimentResult:
+            started = time.perf_counter()
+            output, input_tokens, error = None, None, None
+            try:
+                response = await llm_call_function(
+                    prompt, prompt_version=variant, use_cache=use_cache
+                )
+                if is_llm_error(response):
+                    # Provider failures come back as messages, not exceptions
+                    error, _ = normalize_llm_output(response)
+                    error = str(error or "No response from the model")
+                    logger.error(f"Prompt variant {variant} failed: {error}")
+                else:
+                    output, input_tokens = normalize_llm_output(response)
+            except Exception as e:
+                logger.error(f"Prompt variant {variant} failed: {e}")
+                error = str(e)
+
+            return PromptExperimentResult(
+                experiment_id=experiment_id,
+                quiz_id=quiz_id,
+                user_id=user_id,
+                variant=variant,
+                provider=llm_call_function.name,
+                model=llm_call_function.model,
+                prompt_hash=LLMResponseCache.prompt_hash(prompt),
+                output=output,
+                input_tokens=input_tokens,
+                latency_ms=int((time.perf_counter() - started) * 1000),
+                error=error,
+            )
+
+        results: List[PromptExperimentResult] = await asyncio.gather(
+            *(run_one(variant, prompt) for variant, prompt in variants.items())
+        )
+        await PromptExperimentResult.bulk_create(results)
+
+        return {
+            "experiment_id": str(experiment_id),
+            "variants": {
+                result.variant: {
+                    "analysis": result.output,
+                    "input_tokens": result.input_tokens,
+                    "latency_ms": result.latency_ms,
+                    "error": result.error,
+                }
+                for result in results
+            },
+        }
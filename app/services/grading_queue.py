@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+from datetime import timedelta
+from typing import List, Optional
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from tortoise import timezone
+from tortoise.expressions import F
+
+from app.models.models import GradingJob, Quiz
+from app.services.grading_service import GradingService
+from app.utils.util import GradingJobStatus
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Number of grading jobs processed concurrently by this process (0 disables the workers)
+GRADING_WORKER_CONCURRENCY = int(os.getenv("GRADING_WORKER_CONCURRENCY", "4"))
+# Idle workers re-check the table this often, so jobs enqueued by other processes are picked up
+GRADING_POLL_INTERVAL = float(os.getenv("GRADING_POLL_INTERVAL", "5"))
+GRADING_JOB_MAX_ATTEMPTS = int(os.getenv("GRADING_JOB_MAX_ATTEMPTS", "3"))
+# Running jobs older than this are assumed orphaned by a crashed worker and re-queued on startup
+GRADING_JOB_STALE_AFTER = int(os.getenv("GRADING_JOB_STALE_AFTER", "900"))
+
+
+class GradingQueue:
+    """
+    Persistent grading job queue backed by the grading_jobs table.
+
+    Jobs are claimed with a conditional UPDATE (status queued -> running), so
+    several uvicorn workers can drain the same table without double-grading.
+    """
+
+    def __init__(self, concurrency: int = GRADING_WORKER_CONCURRENCY):
+        self.concurrency = concurrency
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+
+    async def enqueue(
+        self, quiz_id: int, user_id: int, model_name: str = "azure"
+    ) -> GradingJob:
+        """Stores a new queued job and wakes an idle worker"""
+        job = await GradingJob.create(
+            quiz_id=quiz_id, user_id=user_id, model_name=model_name
+        )
+        self._wakeup.set()
+        return job
+
+    async def start(self):
+        """Re-queues orphaned jobs and spawns the worker tasks"""
+        if self.concurrency <= 0 or self._workers:
+            return
+
+        stale_before = timezone.now() - timedelta(seconds=GRADING_JOB_STALE_AFTER)
+        requeued = await GradingJob.filter(
+            status=GradingJobStatus.RUNNING, started_at__lt=stale_before
+        ).update(status=GradingJobStatus.QUEUED)
+        if requeued:
+            logger.warning(f"Re-queued {requeued} stale grading job(s)")
+
+        self._workers = [
+            asyncio.create_task(self._worker(n)) for n in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} grading worker(s)")
+
+    async def stop(self):
+        """Cancels the worker tasks. Jobs in flight are re-queued on next startup."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _claim_next(self) -> Optional[GradingJob]:
+        candidate_ids = (
+            await GradingJob.filter(status=GradingJobStatus.QUEUED)
+            .order_by("created_at", "id")
+            .limit(self.concurrency)
+            .values_list("id", flat=True)
+        )
+        for job_id in candidate_ids:
+            claimed = await GradingJob.filter(
+                id=job_id, status=GradingJobStatus.QUEUED
+            ).update(
+                status=GradingJobStatus.RUNNING,
+                started_at=timezone.now(),
+                attempts=F("attempts") + 1,
+            )
+            if claimed:
+                return await GradingJob.get(id=job_id)
+        return None
+
+    async def _worker(self, worker_number: int):
+        while True:
+            try:
+                # Clear before claiming so an enqueue during the claim is not missed
+                self._wakeup.clear()
+                job = await self._claim_next()
+                if job is None:
+                    try:
+                        await asyncio.wait_for(
+                            self._wakeup.wait(), timeout=GRADING_POLL_INTERVAL
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Grading worker {worker_number} error: {e}")
+                await asyncio.sleep(GRADING_POLL_INTERVAL)
+
+    async def _run(self, job: GradingJob):
+        logger.info(f"Running grading job {job.id} (attempt {job.attempts})")
+        try:
+            quiz = await Quiz.get_or_none(id=job.quiz_id)
+            if not quiz:
+                raise HTTPException(status_code=404, detail="Quiz not found")
+
+            result = await GradingService.grade_submission(
+                quiz, job.user_id, job.model_name
+            )
+
+            job.status = GradingJobStatus.COMPLETED
+            job.assessment_id = result["assessment"].id
+            job.error = None
+
+        except Exception as e:
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            # Client errors (missing quiz, no answers, ...) will not succeed on retry
+            retryable = not (
+                isinstance(e, HTTPException) and 400 <= e.status_code < 500
+            )
+            if retryable and job.attempts < GRADING_JOB_MAX_ATTEMPTS:
+                logger.warning(f"Grading job {job.id} failed, will retry: {error}")
+                job.status = GradingJobStatus.QUEUED
+            else:
+                logger.error(f"Grading job {job.id} failed: {error}")
+                job.status = GradingJobStatus.FAILED
+            job.error = error
+
+        if job.status != GradingJobStatus.QUEUED:
+            job.finished_at = timezone.now()
+        await job.save(
+            update_fields=["status", "assessment_id", "error", "finished_at"]
+        )
+        if job.status == GradingJobStatus.QUEUED:
+            self._wakeup.set()
+
+
+grading_queue = GradingQueue()
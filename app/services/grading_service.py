@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Optional
+from dotenv import load_dotenv
+from fastapi import HTTPException
+
+from app.core.llm.llm_factory import get_llm_api_call_function, normalize_llm_output
+from app.models.models import Assessment, Quiz, Question, QuestionResponse, QuizParticipant
+from app.prompts.prompt_generator import construct_overall_assignment_analysis_prompt_v3
+from app.schemas.question_response import QuestionResponseToAI
+from app.services.assesment_service import AssessmentService
+from app.utils.json_stream import JSONArrayItemStream
+from app.utils.util import StatusType
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Default number of students graded in parallel by a bulk grading request
+BULK_GRADING_CONCURRENCY = int(os.getenv("BULK_GRADING_CONCURRENCY", "8"))
+# Part of the LLM response cache key; bump when the analysis prompt template changes
+ANALYSIS_PROMPT_VERSION = "overall_v3"
+
+
+class GradingService:
+    """Builds analysis prompts for a student's submission and turns the LLM output into an assessment"""
+
+    @staticmethod
+    def build_questions_and_answers(
+        questions: List[Question], responses: List[QuestionResponse]
+    ) -> List[Dict[str, Any]]:
+        """
+        Pairs every quiz question with the student's response (or an empty answer)
+        in the structure expected by the prompt generators.
+        """
+        responses_by_question = {r.question_id: r for r in responses}
+
+        ai_responses = []
+        for question in questions:
+            response = responses_by_question.get(question.id)
+            ai_responses.append(
+                QuestionResponseToAI(
+                    question_id=question.id,
+                    answer={"text": response.answer} if response else {"text": ""},
+                    question_text=question.text,
+                    question_type=question.type,
+                    lecturer_answer_text=question.expected_answer,
+                    rubric=question.rubric,
+                    rubric_max_score=question.rubric_max_score,
+                )
+            )
+
+        return [
+            {
+                "question_id": response.question_id,
+                "question_text": response.question_text,
+                "student_answer_text": response.answer.get("text", ""),
+                "lecturer_answer_text": response.lecturer_answer_text,
+                "rubric": response.rubric,
+                "rubric_max_score": response.rubric_max_score,
+            }
+            for response in ai_responses
+        ]
+
+    @staticmethod
+    async def build_analysis_prompt(
+        quiz: Quiz,
+        user_id: int,
+        model_name: str,
+        questions: Optional[List[Question]] = None,
+        responses: Optional[List[QuestionResponse]] = None,
+    ) -> str:
+        """
+        Builds the v3 analysis prompt for one student's submission.
+        Questions and responses are loaded when not supplied by the caller.
+        """
+        if questions is None:
+            questions = await Question.filter(quiz_id=quiz.id)
+        if responses is None:
+            responses = await QuestionResponse.filter(
+                user_id=user_id, question__quiz_id=quiz.id
+            )
+
+        questions_and_answers = GradingService.build_questions_and_answers(
+            questions, responses
+        )
+        if not questions_and_answers:
+            raise HTTPException(status_code=404, detail="No answers found for analysis")
+
+        return construct_overall_assignment_analysis_prompt_v3(
+            quiz_id=quiz.id,
+            student_id=user_id,
+            model_name=model_name,
+            questions_and_answers=questions_and_answers,
+            overall_assignment_title=quiz.title,
+            lecturer_overall_notes=quiz.lecturer_overall_notes,
+        )
+
+    @staticmethod
+    async def grade_submission(
+        quiz: Quiz,
+        user_id: int,
+        model_name: str,
+        questions: Optional[List[Question]] = None,
+        responses: Optional[List[QuestionResponse]] = None,
+        use_cache: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        Runs the full grading pipeline for one student: prompt, LLM call and
+        assessment creation. `use_cache` overrides the LLM response cache default.
+
+        Returns:
+            dict: {"assessment": AssessmentResponse, "analysis": str, "input_tokens": Optional[int]}
+        """
+        prompt = await GradingService.build_analysis_prompt(
+            quiz, user_id, model_name, questions, responses
+        )
+
+        llm_call_function = get_llm_api_call_function(model_name)
+        analysis_result, input_tokens = normalize_llm_output(
+            await llm_call_function(
+                prompt, prompt_version=ANALYSIS_PROMPT_VERSION, use_cache=use_cache
+            )
+        )
+
+        logger.debug(f"Analysis result for student {user_id}: {analysis_result}")
+        logger.debug(f"Input tokens for student {user_id}: {input_tokens}")
+
+        assessment = await AssessmentService.create_assessment_from_json(
+            analysis_result
+        )
+        if not assessment:
+            raise HTTPException(
+                status_code=500, detail="Failed to create assessment from analysis"
+            )
+
+        return {
+            "assessment": assessment,
+            "analysis": analysis_result,
+            "input_tokens": input_tokens,
+        }
+
+    @staticmethod
+    async def stream_grade_submission(
+        quiz: Quiz,
+        user_id: int,
+        model_name: str,
+        include_tokens: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of `grade_submission`.
+
+        Yields "token" events with raw text fragments (when include_tokens),
+        a "question_assessment" event as each element of question_assessments
+        closes in the LLM output, then "assessment" with the stored assessment
+        once the full document has been saved, or "error".
+        """
+        prompt = await GradingService.build_analysis_prompt(quiz, user_id, model_name)
+        provider = get_llm_api_call_function(model_name)
+        parser = JSONArrayItemStream("question_assessments")
+
+        async for fragment in provider.stream(prompt):
+            if include_tokens:
+                yield {"event": "token", "data": {"text": fragment}}
+            for question_assessment in parser.feed(fragment):
+                yield {"event": "question_assessment", "data": question_assessment}
+
+        analysis_result = parser.document()
+        assessment = await AssessmentService.create_assessment_from_json(
+            analysis_result
+        )
+        if not assessment:
+            logger.error(f"Streamed analysis could not be stored: {analysis_result}")
+            yield {
+                "event": "error",
+                "data": {"detail": "Failed to create assessment from analysis"},
+            }
+            return
+
+        yield {"event": "assessment", "data": assessment}
+
+    @staticmethod
+    async def grade_quiz(
+        quiz: Quiz,
+        model_name: str,
+        concurrency: int = BULK_GRADING_CONCURRENCY,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Grades every submitted participant of a quiz that has no assessment
+        for it yet, running at most `concurrency` LLM calls at a time (provider
+        rate limits still apply). Re-running after a partial failure therefore
+        only grades the students that failed.
+
+        Questions and all participants' responses are loaded with one query each.
+        Yields a progress event as each student's assessment lands.
+        """
+        submitted_user_ids = await QuizParticipant.filter(
+            quiz_id=quiz.id, status=StatusType.SUBMITED
+        ).values_list("user_id", flat=True)
+        assessed_user_ids = set(
+            await Assessment.filter(
+                quiz_id=quiz.id, user_id__in=submitted_user_ids
+            ).values_list("user_id", flat=True)
+        ) if submitted_user_ids else set()
+        participant_user_ids = [
+            user_id for user_id in submitted_user_ids if user_id not in assessed_user_ids
+        ]
+
+        questions = await Question.filter(quiz_id=quiz.id)
+        responses_by_user = defaultdict(list)
+        if participant_user_ids:
+            for response in await QuestionResponse.filter(
+                question__quiz_id=quiz.id, user_id__in=participant_user_ids
+            ):
+                responses_by_user[response.user_id].append(response)
+
+        total = len(participant_user_ids)
+        yield {
+            "event": "started",
+            "quiz_id": quiz.id,
+            "total": total,
+            "already_assessed": len(assessed_user_ids),
+        }
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def grade_one(user_id: int) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    result = await GradingService.grade_submission(
+                        quiz,
+                        user_id,
+                        model_name,
+                        questions=questions,
+                        responses=responses_by_user[user_id],
+                    )
+                    return {
+                        "event": "graded",
+                        "student_id": user_id,
+                        "assessment_id": result["assessment"].id,
+                        "overall_score": result["assessment"].overall_score,
+                        "input_tokens": result["input_tokens"],
+                    }
+                except Exception as e:
+                    error = e.detail if isinstance(e, HTTPException) else str(e)
+                    logger.error(f"Bulk grading failed for student {user_id}: {error}")
+                    return {"event": "failed", "student_id": user_id, "error": error}
+
+        tasks = [asyncio.create_task(grade_one(uid)) for uid in participant_user_ids]
+        graded = failed = 0
+        try:
+            for completed, next_done in enumerate(asyncio.as_completed(tasks), 1):
+                event = await next_done
+                if event["event"] == "graded":
+                    graded += 1
+                else:
+                    failed += 1
+                yield {**event, "completed": completed, "total": total}
+        finally:
+            # Stop outstanding LLM calls if the client goes away mid-stream
+            for task in tasks:
+                task.cancel()
+
+        yield {
+            "event": "finished",
+            "quiz_id": quiz.id,
+            "total": total,
+            "graded": graded,
+            "failed": failed,
+        }
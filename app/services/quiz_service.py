@@ -0,0 +1,153 @@
+import logging
+import os
+from typing import List
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+
+from app.models.models import Question, Quiz, QuizParticipant
+from app.schemas.question import QuestionReadForStudent, QuizWithQuestionsCreate
+from app.schemas.quiz import QuizReadWithQuestions
+from app.utils.cache import TTLCache
+from app.utils.json_response import EncodedJSON
+from app.utils.util import make_join_code
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Attempts at drawing an unused join code before giving up
+JOIN_CODE_ATTEMPTS = 5
+# Questions per INSERT statement when bulk creating a quiz's questions
+QUESTION_INSERT_BATCH_SIZE = 500
+# Limits for quiz banks uploaded to the import endpoint
+QUIZ_IMPORT_MAX_BYTES = int(os.getenv("QUIZ_IMPORT_MAX_BYTES", str(5 * 1024 * 1024)))
+QUIZ_IMPORT_MAX_QUESTIONS = int(os.getenv("QUIZ_IMPORT_MAX_QUESTIONS", "2000"))
+# In-process cache of serialized quiz content for the quiz-taking endpoints
+QUIZ_CONTENT_CACHE_TTL = int(os.getenv("QUIZ_CONTENT_CACHE_TTL", "3600"))
+QUIZ_CONTENT_CACHE_SIZE = int(os.getenv("QUIZ_CONTENT_CACHE_SIZE", "256"))
+
+
+class QuizService:
+    # (quiz id, content version) -> encoded QuizReadWithQuestions. A write bumps
+    # the quiz's content_version, so every worker stops using its stale entry.
+    _content_cache = TTLCache(maxsize=QUIZ_CONTENT_CACHE_SIZE, ttl=QUIZ_CONTENT_CACHE_TTL)
+
+    @staticmethod
+    async def create_quiz_with_questions(
+        creator_id: int, payload: QuizWithQuestionsCreate
+    ) -> Quiz:
+        """
+        Creates a quiz and all its questions in one transaction, inserting the
+        questions with bulk INSERTs. Nothing is left behind if any part fails.
+
+        Raises:
+            RuntimeError: if no unique join code could be generated
+        """
+        async with in_transaction() as conn:
+            quiz = await QuizService._create_with_join_code(
+                conn,
+                creator_id=creator_id,
+                title=payload.title,
+                description=payload.description,
+                lecturer_overall_notes=payload.lecturer_overall_notes,
+                start_time=payload.start_time,
+                end_time=payload.end_time,
+                duration=payload.duration,
+            )
+            await Question.bulk_create(
+                QuizService._build_questions(quiz, payload),
+                batch_size=QUESTION_INSERT_BATCH_SIZE,
+                using_db=conn,
+            )
+        logger.info(f"Created quiz {quiz.id} with {len(payload.questions)} questions")
+        return quiz
+
+    @staticmethod
+    async def _create_with_join_code(conn, **quiz_fields) -> Quiz:
+        for _ in range(JOIN_CODE_ATTEMPTS):
+            try:
+                # A savepoint, so a join code collision does not abort the transaction
+                async with in_transaction() as savepoint:
+                    return await Quiz.create(
+                        join_code=make_join_code(6), using_db=savepoint, **quiz_fields
+                    )
+            except IntegrityError:
+                continue
+        raise RuntimeError("Could not generate a unique join code")
+
+    @staticmethod
+    def _build_questions(quiz: Quiz, payload: QuizWithQuestionsCreate) -> List[Question]:
+        return [
+            Question(
+                quiz=quiz,
+                text=q.text,
+                type=q.type,
+                options=q.options,
+                expected_answer=q.expected_answer,
+                rubric=q.rubric,
+                rubric_max_score=q.rubric_max_score,
+            )
+            for q in payload.questions
+        ]
+
+    @staticmethod
+    async def get_quiz_for_participant(quiz_id: int, user_id: int) -> EncodedJSON:
+        """
+        The quiz and its questions for one of its participants, encoded. The
+        participant check (which also reads the content version) is the only
+        query on a cache hit.
+
+        Raises:
+            HTTPException: 404 if the quiz does not exist, 403 if the user is
+                not a participant
+        """
+        participation = (
+            await QuizParticipant.filter(user_id=user_id, quiz_id=quiz_id)
+            .values_list("quiz__content_version", flat=True)
+        )
+        if not participation:
+            if not await Quiz.exists(id=quiz_id):
+                raise HTTPException(status_code=404, detail="Quiz not found")
+            raise HTTPException(
+                status_code=403,
+                detail="You are not a participant in this quiz"
+            )
+        return await QuizService.get_quiz_content(quiz_id, participation[0])
+
+    @staticmethod
+    async def get_quiz_content(quiz_id: int, content_version: int) -> EncodedJSON:
+        """Quiz content at a given version, loaded and encoded once per worker"""
+        key = (quiz_id, content_version)
+        content = QuizService._content_cache.get(key)
+        if content is not None:
+            return content
+
+        quiz = await Quiz.get_or_none(id=quiz_id)
+        if not quiz:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+        questions = await Question.filter(quiz_id=quiz_id).order_by("id")
+        content = EncodedJSON.of(QuizReadWithQuestions(
+            id=quiz.id,
+            title=quiz.title,
+            creator_id=quiz.creator_id,
+            description=quiz.description,
+            join_code=quiz.join_code,
+            created_at=quiz.created_at,
+            duration=quiz.duration,
+            questions=[QuestionReadForStudent.model_validate(q) for q in questions],
+        ))
+        # Written under the version that was actually read, so content racing a
+        # concurrent write is never cached under the newer version
+        QuizService._content_cache.set((quiz_id, quiz.content_version), content)
+        return content
+
+    @staticmethod
+    async def bump_content_version(quiz_id: int, using_db=None):
+        """Invalidates cached content of a quiz; call after writing it or its questions"""
+        await Quiz.filter(id=quiz_id).using_db(using_db).update(
+            content_version=F("content_version") + 1
+        )
@@ -0,0 +1,260 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+from tortoise.expressions import F, Q
+from tortoise.functions import Max, Min
+from tortoise.transactions import in_transaction
+
+from app.db.db import SQLParams, get_connection
+from app.models.models import Assessment, QuizStatistics
+
+logger = logging.getLogger(__name__)
+
+# Lower bound (percent) of each grade bucket column, highest first
+GRADE_BUCKETS = (("grade_a", 90), ("grade_b", 80), ("grade_c", 70), ("grade_d", 60), ("grade_f", 0))
+
+
+class ScoreSnapshot(NamedTuple):
+    """The columns of one assessment that feed the quiz statistics"""
+
+    score: int
+    max_score: int
+    timestamp: datetime
+
+    @classmethod
+    def of(cls, assessment: Assessment) -> "ScoreSnapshot":
+        return cls(
+            assessment.overall_score,
+            assessment.overall_max_score,
+            assessment.assessment_timestamp_utc,
+        )
+
+
+def grade_bucket(score: int, max_score: int) -> Optional[str]:
+    """Grade bucket column for a score; None when the max score is zero"""
+    if not max_score or max_score <= 0:
+        return None
+    percentage = score * 100.0 / max_score
+    for column, lower_bound in GRADE_BUCKETS:
+        if percentage >= lower_bound:
+            return column
+    return "grade_f"
+
+
+class QuizStatisticsService:
+    """
+    Maintains the quiz_statistics summary rows. Every write to an assessment's
+    score applies its delta here, so statistics reads are a single row lookup
+    instead of an aggregate over the quiz's assessments.
+    """
+
+    @staticmethod
+    async def record_change(
+        quiz_id: int,
+        added: Optional[ScoreSnapshot] = None,
+        removed: Optional[ScoreSnapshot] = None,
+        using_db=None,
+    ):
+        """
+        Applies one assessment change to the quiz's statistics: `added` for a
+        new assessment, `removed` for a deleted one, both for a re-score. Must
+        run after the assessment row itself has been written.
+        """
+        await QuizStatistics.bulk_create(
+            [QuizStatistics(quiz_id=quiz_id)], ignore_conflicts=True, using_db=using_db
+        )
+
+        # Counts, sums and buckets move by the delta with atomic F() updates
+        deltas: Dict[str, int] = {}
+        for snapshot, sign in ((added, 1), (removed, -1)):
+            if snapshot is None:
+                continue
+            deltas["total_assessments"] = deltas.get("total_assessments", 0) + sign
+            deltas["score_sum"] = deltas.get("score_sum", 0) + sign * snapshot.score
+            deltas["max_score_sum"] = (
+                deltas.get("max_score_sum", 0) + sign * snapshot.max_score
+            )
+            bucket = grade_bucket(snapshot.score, snapshot.max_score)
+            if bucket:
+                deltas[bucket] = deltas.get(bucket, 0) + sign
+        changes = {column: F(column) + delta for column, delta in deltas.items() if delta}
+        if changes:
+            await QuizStatistics.filter(quiz_id=quiz_id).using_db(using_db).update(
+                **changes
+            )
+
+        if removed is None and added is not None:
+            # A new value can only widen the extremes
+            row = QuizStatistics.filter(quiz_id=quiz_id).using_db(using_db)
+            await row.filter(Q(min_score=None) | Q(min_score__gt=added.score)).update(
+                min_score=added.score
+            )
+            await row.filter(Q(max_score=None) | Q(max_score__lt=added.score)).update(
+                max_score=added.score
+            )
+            await row.filter(
+                Q(earliest_assessment=None) | Q(earliest_assessment__gt=added.timestamp)
+            ).update(earliest_assessment=added.timestamp)
+            await row.filter(
+                Q(latest_assessment=None) | Q(latest_assessment__lt=added.timestamp)
+            ).update(latest_assessment=added.timestamp)
+        elif removed is not None:
+            # The removed value may have been an extreme; take them from the table
+            extremes = (
+                await Assessment.filter(quiz_id=quiz_id)
+                .using_db(using_db)
+                .annotate(
+                    min_score=Min("overall_score"),
+                    max_score=Max("overall_score"),
+                    earliest_assessment=Min("assessment_timestamp_utc"),
+                    latest_assessment=Max("assessment_timestamp_utc"),
+                )
+                .values(
+                    "min_score", "max_score", "earliest_assessment", "latest_assessment"
+                )
+            )
+            await QuizStatistics.filter(quiz_id=quiz_id).using_db(using_db).update(
+                **extremes[0]
+            )
+
+    @staticmethod
+    async def rebuild(quiz_id: Optional[int] = None) -> int:
+        """
+        Recomputes statistics rows from the assessments table, for one quiz or
+        for all of them. Used to backfill and to repair drift.
+
+        Returns:
+            int: number of quiz statistics rows written
+        """
+        async with in_transaction() as conn:
+            params = SQLParams(conn)
+            bucket_columns = ",\n".join(
+                f"SUM(CASE WHEN {condition} THEN 1 ELSE 0 END) AS {column}"
+                for column, condition in QuizStatisticsService._bucket_conditions()
+            )
+            where = f"WHERE quiz_id = {params.add(quiz_id)}" if quiz_id else ""
+            rows = await conn.execute_query_dict(
+                f"""
+                SELECT
+                    quiz_id,
+                    COUNT(*) AS total_assessments,
+                    SUM(overall_score) AS score_sum,
+                    SUM(overall_max_score) AS max_score_sum,
+                    MIN(overall_score) AS min_score,
+                    MAX(overall_score) AS max_score,
+                    MIN(assessment_timestamp_utc) AS earliest_assessment,
+                    MAX(assessment_timestamp_utc) AS latest_assessment,
+                    {bucket_columns}
+                FROM (
+                    SELECT *,
+                        CASE WHEN overall_max_score > 0
+                            THEN overall_score * 100.0 / overall_max_score
+                        END AS percentage
+                    FROM "assessments"
+                    {where}
+                ) scored
+                GROUP BY quiz_id
+                """,
+                params.values,
+            )
+
+            stale = QuizStatistics.all().using_db(conn)
+            if quiz_id:
+                stale = stale.filter(quiz_id=quiz_id)
+            await stale.delete()
+            # Raw rows from SQLite carry timestamps as text; convert per field
+            fields_map = QuizStatistics._meta.fields_map
+            await QuizStatistics.bulk_create(
+                [
+                    QuizStatistics(
+                        **{
+                            name: fields_map[name].to_python_value(value)
+                            for name, value in row.items()
+                        }
+                    )
+                    for row in rows
+                ],
+                using_db=conn,
+            )
+        logger.info(f"Rebuilt statistics for {len(rows)} quiz(zes)")
+        return len(rows)
+
+    @staticmethod
+    def _bucket_conditions():
+        upper = None
+        for column, lower_bound in GRADE_BUCKETS:
+            condition = f"percentage >= {lower_bound}" if lower_bound else "percentage IS NOT NULL"
+            if upper is not None:
+                condition += f" AND percentage < {upper}"
+            yield column, condition
+            upper = lower_bound
+
+    @staticmethod
+    async def get_quiz_summary(quiz_id: int) -> Dict[str, Any]:
+        """Statistics for one quiz read from its summary row"""
+        row = await QuizStatistics.get_or_none(quiz_id=quiz_id)
+        return QuizStatisticsService.format_summary(row, quiz_id=quiz_id)
+
+    @staticmethod
+    async def get_overview(quiz_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Statistics across all quizzes (or one), combined from the summary rows
+        rather than from every assessment.
+        """
+        if quiz_id is not None:
+            summary = await QuizStatisticsService.get_quiz_summary(quiz_id)
+            summary.pop("grade_distribution")
+            return summary
+
+        connection = get_connection()
+        rows = await connection.execute_query_dict(
+            """
+            SELECT
+                COALESCE(SUM(total_assessments), 0) AS total_assessments,
+                COALESCE(SUM(score_sum), 0) AS score_sum,
+                COALESCE(SUM(max_score_sum), 0) AS max_score_sum,
+                MIN(min_score) AS min_score,
+                MAX(max_score) AS max_score,
+                MIN(earliest_assessment) AS earliest_assessment,
+                MAX(latest_assessment) AS latest_assessment
+            FROM "quiz_statistics"
+            """
+        )
+        summary = QuizStatisticsService.format_summary(rows[0])
+        summary.pop("grade_distribution")
+        summary.pop("quiz_id")
+        return summary
+
+    @staticmethod
+    def format_summary(row, quiz_id: Optional[int] = None) -> Dict[str, Any]:
+        def value(name, default=None):
+            if row is None:
+                return default
+            found = row.get(name) if isinstance(row, dict) else getattr(row, name)
+            return default if found is None else found
+
+        total = int(value("total_assessments", 0))
+        average_score = int(value("score_sum", 0)) / total if total else 0
+        average_max_score = int(value("max_score_sum", 0)) / total if total else 0
+        return {
+            "quiz_id": quiz_id,
+            "total_assessments": total,
+            "average_score": round(average_score, 2),
+            "average_percentage": (
+                round(average_score / average_max_score * 100, 2)
+                if average_score and average_max_score
+                else 0
+            ),
+            "min_score": value("min_score", 0),
+            "max_score": value("max_score", 0),
+            "earliest_assessment": value("earliest_assessment"),
+            "latest_assessment": value("latest_assessment"),
+            "grade_distribution": {
+                "A (90-100%)": value("grade_a", 0),
+                "B (80-89%)": value("grade_b", 0),
+                "C (70-79%)": value("grade_c", 0),
+                "D (60-69%)": value("grade_d", 0),
+                "F (0-59%)": value("grade_f", 0),
+            },
+        }
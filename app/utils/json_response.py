@@ -0,0 +1,68 @@
+import hashlib
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# OPT_UTC_Z writes UTC datetimes with a "Z" suffix, the same as pydantic does
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    # Types orjson does not serialize natively, encoded the way pydantic does
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_json(content: Any) -> bytes:
+    """Encodes a response payload (dicts, lists, pydantic models) with orjson"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson; the app's default response class.
+    Routes may also return one directly with plain dicts to skip response
+    model validation on hot read paths.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+@dataclass(frozen=True)
+class EncodedJSON:
+    """A payload encoded once, kept with its ETag so it can be served repeatedly"""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, content: Any) -> "EncodedJSON":
+        body = dump_json(content)
+        return cls(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+def encoded_json_response(
+    request: Request, encoded: EncodedJSON, cache_control: Optional[str] = "private, no-cache"
+) -> Response:
+    """
+    Serves pre-encoded bytes, or an empty 304 when the client already holds
+    them (If-None-Match), so repeated reads skip validation and encoding.
+    """
+    headers = {"ETag": encoded.etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if encoded.etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=encoded.body, media_type="application/json", headers=headers)
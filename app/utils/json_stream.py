@@ -0,0 +1,116 @@
+import json
+from typing import Any, List, Optional
+
+
+class JSONArrayItemStream:
+    """
+    Incremental parser that picks completed objects out of one array of a JSON
+    document while the document is still being generated.
+
+    Text is fed in arbitrary fragments; `feed` returns the elements of the
+    top-level `array_key` array that were closed by that fragment. Anything
+    before the first "{" (markdown fences, a <think> block) is ignored.
+    """
+
+    def __init__(self, array_key: str):
+        self.array_key = array_key
+        self.buffer = ""
+        self._pos = 0
+        self._started = False
+        self._doc_start = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[Any]:
+        self.buffer += text
+        items = []
+        buffer = self.buffer
+        if not self._started:
+            # Reasoning models may emit a <think> block before the answer
+            head = buffer.lstrip()
+            if "<think>".startswith(head[:7]) and len(head) < 7:
+                return items
+            if head.startswith("<think>"):
+                think_end = buffer.find("</think>")
+                if think_end == -1:
+                    return items
+                self._pos = max(self._pos, think_end + len("</think>"))
+
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+
+            if not self._started:
+                if char != "{":
+                    continue
+                self._started = True
+                self._doc_start = i
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = buffer[self._string_start : i + 1]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ":":
+                if self._stack == ["{"] and self._last_string is not None:
+                    try:
+                        self._key = json.loads(self._last_string)
+                    except json.JSONDecodeError:
+                        self._key = None
+            elif char in "{[":
+                if (
+                    char == "["
+                    and self._stack == ["{"]
+                    and self._key == self.array_key
+                ):
+                    self._array_depth = len(self._stack) + 1
+                elif (
+                    char == "{"
+                    and self._array_depth is not None
+                    and len(self._stack) == self._array_depth
+                ):
+                    self._item_start = i
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if (
+                    char == "}"
+                    and self._item_start is not None
+                    and len(self._stack) == self._array_depth
+                ):
+                    try:
+                        items.append(json.loads(buffer[self._item_start : i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self._item_start = None
+                elif (
+                    char == "]"
+                    and self._array_depth is not None
+                    and len(self._stack) < self._array_depth
+                ):
+                    self._array_depth = None
+            elif char == ",":
+                self._last_string = None
+        self._pos = len(buffer)
+        return items
+
+    def document(self) -> str:
+        """The JSON document fed so far, without surrounding fences or reasoning text"""
+        if not self._started:
+            return self.buffer
+        end = self.buffer.rfind("}")
+        return self.buffer[self._doc_start : end + 1]
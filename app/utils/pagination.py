@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from tortoise.expressions import Q
+
+
+def encode_cursor(*values) -> str:
+    """Packs the sort key of the last row on a page into an opaque token"""
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Unpacks a token from encode_cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_cursor_timestamp(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def encode_timestamp_cursor(timestamp, id: int) -> str:
+    return encode_cursor(parse_cursor_timestamp(timestamp), id)
+
+
+def decode_timestamp_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Returns (timestamp, id) from a cursor made by encode_timestamp_cursor"""
+    timestamp, id = decode_cursor(cursor, 2)
+    try:
+        return parse_cursor_timestamp(timestamp), int(id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def decode_participant_cursor(cursor: str) -> Tuple[Optional[datetime], Optional[int], int]:
+    """
+    Returns (timestamp, assessment_id, participant_id) from a cursor of the
+    teacher's all-students view; timestamp and assessment_id are None for
+    unassessed participants. Raises ValueError if any value is malformed.
+    """
+    timestamp, assessment_id, participant_id = decode_cursor(cursor, 3)
+    try:
+        timestamp = parse_cursor_timestamp(timestamp)
+        assessment_id = None if assessment_id is None else int(assessment_id)
+        participant_id = int(participant_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if timestamp is not None and assessment_id is None:
+        raise ValueError("Invalid cursor")
+    return timestamp, assessment_id, participant_id
+
+
+def keyset_after(cursor: str, timestamp_field: str = "assessment_timestamp_utc") -> Q:
+    """
+    Filter for the rows after the cursor when ordering by
+    (timestamp_field DESC, id DESC), so the database seeks straight to the page
+    instead of scanning and discarding every earlier row.
+    """
+    timestamp, id = decode_timestamp_cursor(cursor)
+    return Q(**{f"{timestamp_field}__lt": timestamp}) | Q(
+        **{timestamp_field: timestamp, "id__lt": id}
+    )
+
+
+def split_page(rows: Sequence, limit: int) -> Tuple[List, bool]:
+    """Splits a limit + 1 fetch into the page and whether more rows follow"""
+    rows = list(rows)
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from typing import Any, Dict, List, Tuple
+
+# Columns of a CSV question bank; text, type and rubric are required
+QUESTION_BANK_COLUMNS = ("text", "type", "options", "expected_answer", "rubric", "rubric_max_score")
+# Separator between values of the list columns (options, expected_answer) in a CSV cell
+QUESTION_BANK_LIST_SEPARATOR = "|"
+
+
+def parse_question_bank(filename: str, content: bytes) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Parses an uploaded quiz bank into (quiz fields, question dicts).
+
+    A .json bank is either a list of questions or a quiz object with a
+    "questions" list. A .csv bank has a header row using QUESTION_BANK_COLUMNS,
+    one question per row, with options and expected answers separated by "|".
+
+    Raises:
+        ValueError: if the file type is unsupported or the content is malformed
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("Quiz bank must be UTF-8 encoded")
+
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension == "json":
+        return _parse_json_bank(text)
+    if extension == "csv":
+        return {}, _parse_csv_bank(text)
+    raise ValueError("Quiz bank must be a .csv or .json file")
+
+
+def _parse_json_bank(text: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+    if isinstance(data, list):
+        return {}, data
+    if isinstance(data, dict) and isinstance(data.get("questions"), list):
+        quiz_fields = {k: v for k, v in data.items() if k != "questions"}
+        return quiz_fields, data["questions"]
+    raise ValueError('JSON quiz bank must be a list of questions or an object with "questions"')
+
+
+def _parse_csv_bank(text: str) -> List[Dict[str, Any]]:
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise ValueError("CSV quiz bank is empty")
+    header = [name.strip() for name in reader.fieldnames]
+    unknown = set(header) - set(QUESTION_BANK_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown CSV columns: {', '.join(sorted(unknown))}")
+    reader.fieldnames = header
+
+    questions = []
+    for row in reader:
+        if None in row:
+            raise ValueError(f"CSV line {reader.line_num} has more fields than the header")
+        question = {}
+        for column, value in row.items():
+            value = (value or "").strip()
+            if not value:
+                continue
+            if column in ("options", "expected_answer"):
+                question[column] = [
+                    item.strip()
+                    for item in value.split(QUESTION_BANK_LIST_SEPARATOR)
+                    if item.strip()
+                ]
+            else:
+                question[column] = value
+        if question:
+            questions.append(question)
+    return questions
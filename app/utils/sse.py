@@ -0,0 +1,11 @@
+import json
+from typing import Any, Optional
+from fastapi.encoders import jsonable_encoder
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """Encodes one Server-Sent Events message with a JSON payload"""
+    message = f"data: {json.dumps(jsonable_encoder(data))}\n\n"
+    if event:
+        message = f"event: {event}\n{message}"
+    return message
@@ -0,0 +1,137 @@
+import hashlib
+from tempfile import SpooledTemporaryFile
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# Upload bytes kept in memory before the spool rolls over to a temp file on disk
+UPLOAD_SPOOL_MAX_MEMORY = 1024 * 1024
+
+
+class SpooledUpload:
+    """A file part from a multipart body, spooled to a temp file while hashing it"""
+
+    def __init__(self, filename: str, file: SpooledTemporaryFile, size: int, sha256: str):
+        self.filename = filename
+        self.file = file
+        self.size = size
+        self.sha256 = sha256
+
+    def close(self):
+        self.file.close()
+
+
+class _FilePartCollector:
+    """python-multipart callbacks that keep only the file part named field_name"""
+
+    def __init__(self, field_name: str, max_bytes: int):
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+        self.file = SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY)
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.filename: Optional[str] = None
+        self.found = False
+        self._capturing = False
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+
+    def on_part_begin(self):
+        self._capturing = False
+        self._disposition = b""
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        if name == self.field_name and b"filename" in options and not self.found:
+            self.filename = options[b"filename"].decode("utf-8", errors="replace")
+            self.found = True
+            self._capturing = True
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if not self._capturing:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. The limit is {self.max_bytes // (1024 * 1024)}MB.",
+            )
+        self.hasher.update(chunk)
+        self.file.write(chunk)
+
+    def on_part_end(self):
+        self._capturing = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+
+async def spool_upload(request: Request, field_name: str, max_bytes: int) -> SpooledUpload:
+    """
+    Streams a multipart/form-data request body and spools the file part named
+    field_name to a temp file, hashing it as the chunks arrive. The upload is
+    rejected with a 413 as soon as it passes max_bytes, before the rest is read.
+    The caller owns the returned file and must close() it.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + 64 * 1024:
+        # Leave room for the multipart boundaries and headers around the file
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. The limit is {max_bytes // (1024 * 1024)}MB.",
+        )
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload.")
+
+    collector = _FilePartCollector(field_name, max_bytes)
+    parser = MultipartParser(boundary, collector.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except HTTPException:
+        collector.file.close()
+        raise
+    except MultipartParseError as e:
+        collector.file.close()
+        raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}")
+
+    if not collector.found:
+        collector.file.close()
+        raise HTTPException(status_code=400, detail=f"Missing file field '{field_name}'.")
+
+    collector.file.seek(0)
+    return SpooledUpload(
+        filename=collector.filename,
+        file=collector.file,
+        size=collector.size,
+        sha256=collector.hasher.hexdigest(),
+    )
@@ -5,6 +5,7 @@ import string
 from enum import Enum
 import httpx
 from dotenv import load_dotenv
+from app.core.http_client import get_http_client
 import os
 
 load_dotenv()
@@ -27,6 +28,12 @@ class StatusType(str, Enum):
     GRADED = "graded"
     AI_ANALYZED ="Analyzed by AI"
 
+class GradingJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
 # password helper function
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -52,10 +59,10 @@ async def check_ai_with_sapling(text: str) -> dict | None:
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            return response.json()  # Returns the full API response as dict
+        client = get_http_client("sapling", timeout=30.0)
+        response = await client.post(url, json=payload)
+        response.raise_for_status()
+        return response.json()  # Returns the full API response as dict
     except httpx.HTTPError as e:
         print(f"Sapling API error: {e}")
         return None
@@ -83,11 +90,11 @@ async def check_ai_plagiarism(text: str, version: str = "v1") -> float | None:
     print(f'payload : {payload}')
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("score")  # Adjust if the key is named differently
+        client = get_http_client("ai_detector", timeout=30.0)
+        response = await client.post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("score")  # Adjust if the key is named differently
     except (httpx.HTTPError, ValueError, KeyError) as e:
         # Log error and return None or fallback value
         print(f"Plagiarism API error: {e}")
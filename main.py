@@ -1,6 +1,11 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware  # 👈 Import this
 from app.db.db import init_db, close_db
+from app.utils.json_response import ORJSONResponse
+from app.core.http_client import close_http_clients
+from app.services.grading_queue import grading_queue
+from app.services.ai_detection_service import AIDetectionService
+from app.services.assistant_session_service import AssistantSessionService
 from app.routes import (
     quiz,
     user,
@@ -13,7 +18,7 @@ from app.routes import (
     assistant_openai,
 )
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # 👇 Add this CORS middleware configuration (allows all origins)
 app.add_middleware(
@@ -47,10 +52,15 @@ app.include_router(
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    await AIDetectionService.purge_expired()
+    await AssistantSessionService.evict_sessions()
+    await grading_queue.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await grading_queue.stop()
+    await close_http_clients()
     await close_db()
 
 
@@ -0,0 +1,27 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "assistant_documents" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "content_hash" VARCHAR(64) NOT NULL UNIQUE,
+    "filename" VARCHAR(255) NOT NULL,
+    "openai_file_id" VARCHAR(100) NOT NULL,
+    "vector_store_id" VARCHAR(100) NOT NULL,
+    "file_ids_in_store" JSONB NOT NULL,
+    "ref_count" INT NOT NULL DEFAULT 0,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "last_used_at" TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS "idx_assistant_d_ref_cou_a64a95" ON "assistant_documents" ("ref_count", "last_used_at");
+COMMENT ON TABLE "assistant_documents" IS 'Uploaded chatbot document indexed in an OpenAI vector store, shared by content hash';
+        ALTER TABLE "assistant_sessions" ADD "document_id" INT;
+        ALTER TABLE "assistant_sessions" ADD CONSTRAINT "fk_assistan_assistan_5c1f0b7e" FOREIGN KEY ("document_id") REFERENCES "assistant_documents" ("id") ON DELETE SET NULL;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "assistant_sessions" DROP CONSTRAINT IF EXISTS "fk_assistan_assistan_5c1f0b7e";
+        ALTER TABLE "assistant_sessions" DROP COLUMN "document_id";
+        DROP TABLE IF EXISTS "assistant_documents";"""
@@ -0,0 +1,55 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "quiz_statistics" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "total_assessments" INT NOT NULL DEFAULT 0,
+    "score_sum" BIGINT NOT NULL DEFAULT 0,
+    "max_score_sum" BIGINT NOT NULL DEFAULT 0,
+    "min_score" INT,
+    "max_score" INT,
+    "earliest_assessment" TIMESTAMPTZ,
+    "latest_assessment" TIMESTAMPTZ,
+    "grade_a" INT NOT NULL DEFAULT 0,
+    "grade_b" INT NOT NULL DEFAULT 0,
+    "grade_c" INT NOT NULL DEFAULT 0,
+    "grade_d" INT NOT NULL DEFAULT 0,
+    "grade_f" INT NOT NULL DEFAULT 0,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "quiz_id" INT NOT NULL UNIQUE REFERENCES "quiz" ("id") ON DELETE CASCADE
+);
+COMMENT ON TABLE "quiz_statistics" IS 'Running score aggregates for one quiz, kept up to date as assessments change';
+        INSERT INTO "quiz_statistics" (
+    "quiz_id", "total_assessments", "score_sum", "max_score_sum", "min_score", "max_score",
+    "earliest_assessment", "latest_assessment", "grade_a", "grade_b", "grade_c", "grade_d", "grade_f"
+)
+SELECT
+    "quiz_id",
+    COUNT(*),
+    SUM("overall_score"),
+    SUM("overall_max_score"),
+    MIN("overall_score"),
+    MAX("overall_score"),
+    MIN("assessment_timestamp_utc"),
+    MAX("assessment_timestamp_utc"),
+    SUM(CASE WHEN "percentage" >= 90 THEN 1 ELSE 0 END),
+    SUM(CASE WHEN "percentage" >= 80 AND "percentage" < 90 THEN 1 ELSE 0 END),
+    SUM(CASE WHEN "percentage" >= 70 AND "percentage" < 80 THEN 1 ELSE 0 END),
+    SUM(CASE WHEN "percentage" >= 60 AND "percentage" < 70 THEN 1 ELSE 0 END),
+    SUM(CASE WHEN "percentage" IS NOT NULL AND "percentage" < 60 THEN 1 ELSE 0 END)
+FROM (
+    SELECT *,
+        CASE WHEN "overall_max_score" > 0
+            THEN "overall_score" * 100.0 / "overall_max_score"
+        END AS "percentage"
+    FROM "assessments"
+) "scored"
+GROUP BY "quiz_id"
+ON CONFLICT ("quiz_id") DO NOTHING;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "quiz_statistics";"""
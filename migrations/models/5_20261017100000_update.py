@@ -0,0 +1,26 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "grading_jobs" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "model_name" VARCHAR(50) NOT NULL DEFAULT 'azure',
+    "status" VARCHAR(9) NOT NULL DEFAULT 'queued',
+    "attempts" INT NOT NULL DEFAULT 0,
+    "error" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "started_at" TIMESTAMPTZ,
+    "finished_at" TIMESTAMPTZ,
+    "assessment_id" INT REFERENCES "assessments" ("id") ON DELETE SET NULL,
+    "quiz_id" INT NOT NULL REFERENCES "quiz" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS "idx_grading_job_status_ffaee9" ON "grading_jobs" ("status", "created_at");
+COMMENT ON COLUMN "grading_jobs"."status" IS 'QUEUED: queued\nRUNNING: running\nCOMPLETED: completed\nFAILED: failed';
+COMMENT ON TABLE "grading_jobs" IS 'Queued AI grading request for one student''s quiz submission';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "grading_jobs";"""
@@ -0,0 +1,21 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "ai_detection_cache" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "key" VARCHAR(64) NOT NULL UNIQUE,
+    "detector" VARCHAR(50) NOT NULL,
+    "detector_version" VARCHAR(50) NOT NULL,
+    "result" JSONB NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "expires_at" TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS "idx_ai_detectio_expires_c84db6" ON "ai_detection_cache" ("expires_at");
+COMMENT ON TABLE "ai_detection_cache" IS 'Cached AI-detector result for a normalized answer text';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "ai_detection_cache";"""
@@ -0,0 +1,24 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "llm_response_cache" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "key" VARCHAR(64) NOT NULL UNIQUE,
+    "provider" VARCHAR(50) NOT NULL,
+    "model" VARCHAR(100),
+    "prompt_version" VARCHAR(100),
+    "prompt_hash" VARCHAR(64) NOT NULL,
+    "response" JSONB NOT NULL,
+    "hits" INT NOT NULL DEFAULT 0,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "last_used_at" TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS "idx_llm_respons_last_us_55919c" ON "llm_response_cache" ("last_used_at");
+COMMENT ON TABLE "llm_response_cache" IS 'Cached LLM response for an exact prompt, model and sampling configuration';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "llm_response_cache";"""
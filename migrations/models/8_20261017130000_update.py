@@ -0,0 +1,27 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "prompt_experiment_results" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "experiment_id" UUID NOT NULL,
+    "variant" VARCHAR(50) NOT NULL,
+    "provider" VARCHAR(50) NOT NULL,
+    "model" VARCHAR(100),
+    "prompt_hash" VARCHAR(64) NOT NULL,
+    "output" TEXT,
+    "input_tokens" INT,
+    "latency_ms" INT NOT NULL,
+    "error" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "quiz_id" INT NOT NULL REFERENCES "quiz" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "user" ("id") ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS "idx_prompt_expe_experim_dec9d7" ON "prompt_experiment_results" ("experiment_id");
+COMMENT ON TABLE "prompt_experiment_results" IS 'One prompt variant''s output from a prompt comparison run';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "prompt_experiment_results";"""
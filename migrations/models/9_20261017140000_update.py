@@ -0,0 +1,23 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "assistant_sessions" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "assistant_id" VARCHAR(100),
+    "thread_id" VARCHAR(100),
+    "vector_store_id" VARCHAR(100),
+    "file_ids_in_store" JSONB NOT NULL,
+    "openai_file_id_map" JSONB NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "last_used_at" TIMESTAMPTZ NOT NULL,
+    "user_id" INT NOT NULL UNIQUE REFERENCES "user" ("id") ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS "idx_assistant_s_last_us_9b40cb" ON "assistant_sessions" ("last_used_at");
+COMMENT ON TABLE "assistant_sessions" IS 'A lecturer''s chatbot session: OpenAI assistant, thread and document vector store';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "assistant_sessions";"""
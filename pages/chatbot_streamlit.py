@@ -1,4 +1,5 @@
 import streamlit as st
+import json
 import requests
 import time
 import io
@@ -8,6 +9,8 @@ from typing import Optional
 API_BASE_URL = "http://localhost:8000/api"  # Adjust this to your FastAPI server URL
 SETUP_ENDPOINT = f"{API_BASE_URL}/assistant/setup_assistant_and_thread"
 CHAT_ENDPOINT = f"{API_BASE_URL}/assistant/chat"
+CHAT_STREAM_ENDPOINT = f"{API_BASE_URL}/assistant/chat/stream"
+LOGIN_ENDPOINT = f"{API_BASE_URL}/auth/login"
 
 # Initialize session state
 if "messages" not in st.session_state:
@@ -16,6 +19,25 @@ if "assistant_initialized" not in st.session_state:
     st.session_state.assistant_initialized = False
 if "uploaded_file_name" not in st.session_state:
     st.session_state.uploaded_file_name = None
+if "access_token" not in st.session_state:
+    st.session_state.access_token = None
+
+def auth_headers() -> dict:
+    """Bearer token header; assistant sessions are kept per logged-in user"""
+    return {"Authorization": f"Bearer {st.session_state.access_token}"}
+
+def login(email: str, password: str) -> bool:
+    """Log in through the API and keep the access token in the session state"""
+    try:
+        response = requests.post(LOGIN_ENDPOINT, json={"email": email, "password": password}, timeout=30)
+        if response.status_code == 200:
+            st.session_state.access_token = response.json().get("access_token")
+            return True
+        st.error(f"❌ Login failed: {response.text}")
+        return False
+    except requests.exceptions.ConnectionError:
+        st.error("❌ Could not connect to the API server. Make sure your FastAPI server is running.")
+        return False
 
 def upload_pdf_and_setup_assistant(pdf_file) -> bool:
     """Upload PDF and setup assistant through API"""
@@ -25,7 +47,7 @@ def upload_pdf_and_setup_assistant(pdf_file) -> bool:
             files = {"pdfFile": (pdf_file.name, pdf_file, "application/pdf")}
             
             # Make API call
-            response = requests.post(SETUP_ENDPOINT, files=files, timeout=120)
+            response = requests.post(SETUP_ENDPOINT, files=files, headers=auth_headers(), timeout=120)
             
             if response.status_code == 200:
                 result = response.json()
@@ -53,7 +75,7 @@ def send_message_to_assistant(message: str) -> Optional[str]:
     try:
         with st.spinner("Assistant is thinking..."):
             payload = {"user_message": message}
-            response = requests.post(CHAT_ENDPOINT, json=payload, timeout=60)
+            response = requests.post(CHAT_ENDPOINT, json=payload, headers=auth_headers(), timeout=60)
             
             if response.status_code == 200:
                 result = response.json()
@@ -72,6 +94,55 @@ def send_message_to_assistant(message: str) -> Optional[str]:
         st.error(f"❌ An error occurred: {str(e)}")
         return None
 
+def iter_sse_events(response):
+    """Yields (event, data) pairs from a text/event-stream response"""
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+def stream_message_to_assistant(message: str, placeholder) -> Optional[str]:
+    """Send message to assistant and render the reply into placeholder as it streams"""
+    try:
+        payload = {"user_message": message}
+        # The read timeout applies between chunks, not to the whole reply
+        with requests.post(CHAT_STREAM_ENDPOINT, json=payload, headers=auth_headers(), stream=True, timeout=(10, 60)) as response:
+            if response.status_code != 200:
+                st.error(f"❌ Chat failed: {response.text}")
+                return None
+
+            placeholder.markdown("_Assistant is thinking..._")
+            reply = ""
+            for event, data in iter_sse_events(response):
+                if event == "delta":
+                    reply += data.get("text", "")
+                    placeholder.markdown(reply + "▌")
+                elif event == "done":
+                    reply = data.get("assistant_reply", reply)
+                elif event == "error":
+                    st.error(f"❌ Chat failed: {data.get('detail')}")
+                    return None
+            placeholder.markdown(reply or "No response received")
+            return reply or "No response received"
+
+    except requests.exceptions.Timeout:
+        st.error("❌ Request timed out. The assistant might be processing a complex request.")
+        return None
+    except requests.exceptions.ConnectionError:
+        st.error("❌ Could not connect to the API server.")
+        return None
+    except Exception as e:
+        st.error(f"❌ An error occurred: {str(e)}")
+        return None
+
 # Streamlit UI
 st.set_page_config(
     page_title="📚 Lecturer Quiz Assistant",
@@ -85,6 +156,22 @@ st.markdown("Upload a PDF document and chat with your AI assistant to create qui
 
 # Sidebar for file upload and settings
 with st.sidebar:
+    st.header("🔐 Login")
+    if st.session_state.access_token:
+        st.success("✅ Logged in")
+        if st.button("Log out"):
+            st.session_state.access_token = None
+            st.session_state.assistant_initialized = False
+            st.session_state.messages = []
+            st.rerun()
+    else:
+        with st.form("login_form"):
+            email = st.text_input("Email")
+            password = st.text_input("Password", type="password")
+            if st.form_submit_button("Log in") and login(email, password):
+                st.rerun()
+        st.stop()
+
     st.header("📁 Document Upload")
     
     # File upload
@@ -150,14 +237,13 @@ else:
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # Get assistant response
-        response = send_message_to_assistant(prompt)
+        # Stream the assistant response as it is generated
+        with st.chat_message("assistant"):
+            response = stream_message_to_assistant(prompt, st.empty())
         
         if response:
             # Add assistant response to chat history
             st.session_state.messages.append({"role": "assistant", "content": response})
-            with st.chat_message("assistant"):
-                st.markdown(response)
         else:
             st.error("Failed to get response from assistant. Please try again.")
 
@@ -198,6 +284,7 @@ with st.expander("🛠️ Troubleshooting"):
     **API Endpoints:**
     - Setup: `POST /assistant/setup_assistant_and_thread`
     - Chat: `POST /assistant/chat`
+    - Streaming chat: `POST /assistant/chat/stream` (Server-Sent Events)
     """)
 
 # Auto-refresh for real-time updates (optional)
@@ -6,6 +6,9 @@ def run():
 def seed():
     os.system("python -m app.seed")
 
+def rebuild_stats(quiz_id=None):
+    os.system(f"python -m app.rebuild_statistics {quiz_id or ''}")
+
 if __name__ == "__main__":
     import sys
     task = sys.argv[1] if len(sys.argv) > 1 else None
@@ -13,5 +16,7 @@ if __name__ == "__main__":
         run()
     elif task == "seed":
         seed()
+    elif task == "rebuild-stats":
+        rebuild_stats(int(sys.argv[2]) if len(sys.argv) > 2 else None)
     else:
-        print("Usage: python tasks.py [run|seed]")
+        print("Usage: python tasks.py [run|seed|rebuild-stats [quiz_id]]")
@@ -0,0 +1,78 @@
+import asyncio
+
+import httpx
+from tortoise import Tortoise
+
+from app.dependencies import get_current_user
+from app.models.models import Question, Quiz, QuizParticipant, User
+from app.utils.util import StatusType
+from main import app
+
+
+def test_drafts_are_saved_overwritten_and_rejected_after_submission():
+    async def run():
+        await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.models.models"]})
+        await Tortoise.generate_schemas()
+        try:
+            lecturer = await User.create(name="Lecturer", email="lecturer@example.com", password="x")
+            quiz = await Quiz.create(
+                creator=lecturer, title="Quiz", description="d", join_code="ABC123",
+                lecturer_overall_notes="n",
+            )
+            first = await Question.create(quiz=quiz, text="Q1", rubric="r")
+            second = await Question.create(quiz=quiz, text="Q2", rubric="r")
+            student = await User.create(name="Student", email="s@example.com", password="x")
+            other = await User.create(name="Other", email="o@example.com", password="x")
+            for user in (student, other):
+                await QuizParticipant.create(user=user, quiz=quiz, status=StatusType.UNFINISHED)
+
+            current = {"user": student}
+            app.dependency_overrides[get_current_user] = lambda: current["user"]
+            results = {}
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                async def put_draft(question, text):
+                    return await client.put("/api/student/answers/draft", json={
+                        "quiz_id": quiz.id, "question_id": question.id, "answer": {"text": text},
+                    })
+
+                results["insert"] = await put_draft(first, "draft")
+                results["overwrite"] = await put_draft(first, "final")
+                results["drafts"] = await client.get(f"/api/student/answers/draft/{quiz.id}")
+                results["submit"] = await client.post("/api/student/answers/", json={
+                    "quiz_id": quiz.id, "title": "Quiz", "description": "d",
+                    "responses": [{"question_id": second.id, "answer": {"text": "b"}}],
+                })
+                results["after_submit"] = await put_draft(first, "late")
+                results["drafts_after_submit"] = await client.get(
+                    f"/api/student/answers/draft/{quiz.id}"
+                )
+
+                # Submitted through another worker while this one still trusts its session
+                current["user"] = other
+                results["other_insert"] = await put_draft(first, "draft")
+                await QuizParticipant.filter(user=other, quiz=quiz).update(
+                    status=StatusType.SUBMITED
+                )
+                results["other_after_submit"] = await put_draft(second, "late")
+            return results, first.id, second.id
+        finally:
+            app.dependency_overrides.pop(get_current_user, None)
+            await Tortoise.close_connections()
+
+    results, first_id, second_id = asyncio.run(run())
+
+    assert results["insert"].status_code == 200
+    assert results["overwrite"].status_code == 200
+    assert results["overwrite"].json()["id"] == results["insert"].json()["id"]
+    assert results["drafts"].status_code == 200
+    assert [(d["question_id"], d["answer"]) for d in results["drafts"].json()] == [
+        (first_id, {"text": "final"})
+    ]
+    assert results["submit"].status_code == 200
+    assert results["after_submit"].status_code == 409
+    assert [(d["question_id"], d["answer"]) for d in results["drafts_after_submit"].json()] == [
+        (first_id, {"text": "final"}), (second_id, {"text": "b"})
+    ]
+    assert results["other_insert"].status_code == 200
+    assert results["other_after_submit"].status_code == 409
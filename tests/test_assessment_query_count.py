@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from tortoise import Tortoise
+from tortoise.backends.sqlite.client import SqliteClient
+
+from app.models.models import Assessment, Quiz, QuizParticipant, User
+from main import app
+
+
+async def seed_quiz(n_students):
+    lecturer = await User.create(name="Lecturer", email="lecturer@example.com", password="x")
+    quiz = await Quiz.create(
+        creator=lecturer, title="Quiz", description="d", join_code="ABC123",
+        lecturer_overall_notes="n",
+    )
+    now = datetime.now(timezone.utc)
+    for i in range(n_students):
+        student = await User.create(name=f"Student {i}", email=f"s{i}@example.com", password="x")
+        await QuizParticipant.create(user=student, quiz=quiz, status="submited")
+        await Assessment.create(
+            user=student, quiz=quiz, overall_score=i, overall_max_score=10,
+            submission_timestamp_utc=now, assessment_timestamp_utc=now - timedelta(minutes=i),
+        )
+    return quiz
+
+
+def count_queries(monkeypatch):
+    queries = []
+    for method in ("execute_query", "execute_query_dict"):
+        original = getattr(SqliteClient, method)
+
+        async def counted(self, query, values=None, _original=original):
+            queries.append(query)
+            return await _original(self, query, values)
+
+        monkeypatch.setattr(SqliteClient, method, counted)
+    return queries
+
+
+def fetch_assessments(monkeypatch, n_students, limit):
+    async def run():
+        await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.models.models"]})
+        await Tortoise.generate_schemas()
+        try:
+            quiz = await seed_quiz(n_students)
+            queries = count_queries(monkeypatch)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get(
+                    f"/api/assesment/quiz/{quiz.id}/assessments", params={"limit": limit}
+                )
+            monkeypatch.undo()
+            return response, len(queries)
+        finally:
+            await Tortoise.close_connections()
+
+    return asyncio.run(run())
+
+
+def test_quiz_assessments_query_count_is_constant_in_page_size(monkeypatch):
+    small_response, small_queries = fetch_assessments(monkeypatch, n_students=2, limit=2)
+    large_response, large_queries = fetch_assessments(monkeypatch, n_students=25, limit=25)
+
+    assert small_response.status_code == 200
+    assert large_response.status_code == 200
+    assessments = large_response.json()["assessments"]["assessments"]
+    assert len(assessments) == 25
+    assert all(a["participant_status"] == "submited" for a in assessments)
+    assert small_queries == large_queries
@@ -0,0 +1,37 @@
+import json
+from app.utils.json_stream import JSONArrayItemStream
+
+
+def feed_in_chunks(parser, text, size):
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(parser.feed(text[i : i + size]))
+    return items
+
+def test_emits_question_assessments_as_they_close():
+    document = {
+        "user_id": 1,
+        "question_assessments": [
+            {"question_id": 1, "feedback": "uses } and ] and \"quotes\"", "nested": {"a": [1, {"b": 2}]}},
+            {"question_id": 2, "feedback": "ok"},
+        ],
+        "overall_assessment": {"question_assessments": [{"ignored": True}]},
+    }
+    text = json.dumps(document, indent=2)
+
+    for size in (1, 7, len(text)):
+        parser = JSONArrayItemStream("question_assessments")
+        assert feed_in_chunks(parser, text, size) == document["question_assessments"]
+        assert json.loads(parser.document()) == document
+
+def test_element_is_emitted_before_document_ends():
+    parser = JSONArrayItemStream("question_assessments")
+    assert parser.feed('{"question_assessments": [{"question_id": 1}') == [{"question_id": 1}]
+    assert parser.feed(', {"question_id": 2') == []
+    assert parser.feed("}]}") == [{"question_id": 2}]
+
+def test_skips_reasoning_and_markdown_fences():
+    parser = JSONArrayItemStream("question_assessments")
+    text = '<think>draft {"question_assessments": [{"x": 1}]}</think>\n```json\n{"question_assessments": [{"question_id": 3}]}\n```'
+    assert feed_in_chunks(parser, text, 5) == [{"question_id": 3}]
+    assert parser.document() == '{"question_assessments": [{"question_id": 3}]}'
@@ -0,0 +1,40 @@
+import asyncio
+
+from tortoise import Tortoise
+
+from app.core.llm.errors import LLMCallError
+from app.core.llm.llm_factory import LLMProvider
+from app.models.models import LLMResponseCacheEntry
+
+
+def test_failed_call_is_not_answered_from_cache():
+    async def run():
+        await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.models.models"]})
+        await Tortoise.generate_schemas()
+        try:
+            results = [
+                (LLMCallError("HTTP Error: 429 Too Many Requests"), 0),
+                ('{"score": 7}', 120),
+            ]
+            calls = []
+
+            async def call(prompt_text):
+                calls.append(prompt_text)
+                return results[len(calls) - 1]
+
+            provider = LLMProvider("fake", "fake-model", {"temperature": 0}, call)
+            first = await provider("prompt", prompt_version="v1", use_cache=True)
+            entries_after_failure = await LLMResponseCacheEntry.all().count()
+            second = await provider("prompt", prompt_version="v1", use_cache=True)
+            third = await provider("prompt", prompt_version="v1", use_cache=True)
+            return first, entries_after_failure, second, third, len(calls)
+        finally:
+            await Tortoise.close_connections()
+
+    first, entries_after_failure, second, third, call_count = asyncio.run(run())
+
+    assert first[0].startswith("HTTP Error")
+    assert entries_after_failure == 0
+    assert second == ('{"score": 7}', 120)
+    assert third == ('{"score": 7}', 120)
+    assert call_count == 2
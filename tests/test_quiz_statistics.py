@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from tortoise import Tortoise
+
+from app.models.models import Assessment, QuestionAssessment, Quiz, QuizStatistics, User
+from app.services.assesment_service import AssessmentService
+from app.services.quiz_statistics_service import QuizStatisticsService, ScoreSnapshot
+
+
+async def seed_assessments(quiz, scores):
+    now = datetime.now(timezone.utc)
+    assessments = []
+    for i, score in enumerate(scores):
+        student = await User.create(name=f"Student {i}", email=f"s{i}@example.com", password="x")
+        assessment = await Assessment.create(
+            user=student, quiz=quiz, overall_score=score, overall_max_score=10,
+            submission_timestamp_utc=now, assessment_timestamp_utc=now - timedelta(minutes=i),
+        )
+        await QuestionAssessment.create(
+            assessment=assessment, question_id=1, question_text="q",
+            score=score, max_score_possible=10,
+        )
+        await QuizStatisticsService.record_change(quiz.id, added=ScoreSnapshot.of(assessment))
+        assessments.append(assessment)
+    return assessments
+
+
+def test_incremental_statistics_match_rebuild():
+    async def run():
+        await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.models.models"]})
+        await Tortoise.generate_schemas()
+        try:
+            lecturer = await User.create(name="Lecturer", email="lecturer@example.com", password="x")
+            quiz = await Quiz.create(
+                creator=lecturer, title="Quiz", description="d", join_code="ABC123",
+                lecturer_overall_notes="n",
+            )
+            assessments = await seed_assessments(quiz, [10, 9, 7, 2])
+
+            # Removes the max score, moves one score across buckets, regrades another
+            assert await AssessmentService.delete_assessment(assessments[0].id)
+            assert await AssessmentService.update_assessment_score(assessments[1].id, 5)
+            await AssessmentService.update_assessment_grading(
+                assessments[3].id, [SimpleNamespace(question_id=1, new_score=8)]
+            )
+
+            incremental = await QuizStatisticsService.get_quiz_summary(quiz.id)
+            await QuizStatisticsService.rebuild(quiz.id)
+            rebuilt = await QuizStatisticsService.get_quiz_summary(quiz.id)
+            return incremental, rebuilt, await QuizStatistics.all().count()
+        finally:
+            await Tortoise.close_connections()
+
+    incremental, rebuilt, rows = asyncio.run(run())
+
+    assert rows == 1
+    assert incremental == rebuilt
+    assert incremental["total_assessments"] == 3
+    assert (incremental["min_score"], incremental["max_score"]) == (5, 8)